@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from dash.infrastructure.repositories.daily_revenue import DailyRevenueRepository
+from dash.infrastructure.repositories.payment import PaymentRepository
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.main.config import Config
+from dash.models import TransactionType, WsmTransaction
+from dash.models.payment import Payment, PaymentGatewayType, PaymentStatus, PaymentType
+from dash.models.transactions.transaction import Transaction
+from dash.services.dashboard.dto import (
+    GetPaymentAnalyticsRequest,
+    GetRevenueRequest,
+    ReadPaymentStatsRequest,
+    ReadTransactionStatsRequest,
+)
+
+SALE_TYPE = "benchmark"
+INVOICE_PREFIX = "benchmark-"
+CHUNK_SIZE = 1000
+
+
+async def seed(
+    sessionmaker: async_sessionmaker[AsyncSession], rows: int, days: int
+) -> None:
+    now = datetime.now(UTC)
+
+    for chunk_start in range(0, rows, CHUNK_SIZE):
+        async with sessionmaker() as session:
+            for i in range(chunk_start, min(chunk_start + CHUNK_SIZE, rows)):
+                created_at = now - timedelta(seconds=random.randint(0, days * 86400))
+                session.add(
+                    WsmTransaction(
+                        controller_transaction_id=i,
+                        coin_amount=random.randint(0, 500),
+                        bill_amount=random.randint(0, 500),
+                        prev_amount=0,
+                        free_amount=0,
+                        qr_amount=0,
+                        paypass_amount=0,
+                        card_amount=0,
+                        type=TransactionType.WATER_VENDING,
+                        out_liters_1=1000,
+                        out_liters_2=0,
+                        sale_type=SALE_TYPE,
+                        created_at=created_at,
+                    )
+                )
+                session.add(
+                    Payment(
+                        invoice_id=f"{INVOICE_PREFIX}{i}",
+                        amount=random.randint(100, 1000),
+                        status=PaymentStatus.COMPLETED,
+                        type=random.choice((PaymentType.CASH, PaymentType.CASHLESS)),
+                        gateway_type=random.choice(list(PaymentGatewayType)),
+                        created_at=created_at,
+                    )
+                )
+            await session.commit()
+
+    async with sessionmaker() as session:
+        repository = DailyRevenueRepository(session)
+        today = await repository.get_current_date()
+        await repository.refresh(today - timedelta(days=days + 1), today)
+        await session.commit()
+
+
+async def cleanup(sessionmaker: async_sessionmaker[AsyncSession], days: int) -> None:
+    async with sessionmaker() as session:
+        await session.execute(
+            delete(Transaction).where(Transaction.sale_type == SALE_TYPE)
+        )
+        await session.execute(
+            delete(Payment).where(Payment.invoice_id.like(f"{INVOICE_PREFIX}%"))
+        )
+        repository = DailyRevenueRepository(session)
+        today = await repository.get_current_date()
+        await repository.refresh(today - timedelta(days=days + 1), today)
+        await session.commit()
+
+
+def get_queries(
+    date_from: datetime, date_to: datetime
+) -> list[Callable[[AsyncSession], Awaitable[object]]]:
+    stats_filters = {"date_from": date_from, "date_to": date_to}
+
+    return [
+        lambda session: TransactionRepository(session).get_revenue_all(
+            GetRevenueRequest()
+        ),
+        lambda session: PaymentRepository(session).get_payment_analytics_all(
+            GetPaymentAnalyticsRequest(**stats_filters)
+        ),
+        lambda session: TransactionRepository(session).get_today_clients_all(
+            GetRevenueRequest()
+        ),
+        lambda session: TransactionRepository(session).get_stats_all(
+            ReadTransactionStatsRequest(**stats_filters)
+        ),
+        lambda session: PaymentRepository(session).get_stats_all(
+            ReadPaymentStatsRequest(**stats_filters)
+        ),
+    ]
+
+
+async def run(
+    name: str, iterations: int, load_dashboard: Callable[[], Awaitable[None]]
+) -> None:
+    await load_dashboard()  # warm up the pool
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await load_dashboard()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    p50, p95 = (statistics.quantiles(latencies, n=20)[index] for index in (9, 18))
+    print(f"{name:>10}: p50 {p50:8.1f} ms, p95 {p95:8.1f} ms")
+
+
+async def main(iterations: int, rows: int, days: int) -> None:
+    config = Config()
+    engine = create_async_engine(
+        config.postgres.build_dsn(),
+        pool_size=config.postgres.pool_size,
+        max_overflow=config.postgres.max_overflow,
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    now = datetime.now(UTC)
+    queries = get_queries(now - timedelta(days=30), now)
+
+    async def sequential() -> None:
+        async with sessionmaker() as session:
+            for query in queries:
+                await query(session)
+
+    async def in_own_session(
+        query: Callable[[AsyncSession], Awaitable[object]],
+    ) -> None:
+        async with sessionmaker() as session:
+            await query(session)
+
+    async def concurrent() -> None:
+        await asyncio.gather(*(in_own_session(query) for query in queries))
+
+    try:
+        if rows:
+            await seed(sessionmaker, rows, days)
+
+        await run("sequential", iterations, sequential)
+        await run("concurrent", iterations, concurrent)
+    finally:
+        if rows:
+            await cleanup(sessionmaker, days)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare sequential and concurrent dashboard aggregation latency"
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=100_000,
+        help="benchmark transactions and payments to insert (0 to use existing data)",
+    )
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations, args.seed, args.days))
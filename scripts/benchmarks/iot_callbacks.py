@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import inspect
+import time
+from typing import Any, Callable
+from unittest.mock import Mock
+
+from dishka import Provider, Scope, make_async_container
+from fastapi import Request
+
+from dash.infrastructure.auth.background_request import background_request
+from dash.presentation.iot_callbacks.begin import begin_callback
+from dash.presentation.iot_callbacks.car_cleaner.encashment import (
+    car_cleaner_encashment_callback,
+)
+from dash.presentation.iot_callbacks.car_cleaner.payment_card_get import (
+    car_cleaner_payment_card_get_callback,
+)
+from dash.presentation.iot_callbacks.car_cleaner.sale import car_cleaner_sale_callback
+from dash.presentation.iot_callbacks.carwash.encashment import (
+    carwash_encashment_callback,
+)
+from dash.presentation.iot_callbacks.carwash.payment_card_get import (
+    carwash_payment_card_get_callback,
+)
+from dash.presentation.iot_callbacks.carwash.paypass import carwash_paypass_callback
+from dash.presentation.iot_callbacks.carwash.sale import carwash_sale_callback
+from dash.presentation.iot_callbacks.common.di_injector import get_arg_type
+from dash.presentation.iot_callbacks.denomination import denomination_callback
+from dash.presentation.iot_callbacks.fiscalizer.sale import fiscalizer_sale_callback
+from dash.presentation.iot_callbacks.laundry.state_info import (
+    laundry_state_info_callback,
+)
+from dash.presentation.iot_callbacks.mqtt.sys import (
+    sys_connect_callback,
+    sys_disconnect_callback,
+)
+from dash.presentation.iot_callbacks.mqtt.tasmota import tasmota_callback
+from dash.presentation.iot_callbacks.state_info import state_info_callback
+from dash.presentation.iot_callbacks.vacuum.encashment import (
+    vacuum_encashment_callback,
+)
+from dash.presentation.iot_callbacks.vacuum.payment_card_get import (
+    vacuum_payment_card_get_callback,
+)
+from dash.presentation.iot_callbacks.vacuum.sale import vacuum_sale_callback
+from dash.presentation.iot_callbacks.wsm.encashment import wsm_encashment_callback
+from dash.presentation.iot_callbacks.wsm.payment_card_get import (
+    wsm_payment_card_get_callback,
+)
+from dash.presentation.iot_callbacks.wsm.sale import wsm_sale_callback
+
+CALLBACKS = (
+    begin_callback,
+    state_info_callback,
+    denomination_callback,
+    wsm_sale_callback,
+    wsm_payment_card_get_callback,
+    wsm_encashment_callback,
+    carwash_sale_callback,
+    carwash_payment_card_get_callback,
+    carwash_encashment_callback,
+    carwash_paypass_callback,
+    fiscalizer_sale_callback,
+    car_cleaner_sale_callback,
+    car_cleaner_payment_card_get_callback,
+    car_cleaner_encashment_callback,
+    vacuum_sale_callback,
+    vacuum_payment_card_get_callback,
+    vacuum_encashment_callback,
+    laundry_state_info_callback,
+    tasmota_callback,
+    sys_connect_callback,
+    sys_disconnect_callback,
+)
+
+
+def get_payload_wrapper(callback: Callable) -> Any:
+    wrapper = inspect.unwrap(callback, stop=lambda f: hasattr(f, "payload_type"))
+    return wrapper if hasattr(wrapper, "payload_type") else None
+
+
+def measure(iterations: int, func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def measure_async(iterations: int, func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(iterations: int) -> None:
+    # the compiled pipeline binds the loader at import, so this is the whole
+    # per-message cost it removes
+    print(f"{'callback':>40} {'type resolution, us':>20}")
+    for callback in CALLBACKS:
+        wrapper = get_payload_wrapper(callback)
+        if wrapper is None:
+            print(f"{callback.__name__:>40} {'-':>20}")
+            continue
+
+        legacy = measure(
+            iterations,
+            lambda: wrapper.retort.get_loader(get_arg_type(wrapper.__wrapped__, 1)),
+        )
+        print(f"{callback.__name__:>40} {legacy:20.2f}")
+
+    provider = Provider()
+    provider.from_context(Request, scope=Scope.REQUEST)
+    container = make_async_container(provider)
+
+    async def enter_scope(context: dict[Any, Any]) -> None:
+        async with container(scope=Scope.REQUEST, context=context) as scoped:
+            await scoped.get(Request)
+
+    legacy = await measure_async(
+        iterations, lambda: enter_scope({Request: Mock(spec=Request)})
+    )
+    shared = await measure_async(
+        iterations, lambda: enter_scope({Request: background_request})
+    )
+    await container.close()
+
+    print(f"\n{'request scope':>40} {'mock, us':>20} {'shared, us':>12}")
+    print(f"{'':>40} {legacy:20.2f} {shared:12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure per-message overhead of the IoT callback pipeline"
+    )
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+
+from dash.infrastructure.storages.iot import IoTStorage
+from dash.main.config import Config
+
+
+def make_state() -> dict[str, object]:
+    return {
+        "created": datetime.now(UTC).isoformat(),
+        "tempC": 21.5,
+        "coinState": [1, 0, 0, 1, 0, 0],
+        "billState": [0, 1, 0, 0, 0, 0, 0, 0],
+        "output": {f"out{i}": {"state": i % 2, "liters": i * 100} for i in range(4)},
+        "input": {f"in{i}": i % 2 for i in range(8)},
+    }
+
+
+def make_energy() -> dict[str, object]:
+    return {"voltage": 229.4, "current": 1.2, "power": 275.3, "energy": 1532.7}
+
+
+async def seed_legacy(redis: Redis, controller_ids: list[UUID]) -> None:
+    # the layout before the hash: one json string per value
+    async with redis.pipeline(transaction=False) as pipe:
+        for controller_id in controller_ids:
+            pipe.setex(
+                f"iot:state:{controller_id}",
+                timedelta(days=365),
+                json.dumps(make_state()),
+            )
+            pipe.setex(
+                f"iot:energy_state:{controller_id}",
+                timedelta(days=1),
+                json.dumps(make_energy()),
+            )
+            pipe.setex(f"iot:status:{controller_id}", timedelta(days=7), "true")
+            pipe.setex(f"iot:online:{controller_id.hex}", timedelta(days=365), "true")
+        await pipe.execute()
+
+
+async def seed_hash(storage: IoTStorage, controller_ids: list[UUID]) -> None:
+    for controller_id in controller_ids:
+        await storage.set_state(make_state(), controller_id)
+        await storage.set_energy_state(make_energy(), controller_id)
+        await storage.set_last_online_status(controller_id, True)
+        await storage.set_broker_online_status(True, controller_id)
+
+
+async def memory_usage(redis: Redis, pattern: str) -> int:
+    total = 0
+    async for key in redis.scan_iter(match=pattern, count=1000):
+        total += await redis.memory_usage(key) or 0
+    return total
+
+
+async def run(
+    name: str, iterations: int, read: Callable[[], Awaitable[object]]
+) -> None:
+    await read()
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await read()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    p50, p95 = (statistics.quantiles(latencies, n=20)[index] for index in (9, 18))
+    print(f"{name:>28}: p50 {p50:8.2f} ms, p95 {p95:8.2f} ms")
+
+
+async def main(controllers: int, iterations: int) -> None:
+    config = Config()
+    # a scratch database keeps the benchmark keys out of the live ones
+    redis = Redis(
+        host=config.redis.host,
+        port=config.redis.port,
+        password=config.redis.password,
+        db=15,
+    )
+    storage = IoTStorage(redis)
+    controller_ids = [uuid4() for _ in range(controllers)]
+
+    async def legacy_state_and_energy() -> None:
+        controller_id = controller_ids[0]
+        state, energy = await redis.mget(
+            f"iot:state:{controller_id}", f"iot:energy_state:{controller_id}"
+        )
+        json.loads(state), json.loads(energy)  # type: ignore
+
+    async def legacy_online_markers() -> None:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.mget([f"iot:state:{id_}" for id_ in controller_ids])
+            pipe.mget([f"iot:online:{id_.hex}" for id_ in controller_ids])
+            states, statuses = await pipe.execute()
+        for state, status in zip(states, statuses):
+            json.loads(state)["created"], json.loads(status)
+
+    async def state_and_energy() -> None:
+        await storage.get_state_and_energy(controller_ids[0])
+
+    async def online_markers() -> None:
+        await storage.get_online_markers(controller_ids)
+
+    try:
+        await redis.flushdb()
+        await seed_legacy(redis, controller_ids)
+        await seed_hash(storage, controller_ids)
+
+        legacy_memory = await memory_usage(redis, "iot:[seo]*:*")
+        hash_memory = await memory_usage(redis, "iot:controller:*")
+        print(f"{'legacy keys':>28}: {legacy_memory / controllers:8.0f} B/controller")
+        print(f"{'controller hash':>28}: {hash_memory / controllers:8.0f} B/controller")
+
+        await run("legacy state + energy", iterations, legacy_state_and_energy)
+        await run("hash state + energy", iterations, state_and_energy)
+        await run("legacy online markers", iterations, legacy_online_markers)
+        await run("hash online markers", iterations, online_markers)
+    finally:
+        await redis.flushdb()
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the per-value and per-controller hash IoT layouts"
+    )
+    parser.add_argument("--controllers", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.controllers, args.iterations))
@@ -0,0 +1,89 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable
+
+import ecdsa
+
+from dash.infrastructure.acquiring import monopay_keys
+from dash.infrastructure.acquiring.monopay_keys import MonopayKeyCache
+
+
+def make_webhooks(
+    signing_key: ecdsa.SigningKey, count: int
+) -> list[tuple[bytes, bytes]]:
+    webhooks = []
+    for i in range(count):
+        body = json.dumps(
+            {
+                "invoiceId": f"benchmark-{i}",
+                "status": "success",
+                "amount": 1000,
+                "modifiedDate": "2026-01-01T00:00:00Z",
+                "nonce": os.urandom(8).hex(),
+            }
+        ).encode()
+        signature = signing_key.sign_deterministic(
+            body, hashfunc=hashlib.sha256, sigencode=ecdsa.util.sigencode_der
+        )
+        webhooks.append((body, signature))
+    return webhooks
+
+
+def measure(webhooks: list[tuple[bytes, bytes]], verify: Callable[..., bool]) -> float:
+    started = time.perf_counter()
+    for body, signature in webhooks:
+        assert verify(body, signature)
+    return len(webhooks) / (time.perf_counter() - started)
+
+
+def main(count: int) -> None:
+    signing_key = ecdsa.SigningKey.generate(curve=ecdsa.NIST256p)
+    pem = signing_key.get_verifying_key().to_pem()
+    webhooks = make_webhooks(signing_key, count)
+
+    def legacy(body: bytes, signature: bytes) -> bool:
+        # the PEM was parsed again for every webhook
+        key = ecdsa.VerifyingKey.from_pem(pem.decode())
+        return key.verify(
+            signature=signature,
+            data=body,
+            sigdecode=ecdsa.util.sigdecode_der,
+            hashfunc=hashlib.sha256,
+        )
+
+    ecdsa_key = ecdsa.VerifyingKey.from_pem(pem.decode())
+
+    def cached_ecdsa(body: bytes, signature: bytes) -> bool:
+        return ecdsa_key.verify(
+            signature=signature,
+            data=body,
+            sigdecode=ecdsa.util.sigdecode_der,
+            hashfunc=hashlib.sha256,
+        )
+
+    key_cache = MonopayKeyCache()
+    key_cache.put("benchmark", pem)
+
+    def cached(body: bytes, signature: bytes) -> bool:
+        key: Any = key_cache.get("benchmark")
+        return monopay_keys.verify_ecdsa(key, body, signature)
+
+    backend = "ecdsa" if monopay_keys.load_pem_public_key is None else "cryptography"
+
+    print(f"{'verification':>32} {'webhooks/s':>12}")
+    print(f"{'parse per webhook, ecdsa':>32} {measure(webhooks, legacy):12.0f}")
+    print(f"{'cached key, ecdsa':>32} {measure(webhooks, cached_ecdsa):12.0f}")
+    print(f"{f'cached key, {backend}':>32} {measure(webhooks, cached):12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure Monopay webhook signature verification throughput"
+    )
+    parser.add_argument("--webhooks", type=int, default=2000)
+    args = parser.parse_args()
+
+    main(args.webhooks)
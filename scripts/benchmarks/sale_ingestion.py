@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dash.infrastructure.live_events import LiveEvents
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.sale_ingestor import SaleIngestor
+from dash.infrastructure.storages.today_counters import TodayCountersStorage
+from dash.main.config import Config
+from dash.models import TransactionType, WsmTransaction
+from dash.models.transactions.transaction import Transaction
+
+SALE_TYPE = "benchmark"
+
+
+def make_transaction(i: int) -> WsmTransaction:
+    return WsmTransaction(
+        controller_transaction_id=i,
+        coin_amount=100,
+        bill_amount=200,
+        prev_amount=0,
+        free_amount=0,
+        qr_amount=0,
+        paypass_amount=0,
+        card_amount=0,
+        type=TransactionType.WATER_VENDING,
+        out_liters_1=1000,
+        out_liters_2=0,
+        sale_type=SALE_TYPE,
+    )
+
+
+async def run(
+    name: str,
+    messages: int,
+    concurrency: int,
+    handle: Callable[[WsmTransaction], Awaitable[bool]],
+) -> None:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(messages):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            await handle(make_transaction(queue.get_nowait()))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:>10}: {messages / elapsed:10.1f} msg/s ({elapsed:.2f}s)")
+
+
+async def main(messages: int, concurrency: int) -> None:
+    config = Config()
+    engine = create_async_engine(config.postgres.build_dsn())
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def insert_one(transaction: WsmTransaction) -> bool:
+        async with sessionmaker() as session:
+            repository = TransactionRepository(session)
+            was_inserted = await repository.insert_with_conflict_ignore(transaction)
+            await session.commit()
+            return was_inserted
+
+    # a scratch database keeps the benchmark sales out of the live counters
+    redis = Redis(
+        host=config.redis.host,
+        port=config.redis.port,
+        password=config.redis.password,
+        db=15,
+    )
+    ingestor = SaleIngestor(
+        sessionmaker, TodayCountersStorage(redis, config.app), LiveEvents(redis)
+    )
+
+    try:
+        await run("per-sale", messages, concurrency, insert_one)
+        await run("batched", messages, concurrency, ingestor.submit)
+    finally:
+        await ingestor.close()
+        await redis.flushdb()
+        await redis.aclose()
+        async with sessionmaker() as session:
+            await session.execute(
+                delete(Transaction).where(Transaction.sale_type == SALE_TYPE)
+            )
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-sale and batched sale ingestion throughput"
+    )
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.messages, args.concurrency))
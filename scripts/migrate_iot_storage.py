@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+import time
+
+import orjson
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from dash.infrastructure.storages.iot import IoTStorage
+from dash.main.config import Config
+from dash.models.controllers.controller import Controller
+
+STATE_KEY = "iot:state:{controller_id}"
+ENERGY_STATE_KEY = "iot:energy_state:{controller_id}"
+STATUS_KEY = "iot:status:{controller_id}"
+ONLINE_KEY = "iot:online:{device_id}"
+
+
+def flag(value: bytes) -> bytes:
+    return b"1" if json.loads(value) else b"0"
+
+
+async def migrate(delete_old: bool) -> None:
+    config = Config()
+    engine = create_async_engine(config.postgres.build_dsn())
+    sessionmaker = async_sessionmaker(engine)
+
+    async with sessionmaker() as session:
+        controllers = (
+            await session.execute(select(Controller.id, Controller.device_id))
+        ).all()
+    await engine.dispose()
+
+    redis = Redis(
+        host=config.redis.host, port=config.redis.port, password=config.redis.password
+    )
+    storage = IoTStorage(redis)
+    migrated = 0
+
+    for controller_id, device_id in controllers:
+        old_keys = [
+            STATE_KEY.format(controller_id=controller_id),
+            ENERGY_STATE_KEY.format(controller_id=controller_id),
+            STATUS_KEY.format(controller_id=controller_id),
+            ONLINE_KEY.format(device_id=device_id),
+        ]
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.mget(old_keys)
+            pipe.ttl(old_keys[1])
+            (state, energy, status, online), energy_ttl = await pipe.execute()
+
+        fields = build_fields(state, energy, energy_ttl, status, online)
+        if not fields:
+            continue
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(storage._key(controller_id), mapping=fields)  # type: ignore
+            pipe.expire(storage._key(controller_id), IoTStorage.TTL)
+            if delete_old:
+                pipe.delete(*old_keys)
+            await pipe.execute()
+        migrated += 1
+
+    await redis.aclose()
+    print(f"Migrated {migrated} of {len(controllers)} controllers")
+
+
+def build_fields(
+    state: bytes | None,
+    energy: bytes | None,
+    energy_ttl: int,
+    status: bytes | None,
+    online: bytes | None,
+) -> dict[str, bytes | str]:
+    fields: dict[str, bytes | str] = {}
+
+    if state:
+        loaded = orjson.loads(state)
+        fields[IoTStorage.STATE] = orjson.dumps(loaded)
+        if loaded.get("created"):
+            fields[IoTStorage.CREATED] = loaded["created"]
+
+    if energy and energy_ttl > 0:
+        # the old key expired a day after the write, recover when it was written
+        written_at = time.time() - (IoTStorage.ENERGY_TTL.total_seconds() - energy_ttl)
+        fields[IoTStorage.ENERGY] = orjson.dumps(orjson.loads(energy))
+        fields[IoTStorage.ENERGY_AT] = str(written_at)
+
+    if status:
+        fields[IoTStorage.LAST_ONLINE] = flag(status)
+
+    if online:
+        fields[IoTStorage.BROKER_ONLINE] = flag(online)
+
+    return fields
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move IoT controller state from per-value keys to one hash"
+    )
+    parser.add_argument(
+        "--delete", action="store_true", help="delete the old keys once migrated"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.delete))
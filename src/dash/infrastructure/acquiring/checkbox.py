@@ -1,11 +1,14 @@
 import asyncio
-from datetime import datetime, time
+from datetime import UTC, datetime, time
 from typing import Any, Literal
 from uuid import UUID, uuid4
 
+from jose import JWTError, jwt
 from structlog import get_logger
 
 from dash.infrastructure.api_client import APIClient
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.storages.checkbox import CheckboxStorage
 from dash.main.config import AppConfig
 from dash.models import Controller
 from dash.models.payment import Payment, PaymentGatewayType
@@ -17,10 +20,25 @@ class CheckboxAPIError(Exception):
     pass
 
 
+class CheckboxRejectedError(CheckboxAPIError):
+    pass
+
+
+class CheckboxShiftClosedError(CheckboxAPIError):
+    pass
+
+
 class CheckboxService:
-    def __init__(self, config: AppConfig):
+    DEFAULT_TOKEN_TTL = 60 * 60 * 12
+    TOKEN_EXPIRY_MARGIN = 60 * 5
+    SHIFT_CLOSE_AT = time(23, 45)
+
+    def __init__(
+        self, config: AppConfig, api_client: APIClient, storage: CheckboxStorage
+    ):
         self.config = config
-        self.api_client = APIClient()
+        self.api_client = api_client
+        self.storage = storage
         self.base_url = "https://api.checkbox.ua/api/v1"
         self.base_headers = {
             "X-Client-Name": "NaglyadService",
@@ -43,8 +61,38 @@ class CheckboxService:
             params=params,
         )
 
+    def _get_token_ttl(self, token: str) -> int:
+        try:
+            expires_at = jwt.get_unverified_claims(token)["exp"]
+        except (JWTError, KeyError):
+            return self.DEFAULT_TOKEN_TTL
+
+        return (
+            int(expires_at - datetime.now(UTC).timestamp()) - self.TOKEN_EXPIRY_MARGIN
+        )
+
+    def _get_shift_ttl(self) -> int:
+        now = datetime.now(self.config.timezone)
+        closes_at = datetime.combine(now.date(), self.SHIFT_CLOSE_AT, now.tzinfo)
+        return int((closes_at - now).total_seconds())
+
     async def _get_token(
         self, login: str, password: str, controller: Controller
+    ) -> str | None:
+        if token := await self.storage.get_token(login):
+            metrics.incr("checkbox.token_cache", result="hit")
+            return token
+
+        metrics.incr("checkbox.token_cache", result="miss")
+        token = await self._sign_in(login, password, controller)
+
+        if token and (ttl := self._get_token_ttl(token)) > 0:
+            await self.storage.set_token(login, token, ttl)
+
+        return token
+
+    async def _sign_in(
+        self, login: str, password: str, controller: Controller
     ) -> str | None:
         response, status = await self._make_request(
             method="POST",
@@ -134,6 +182,27 @@ class CheckboxService:
 
         return await self._wait_for_shift_opened(shift_id, token)
 
+    async def _ensure_shift_opened(self, controller: Controller, token: str) -> bool:
+        license_key = controller.checkbox_license_key
+        if await self.storage.is_shift_opened(license_key):
+            metrics.incr("checkbox.shift_cache", result="hit")
+            return True
+
+        metrics.incr("checkbox.shift_cache", result="miss")
+
+        # one shift per cashier, so concurrent sales must not race to open it
+        async with self.storage.shift_lock(controller.checkbox_login):
+            if await self.storage.is_shift_opened(license_key):
+                return True
+
+            if not await self._open_shift_if_needed(controller, token):
+                return False
+
+            if (ttl := self._get_shift_ttl()) > 0:
+                await self.storage.set_shift_opened(license_key, ttl)
+
+        return True
+
     async def _open_shift_if_needed(self, controller: Controller, token: str) -> bool:
         active_shift = await self._get_active_shift(token)
         if active_shift:
@@ -155,14 +224,10 @@ class CheckboxService:
             or not controller.checkbox_password
             or not controller.checkbox_license_key
         ):
-            logger.warning(
-                "Ignoring fiscalization request: Credentials not provided",
-                controller_id=controller.id,
-            )
-            return None
+            raise CheckboxRejectedError("Credentials not provided")
 
-        if datetime.now(self.config.timezone).time() > time(23, 45):
-            return None
+        if datetime.now(self.config.timezone).time() > self.SHIFT_CLOSE_AT:
+            raise CheckboxShiftClosedError("Shift is closed for today")
 
         logger.info(f"Creating receipt", receipt_id=receipt_id)
 
@@ -170,10 +235,10 @@ class CheckboxService:
             controller.checkbox_login, controller.checkbox_password, controller
         )
         if not token:
-            return None
+            raise CheckboxAPIError("Failed to sign in")
 
-        if not await self._open_shift_if_needed(controller, token):
-            return None
+        if not await self._ensure_shift_opened(controller, token):
+            raise CheckboxAPIError("Failed to open shift")
 
         payment_dict = {
             "type": payment.type.value,
@@ -212,7 +277,13 @@ class CheckboxService:
             json=data,
             headers={"Authorization": f"Bearer {token}"},
         )
-        if status != 201:
+        # receipt id is idempotent, so a conflict means it was created earlier
+        if status not in (201, 409):
+            # the cached token or shift may be stale, re-check them next time
+            if status in (401, 403):
+                await self.storage.delete_token(controller.checkbox_login)
+            await self.storage.delete_shift(controller.checkbox_license_key)
+
             logger.error(
                 "Error while creating receipt",
                 status=status,
@@ -221,7 +292,10 @@ class CheckboxService:
                 controller_device_id=controller.device_id,
                 controller_name=controller.name,
             )
-            return
+            error = f"Checkbox responded with {status}: {response}"
+            if 400 <= status < 500 and status not in (401, 403, 429):
+                raise CheckboxRejectedError(error)
+            raise CheckboxAPIError(error)
 
         logger.info(
             f"Receipt successfully created",
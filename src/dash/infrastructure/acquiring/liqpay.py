@@ -27,12 +27,13 @@ class LiqpayGateway(PaymentGateway):
         controller_repository: ControllerRepository,
         payment_repository: PaymentRepository,
         checkbox_service: CheckboxService,
+        api_client: APIClient,
     ):
         self.config = config
         self.controller_repository = controller_repository
         self.payment_repository = payment_repository
         self.checkbox_service = checkbox_service
-        self.api_client = APIClient()
+        self.api_client = api_client
         self.base_url = "https://www.liqpay.ua/api/request"
 
     def _prepare_data(self, data: dict[str, Any], private_key: str) -> dict[str, Any]:
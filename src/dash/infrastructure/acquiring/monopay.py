@@ -2,13 +2,14 @@ import base64
 import hashlib
 from typing import Any, Literal
 
-import ecdsa
 from fastapi import HTTPException
 from redis.asyncio import Redis
 from structlog import get_logger
 
 from dash.infrastructure.acquiring.checkbox import CheckboxService
+from dash.infrastructure.acquiring.monopay_keys import MonopayKeyCache, verify_ecdsa
 from dash.infrastructure.api_client import APIClient
+from dash.infrastructure.metrics import metrics
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.infrastructure.storages.acquiring import AcquiringStorage
@@ -34,6 +35,8 @@ class MonopayGateway(PaymentGateway):
         checkbox_service: CheckboxService,
         controller_repository: ControllerRepository,
         locker: Redis,
+        api_client: APIClient,
+        key_cache: MonopayKeyCache,
     ):
         self.config = config
         self.acquiring_storage = acquiring_storage
@@ -42,7 +45,8 @@ class MonopayGateway(PaymentGateway):
         self.checkbox_service = checkbox_service
         self.controller_repository = controller_repository
         self.locker = locker
-        self.api_client = APIClient()
+        self.api_client = api_client
+        self.key_cache = key_cache
 
     def _prepare_headers(self, token: str) -> dict[str, str]:
         return {"X-Token": token}
@@ -69,7 +73,7 @@ class MonopayGateway(PaymentGateway):
             params=params,
         )
 
-    async def _request_pub_key(self, invoice_id: str, token: str) -> bytes:
+    async def _request_pub_key(self, token: str) -> bytes:
         response, status = await self.make_request(
             method="GET",
             endpoint="/merchant/pubkey",
@@ -82,34 +86,34 @@ class MonopayGateway(PaymentGateway):
                 status=status,
             )
 
-        pub_key = response["key"]
-        pub_key_bytes = base64.b64decode(pub_key)
-
-        await self.acquiring_storage.set_monopay_pub_key(pub_key_bytes, invoice_id)
-        return pub_key_bytes
-
-    @staticmethod
-    def _verify_pub_key(body: bytes, signature: bytes, pub_key: bytes) -> bool:
-        key = ecdsa.VerifyingKey.from_pem(pub_key.decode())
-        return key.verify(
-            signature=signature,
-            data=body,
-            sigdecode=ecdsa.util.sigdecode_der,  # type: ignore
-            hashfunc=hashlib.sha256,
-        )
+        return base64.b64decode(response["key"])
 
     async def verify_signature(
         self, sign: str, body: bytes, invoice_id: str, token: str
     ) -> None:
         signature = base64.b64decode(sign)
-        pub_key = await self.acquiring_storage.get_monopay_pub_key(invoice_id) or b""
+        # the key belongs to the merchant, so all of its invoices share it
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+
+        key = self.key_cache.get(token_hash)
+        if key is None:
+            pub_key = await self.acquiring_storage.get_monopay_pub_key(token_hash)
+            if pub_key:
+                key = self.key_cache.put(token_hash, pub_key)
+
+        if key is not None and verify_ecdsa(key, body, signature):
+            return
 
-        if not pub_key or not self._verify_pub_key(body, signature, pub_key):
-            pub_key = await self._request_pub_key(invoice_id, token)
+        # unknown merchant or a rotated key
+        metrics.incr("monopay.pub_key_refresh")
+        pub_key = await self._request_pub_key(token)
+        await self.acquiring_storage.set_monopay_pub_key(pub_key, token_hash)
+        key = self.key_cache.put(token_hash, pub_key)
 
-        if self._verify_pub_key(body, signature, pub_key):
+        if verify_ecdsa(key, body, signature):
             return
 
+        logger.warning("Monopay webhook signature is invalid", invoice_id=invoice_id)
         raise HTTPException(status_code=400, detail="Invalid signature")
 
     async def create_invoice(
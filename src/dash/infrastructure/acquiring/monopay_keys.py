@@ -0,0 +1,56 @@
+import hashlib
+from typing import Any
+
+import ecdsa
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+except ImportError:
+    load_pem_public_key = None
+
+
+# cryptography verifies in OpenSSL and is what deploys run, python-ecdsa is an
+# order of magnitude slower and only covers dev setups without the wheel
+if load_pem_public_key is not None:
+
+    def load_verifying_key(pem: bytes) -> Any:
+        return load_pem_public_key(pem)
+
+    def verify_ecdsa(key: Any, body: bytes, signature: bytes) -> bool:
+        try:
+            key.verify(signature, body, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+        return True
+
+else:
+
+    def load_verifying_key(pem: bytes) -> Any:
+        return ecdsa.VerifyingKey.from_pem(pem.decode())
+
+    def verify_ecdsa(key: Any, body: bytes, signature: bytes) -> bool:
+        try:
+            return key.verify(
+                signature=signature,
+                data=body,
+                sigdecode=ecdsa.util.sigdecode_der,  # type: ignore
+                hashfunc=hashlib.sha256,
+            )
+        except (ecdsa.BadSignatureError, ecdsa.der.UnexpectedDER):
+            return False
+
+
+class MonopayKeyCache:
+    def __init__(self) -> None:
+        self._keys: dict[str, Any] = {}
+
+    def get(self, token_hash: str) -> Any | None:
+        return self._keys.get(token_hash)
+
+    def put(self, token_hash: str, pem: bytes) -> Any:
+        key = load_verifying_key(pem)
+        self._keys[token_hash] = key
+        return key
@@ -1,11 +1,53 @@
-from typing import Any, Literal
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Literal
+from urllib.parse import urlsplit
 
 import aiohttp
+from structlog import get_logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from dash.infrastructure.metrics import metrics
+from dash.main.config import HttpClientConfig
+
+logger = get_logger()
+
+RETRYABLE_STATUSES = {502, 503, 504}
+SAFE_METHODS = {"GET"}
+
+
+class RetryableStatusError(Exception):
+    def __init__(self, body: dict[str, Any], status: int) -> None:
+        self.body = body
+        self.status = status
 
 
 class APIClient:
-    @staticmethod
+    def __init__(self, config: HttpClientConfig) -> None:
+        self.config = config
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=config.limit,
+                limit_per_host=config.limit_per_host,
+                keepalive_timeout=config.keepalive_timeout,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                total=config.total_timeout, connect=config.connect_timeout
+            ),
+        )
+
+    async def close(self) -> None:
+        await self.session.close()
+
     async def make_request(
+        self,
         method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"],
         url: str,
         headers: dict[str, Any] | None = None,
@@ -13,8 +55,64 @@ class APIClient:
         params: dict[str, Any] | list[tuple[str, Any]] | None = None,
         data: dict[str, Any] | None = None,
     ) -> tuple[dict[str, Any], int]:
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
+        host = urlsplit(url).hostname
+
+        def is_retryable(error: BaseException) -> bool:
+            # a request that never reached the upstream is safe to repeat
+            if isinstance(error, aiohttp.ClientConnectorError):
+                return True
+            # anything else may have been processed, so only repeat reads
+            return method in SAFE_METHODS and isinstance(
+                error,
+                (
+                    RetryableStatusError,
+                    aiohttp.ServerDisconnectedError,
+                    asyncio.TimeoutError,
+                ),
+            )
+
+        def before_sleep(retry_state: RetryCallState) -> None:
+            metrics.incr("http_client.retry", host=host)
+            logger.warning(
+                "Retrying HTTP request",
+                method=method,
+                host=host,
+                attempt=retry_state.attempt_number,
+                error=repr(retry_state.outcome and retry_state.outcome.exception()),
+            )
+
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.config.retry_attempts),
+            wait=wait_exponential(multiplier=self.config.retry_backoff),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=before_sleep,
+            reraise=True,
+        )
+
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    return await self._request(
+                        method, url, host, headers, json, params, data
+                    )
+        except RetryableStatusError as e:
+            return e.body, e.status
+
+        raise AssertionError("unreachable")
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        host: str | None,
+        headers: dict[str, Any] | None,
+        json: dict[str, Any] | None,
+        params: dict[str, Any] | list[tuple[str, Any]] | None,
+        data: dict[str, Any] | None,
+    ) -> tuple[dict[str, Any], int]:
+        started = time.perf_counter()
+        try:
+            async with self.session.request(
                 method,
                 url,
                 headers=headers,
@@ -22,4 +120,38 @@ class APIClient:
                 json=json,
                 data=data,
             ) as response:
-                return await response.json(), response.status
+                if response.status in RETRYABLE_STATUSES:
+                    body = await self._read_error_body(response)
+                else:
+                    body = await response.json()
+        except Exception as e:
+            metrics.incr("http_client.error", host=host, error=type(e).__name__)
+            raise
+        finally:
+            metrics.observe(
+                "http_client.latency", time.perf_counter() - started, host=host
+            )
+
+        metrics.incr("http_client.response", host=host, status=response.status)
+
+        if response.status in RETRYABLE_STATUSES:
+            raise RetryableStatusError(body, response.status)
+
+        return body, response.status
+
+    async def _read_error_body(
+        self, response: aiohttp.ClientResponse
+    ) -> dict[str, Any]:
+        # proxies in front of the upstream answer these with an HTML page
+        text = await response.text(errors="replace")
+        try:
+            body = json.loads(text)
+        except ValueError:
+            return {"text": text}
+        return body if isinstance(body, dict) else {"text": text}
+
+
+async def get_api_client(config: HttpClientConfig) -> AsyncIterator[APIClient]:
+    client = APIClient(config)
+    yield client
+    await client.close()
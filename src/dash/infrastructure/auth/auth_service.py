@@ -25,6 +25,7 @@ from dash.infrastructure.auth.token_processor import JWTTokenProcessor
 from dash.infrastructure.repositories.company import CompanyRepository
 from dash.infrastructure.repositories.customer import CustomerRepository
 from dash.infrastructure.repositories.user import UserRepository
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.infrastructure.storages.session import SessionStorage
 from dash.infrastructure.storages.verification import VerificationStorage
 from dash.models.admin_user import AdminRole
@@ -45,6 +46,7 @@ class AuthService:
         verification_storage: VerificationStorage,
         password_processor: PasswordProcessor,
         session_storage: SessionStorage,
+        principal_storage: PrincipalStorage,
         token_processor: JWTTokenProcessor,
         sms_client: SMSClient,
     ) -> None:
@@ -54,6 +56,7 @@ class AuthService:
         self.verification_storage = verification_storage
         self.password_processor = password_processor
         self.session_storage = session_storage
+        self.principal_storage = principal_storage
         self.token_processor = token_processor
         self.sms_client = sms_client
 
@@ -98,6 +101,7 @@ class AuthService:
 
     async def logout(self, data: LogoutRequest) -> None:
         await self.session_storage.add_blacklist(data.access_token)
+        await self.principal_storage.delete(data.access_token)
 
     async def start_customer_registration(self, data: RegisterCustomerRequest) -> None:
         if not await self.company_repository.exists(data.company_id):
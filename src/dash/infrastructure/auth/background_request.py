@@ -0,0 +1,5 @@
+from fastapi import Request
+
+# IoT callbacks and background workers are not HTTP requests, but request-scoped
+# providers such as IdProvider still expect one, so all of them share this stub
+background_request = Request({"type": "http", "headers": []})
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr
 
+from dash.models.admin_user import AdminRole
+
 
 @dataclass
 class RegisterUserRequest:
@@ -77,3 +79,12 @@ class StartPasswordResetRequest(BaseModel):
 class CompletePasswordResetRequest(BaseModel):
     code: str
     new_password: str
+
+
+class Principal(BaseModel):
+    id: UUID
+    role: AdminRole
+    company_id: UUID | None
+    company_ids: frozenset[UUID] = frozenset()
+    location_ids: frozenset[UUID] = frozenset()
+    admin_location_ids: frozenset[UUID] = frozenset()
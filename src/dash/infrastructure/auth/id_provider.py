@@ -2,10 +2,12 @@ from uuid import UUID
 
 from fastapi import Request
 
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.errors import AuthUserNotFoundError, JWTRevokedError
 from dash.infrastructure.auth.token_processor import JWTTokenProcessor
 from dash.infrastructure.repositories.customer import CustomerRepository
 from dash.infrastructure.repositories.user import UserRepository
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.infrastructure.storages.session import SessionStorage
 from dash.models.admin_user import AdminRole, AdminUser
 from dash.services.common.errors.base import AccessDeniedError, AccessForbiddenError
@@ -17,17 +19,19 @@ class IdProvider:
         self,
         request: Request,
         session_storage: SessionStorage,
+        principal_storage: PrincipalStorage,
         user_repository: UserRepository,
         customer_repository: CustomerRepository,
         token_processor: JWTTokenProcessor,
     ) -> None:
         self.jwt_token = self._fetch_token(request)
         self.session_storage = session_storage
+        self.principal_storage = principal_storage
         self.user_repository = user_repository
         self.customer_repository = customer_repository
         self.token_processor = token_processor
 
-        self._user: AdminUser
+        self._principal: Principal
 
     def _fetch_token(self, request: Request) -> str:
         authorization = request.headers.get("Authorization", "")
@@ -35,12 +39,22 @@ class IdProvider:
 
         return token
 
-    async def authorize(self) -> AdminUser:
-        if hasattr(self, "_user"):
-            return self._user
+    async def authorize(self) -> Principal:
+        if hasattr(self, "_principal"):
+            return self._principal
 
         user_id = self.token_processor.validate_access_token(self.jwt_token)
 
+        # logout drops the cached principal, so a hit is never blacklisted
+        principal, stamp = await self.principal_storage.get(self.jwt_token, user_id)
+        if principal is None or principal.id != user_id:
+            principal = await self._load_principal(user_id)
+            await self.principal_storage.set(self.jwt_token, principal, stamp)
+
+        self._principal = principal
+        return principal
+
+    async def _load_principal(self, user_id: UUID) -> Principal:
         if await self.session_storage.is_blacklisted(self.jwt_token):
             raise JWTRevokedError
 
@@ -48,7 +62,27 @@ class IdProvider:
         if not user:
             raise AuthUserNotFoundError
 
-        self._user = user
+        (
+            company_ids,
+            location_ids,
+            admin_location_ids,
+        ) = await self.user_repository.get_access_ids(user_id)
+        return Principal(
+            id=user.id,
+            role=user.role,
+            company_id=user.company_id,
+            company_ids=company_ids,
+            location_ids=location_ids,
+            admin_location_ids=admin_location_ids,
+        )
+
+    async def get_user(self) -> AdminUser:
+        principal = await self.authorize()
+
+        user = await self.user_repository.get(principal.id)
+        if not user:
+            raise AuthUserNotFoundError
+
         return user
 
     async def authorize_customer(self):
@@ -65,57 +99,49 @@ class IdProvider:
         return customer
 
     async def ensure_superadmin(self) -> None:
-        await self.authorize()
-        if self._user.role is not AdminRole.SUPERADMIN:
+        principal = await self.authorize()
+        if principal.role is not AdminRole.SUPERADMIN:
             raise AccessForbiddenError
 
     async def ensure_company_owner(
         self, company_id: UUID | None = None, location_id: UUID | None = None
     ) -> None:
-        await self.authorize()
-        if self._user.role is AdminRole.SUPERADMIN:
+        principal = await self.authorize()
+        if principal.role is AdminRole.SUPERADMIN:
             return
 
         if not company_id and not location_id:
             raise AccessForbiddenError
 
-        if self._user.role is AdminRole.COMPANY_OWNER:
+        if principal.role is AdminRole.COMPANY_OWNER:
             if company_id is not None:
-                if not await self.user_repository.is_company_owner(
-                    self._user.id, company_id
-                ):
+                if company_id not in principal.company_ids:
                     raise AccessForbiddenError
             elif location_id is not None:
-                if not await self.user_repository.is_company_owner_by_location_id(
-                    self._user.id, location_id
-                ):
+                if location_id not in principal.location_ids:
                     raise AccessForbiddenError
             return
 
-        if self._user.role is AdminRole.LOCATION_ADMIN:
+        if principal.role is AdminRole.LOCATION_ADMIN:
             raise AccessDeniedError
 
         raise AccessForbiddenError
 
     async def ensure_location_admin(self, location_id: UUID | None) -> None:
-        await self.authorize()
-        if self._user.role is AdminRole.SUPERADMIN:
+        principal = await self.authorize()
+        if principal.role is AdminRole.SUPERADMIN:
             return
 
         if not location_id:
             raise AccessForbiddenError
 
-        if self._user.role is AdminRole.COMPANY_OWNER:
-            if not await self.user_repository.is_company_owner_by_location_id(
-                self._user.id, location_id
-            ):
+        if principal.role is AdminRole.COMPANY_OWNER:
+            if location_id not in principal.location_ids:
                 raise AccessForbiddenError
             return
 
-        if self._user.role is AdminRole.LOCATION_ADMIN:
-            if not await self.user_repository.is_location_admin(
-                self._user.id, location_id
-            ):
+        if principal.role is AdminRole.LOCATION_ADMIN:
+            if location_id not in principal.admin_location_ids:
                 raise AccessForbiddenError
             return
 
@@ -5,8 +5,8 @@ from dash.main.config import SMSConfig
 
 
 class SMSClient:
-    def __init__(self, config: SMSConfig) -> None:
-        self.api_client = APIClient()
+    def __init__(self, config: SMSConfig, api_client: APIClient) -> None:
+        self.api_client = api_client
         self.config = config
 
     async def send_sms(self, recipients: list[str], message: str) -> None:
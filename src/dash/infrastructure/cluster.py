@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import hashlib
+import os
+import socket
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+from structlog import get_logger
+
+from dash.infrastructure.metrics import metrics
+from dash.main.config import ClusterConfig
+
+logger = get_logger()
+
+
+class ClusterMembership:
+    MEMBERS_KEY = "cluster:members"
+    LEADER_KEY = "cluster:leader:{job}"
+    CLAIM_KEY = "cluster:claim:{message}"
+    # covers the replicas receiving one broadcast, not the device's own retries
+    CLAIM_TTL = 5
+
+    def __init__(self, redis: Redis, config: ClusterConfig) -> None:
+        self.redis = redis
+        self.config = config
+        self.replica_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.members: list[str] = [self.replica_id]
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if not self.config.enabled:
+            return
+
+        await self._heartbeat()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        # let the others take over the devices without waiting for the ttl
+        await self.redis.zrem(self.MEMBERS_KEY, self.replica_id)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.heartbeat_interval)
+            try:
+                await self._heartbeat()
+            except Exception:
+                logger.exception("Cluster heartbeat failed")
+
+    async def _heartbeat(self) -> None:
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.MEMBERS_KEY, {self.replica_id: now})
+            pipe.zremrangebyscore(self.MEMBERS_KEY, 0, now - self.config.member_ttl)
+            pipe.zrange(self.MEMBERS_KEY, 0, -1)
+            *_, members = await pipe.execute()
+
+        members = sorted(member.decode() for member in members)
+        if members != self.members:
+            logger.info("Cluster members changed", members=members)
+            self.members = members
+        metrics.gauge("cluster.members", len(members))
+
+    def owns(self, device_id: str) -> bool:
+        if len(self.members) == 1:
+            return True
+
+        # rendezvous hashing moves only the departed replica's devices
+        owner = max(
+            self.members,
+            key=lambda member: hashlib.blake2b(
+                f"{member}:{device_id}".encode(), digest_size=8
+            ).digest(),
+        )
+        return owner == self.replica_id
+
+    async def acquire_leadership(self, job: str, ttl: int) -> bool:
+        if not self.config.enabled:
+            return True
+
+        # never released, so a replica with a lagging clock skips the same tick
+        return bool(
+            await self.redis.set(
+                self.LEADER_KEY.format(job=job), self.replica_id, nx=True, ex=ttl
+            )
+        )
+
+    async def claim(self, message: str) -> bool:
+        if not self.config.enabled:
+            return True
+
+        return bool(
+            await self.redis.set(
+                self.CLAIM_KEY.format(message=message),
+                self.replica_id,
+                nx=True,
+                ex=self.CLAIM_TTL,
+            )
+        )
+
+
+def leader_only(
+    func: Callable[[AsyncContainer], Awaitable[None]], ttl: int
+) -> Callable[[AsyncContainer], Awaitable[None]]:
+    @functools.wraps(func)
+    async def wrapper(di_container: AsyncContainer) -> None:
+        membership = await di_container.get(ClusterMembership)
+        if await membership.acquire_leadership(func.__name__, ttl):
+            await func(di_container)
+
+    return wrapper
+
+
+async def get_cluster_membership(
+    redis: Redis, config: ClusterConfig
+) -> AsyncIterator[ClusterMembership]:
+    membership = ClusterMembership(redis, config)
+    await membership.start()
+    yield membership
+    await membership.close()
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, TypeVar
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.models.controllers.controller import Controller
+
+logger = get_logger()
+
+ControllerT = TypeVar("ControllerT", bound=Controller)
+
+
+class ControllerCache:
+    TTL_SECONDS = 300
+    MAX_SIZE = 10_000
+    CHANNEL = "controller_cache:invalidate"
+    INVALIDATE_ALL = "*"
+
+    def __init__(
+        self, redis: Redis, sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        self.redis = redis
+        self.sessionmaker = sessionmaker
+        self._entries: OrderedDict[str, tuple[float, Controller | None]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future[Controller | None]] = {}
+        self._generation = 0
+        self._listener: asyncio.Task[None] | None = None
+
+    async def get_by_device_id(self, device_id: str) -> Controller | None:
+        entry = self._entries.get(device_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(device_id)
+            metrics.incr("controller_cache.hit")
+            return entry[1]
+
+        metrics.incr("controller_cache.miss")
+
+        if device_id in self._loading:
+            return await asyncio.shield(self._loading[device_id])
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[device_id] = future
+        try:
+            controller = await self._load(device_id)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(controller)
+            return controller
+        finally:
+            del self._loading[device_id]
+
+    async def get_typed_by_device_id(
+        self, device_id: str, model: type[ControllerT]
+    ) -> ControllerT | None:
+        controller = await self.get_by_device_id(device_id)
+        if isinstance(controller, model):
+            return controller
+        return None
+
+    async def invalidate(self, *device_ids: str) -> None:
+        for device_id in set(device_ids):
+            self._drop(device_id)
+            await self.redis.publish(self.CHANNEL, device_id)
+
+    async def invalidate_all(self) -> None:
+        self._drop(self.INVALIDATE_ALL)
+        await self.redis.publish(self.CHANNEL, self.INVALIDATE_ALL)
+
+    async def _load(self, device_id: str) -> Controller | None:
+        generation = self._generation
+
+        async with self.sessionmaker() as session:
+            controller = await ControllerRepository(session).get_concrete_by_device_id(
+                device_id
+            )
+
+        if generation == self._generation:
+            self._entries[device_id] = (time.monotonic() + self.TTL_SECONDS, controller)
+            self._entries.move_to_end(device_id)
+            while len(self._entries) > self.MAX_SIZE:
+                self._entries.popitem(last=False)
+
+        return controller
+
+    def _drop(self, device_id: str) -> None:
+        self._generation += 1
+        if device_id == self.INVALIDATE_ALL:
+            self._entries.clear()
+        else:
+            self._entries.pop(device_id, None)
+
+    def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # invalidations may have been missed while disconnected
+                    self._drop(self.INVALIDATE_ALL)
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._drop(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Controller cache invalidation listener failed")
+                await asyncio.sleep(1)
+
+
+async def get_controller_cache(
+    redis: Redis, sessionmaker: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[ControllerCache]:
+    cache = ControllerCache(redis, sessionmaker)
+    cache.start()
+    yield cache
+    await cache.close()
@@ -1,46 +1,108 @@
-from aiogram import Bot
+from datetime import UTC, datetime
+
 from dishka import AsyncContainer
 from structlog import get_logger
-from dash.infrastructure.rate_limiter import RateLimiter
+
+from dash.infrastructure.controller_cache import ControllerCache
+from dash.infrastructure.live_events import LiveEvents, LiveEventType
+from dash.infrastructure.notifications import TgNotificationOutbox
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.storages.iot import IoTStorage
+from dash.models.controllers.controller import Controller
 from dash.services.common.check_online_interactor import CheckOnlineInteractor
+from dash.services.common.pagination import CountMode
 from dash.services.controller.dto import ReadControllerListRequest
 
-
 logger = get_logger()
 
 
-async def monitor_controllers_online(di_container: AsyncContainer) -> None:
-    async with di_container() as dic:
-        controller_repository = await dic.get(ControllerRepository)
-        check_online_interactor = await dic.get(CheckOnlineInteractor)
-        iot_storage = await dic.get(IoTStorage)
-        bot = await dic.get(Bot)
-        rate_limiter = await dic.get(RateLimiter)
-
-        controllers, _ = await controller_repository.get_list_all(
-            ReadControllerListRequest(limit=None)
+class ControllersOnlineMonitor:
+    def __init__(
+        self,
+        iot_storage: IoTStorage,
+        check_online: CheckOnlineInteractor,
+        controller_cache: ControllerCache,
+        controller_repository: ControllerRepository,
+        notification_outbox: TgNotificationOutbox,
+        live_events: LiveEvents,
+    ) -> None:
+        self.iot_storage = iot_storage
+        self.check_online = check_online
+        self.controller_cache = controller_cache
+        self.controller_repository = controller_repository
+        self.notification_outbox = notification_outbox
+        self.live_events = live_events
+
+    async def on_state(self, controller: Controller, created: datetime | None) -> None:
+        if created is not None:
+            await self.iot_storage.touch_last_seen({controller.device_id: created})
+
+        await self._apply(controller, await self.check_online(controller))
+
+    async def on_broker_status(self, device_id: str) -> None:
+        controller = await self.controller_cache.get_by_device_id(device_id)
+        if controller is None:
+            return
+
+        await self._apply(controller, await self.check_online(controller))
+
+    async def sweep(self) -> None:
+        """Processes only controllers whose last state crossed the online threshold."""
+        device_ids = await self.iot_storage.pop_last_seen_before(
+            datetime.now(UTC) - CheckOnlineInteractor.ONLINE_THRESHOLD
+        )
+        for device_id in device_ids:
+            await self.on_broker_status(device_id)
+
+    async def reconcile(self) -> None:
+        """Full scan catching up on events missed while the app was down."""
+        controllers, _ = await self.controller_repository.get_list_all(
+            ReadControllerListRequest(limit=None, count=CountMode.NONE)
         )
+
+        markers = await self.iot_storage.get_online_markers([c.id for c in controllers])
+        seen_at = {
+            controller.device_id: created
+            for controller, (created, _) in zip(controllers, markers)
+            if created is not None
+        }
+        if seen_at:
+            await self.iot_storage.touch_last_seen(seen_at)
+
+        online = await self.check_online.check_many(controllers)
         for controller in controllers:
-            if not controller.company:
-                continue
+            await self._apply(controller, online[controller.id])
+
+    async def _apply(self, controller: Controller, current_online: bool) -> None:
+        last_online = await self.iot_storage.swap_last_online_status(
+            controller.id, current_online
+        )
+        if current_online == last_online:
+            return
 
-            current_online = await check_online_interactor(controller)
-            last_online = await iot_storage.get_last_online_status(controller.id)
+        await self.live_events.publish(
+            LiveEventType.ONLINE, controller.id, {"online": current_online}
+        )
+
+        chat_id = controller.company and controller.company.tg_chat_id
+        if not chat_id:
+            return
 
-            chat_id = controller.company.tg_chat_id
+        if current_online is True:
+            text = f"Пристрій {controller.name} ({controller.device_id}) в мережі ✅"
+        else:
+            text = f"Пристрій {controller.name} ({controller.device_id}) не в мережі ⚠️"
 
-            if current_online != last_online:
-                await iot_storage.set_last_online_status(controller.id, current_online)
+        await self.notification_outbox.enqueue(chat_id, text)
 
-                if not chat_id:
-                    continue
 
-                if current_online is True:
-                    text = f"Пристрій {controller.name} ({controller.device_id}) в мережі ✅"
-                else:
-                    text = f"Пристрій {controller.name} ({controller.device_id}) не в мережі ⚠️"
+async def sweep_controllers_online(di_container: AsyncContainer) -> None:
+    async with di_container() as dic:
+        monitor = await dic.get(ControllersOnlineMonitor)
+        await monitor.sweep()
 
-                await rate_limiter.enforce_with_retry("tg_send")
-                await bot.send_message(chat_id, text)
+
+async def reconcile_controllers_online(di_container: AsyncContainer) -> None:
+    async with di_container() as dic:
+        monitor = await dic.get(ControllersOnlineMonitor)
+        await monitor.reconcile()
@@ -0,0 +1,16 @@
+from dishka import AsyncContainer
+from structlog import get_logger
+
+from dash.infrastructure.repositories.daily_revenue import DailyRevenueRepository
+
+logger = get_logger()
+
+
+async def refresh_daily_revenue(di_container: AsyncContainer) -> None:
+    async with di_container() as dic:
+        daily_revenue_repository = await dic.get(DailyRevenueRepository)
+
+        await daily_revenue_repository.refresh_recent()
+        await daily_revenue_repository.commit()
+
+    logger.info("Daily revenue rollup refreshed")
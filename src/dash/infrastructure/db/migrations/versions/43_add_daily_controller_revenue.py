@@ -0,0 +1,116 @@
+"""add daily_controller_revenue
+
+Revision ID: 43
+Revises: 42
+Create Date: 2026-10-18 12:04:51.318224
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "43"
+down_revision: Union[str, None] = "42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_controller_revenue",
+        sa.Column(
+            "id",
+            sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("controller_id", sa.UUID(), nullable=True),
+        sa.Column("location_id", sa.UUID(), nullable=True),
+        sa.Column("bill_amount", sa.BigInteger(), nullable=False),
+        sa.Column("coin_amount", sa.BigInteger(), nullable=False),
+        sa.Column("qr_amount", sa.BigInteger(), nullable=False),
+        sa.Column("paypass_amount", sa.BigInteger(), nullable=False),
+        sa.Column("card_amount", sa.BigInteger(), nullable=False),
+        sa.Column("transactions_count", sa.Integer(), nullable=False),
+        sa.Column("payments_amount", sa.BigInteger(), nullable=False),
+        sa.Column("cash_payments_amount", sa.BigInteger(), nullable=False),
+        sa.Column("cashless_payments_amount", sa.BigInteger(), nullable=False),
+        sa.Column("paypass_payments_amount", sa.BigInteger(), nullable=False),
+        sa.Column("liqpay_payments_amount", sa.BigInteger(), nullable=False),
+        sa.Column("monopay_payments_amount", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "controller_id",
+            "location_id",
+            name="uix_daily_controller_revenue",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index(
+        "ix_transactions_created_at", "transactions", ["created_at"], unique=False
+    )
+    op.create_index("ix_payments_created_at", "payments", ["created_at"], unique=False)
+
+    # backfill every closed day, the periodic refresh takes over from here
+    op.execute(
+        """
+        INSERT INTO daily_controller_revenue (
+            day, controller_id, location_id,
+            bill_amount, coin_amount, qr_amount, paypass_amount, card_amount,
+            transactions_count,
+            payments_amount, cash_payments_amount, cashless_payments_amount,
+            paypass_payments_amount, liqpay_payments_amount, monopay_payments_amount
+        )
+        SELECT
+            created_at::date, controller_id, location_id,
+            sum(bill_amount), sum(coin_amount), sum(qr_amount),
+            sum(paypass_amount), sum(card_amount),
+            count(*),
+            0, 0, 0, 0, 0, 0
+        FROM transactions
+        WHERE created_at < current_date::timestamptz
+        GROUP BY created_at::date, controller_id, location_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO daily_controller_revenue (
+            day, controller_id, location_id,
+            bill_amount, coin_amount, qr_amount, paypass_amount, card_amount,
+            transactions_count,
+            payments_amount, cash_payments_amount, cashless_payments_amount,
+            paypass_payments_amount, liqpay_payments_amount, monopay_payments_amount
+        )
+        SELECT
+            created_at::date, controller_id, location_id,
+            0, 0, 0, 0, 0,
+            0,
+            sum(amount),
+            coalesce(sum(amount) FILTER (WHERE type = 'CASH'), 0),
+            coalesce(sum(amount) FILTER (WHERE type = 'CASHLESS'), 0),
+            coalesce(sum(amount) FILTER (WHERE gateway_type = 'PAYPASS'), 0),
+            coalesce(sum(amount) FILTER (WHERE gateway_type = 'LIQPAY'), 0),
+            coalesce(sum(amount) FILTER (WHERE gateway_type = 'MONOPAY'), 0)
+        FROM payments
+        WHERE status = 'COMPLETED' AND created_at < current_date::timestamptz
+        GROUP BY created_at::date, controller_id, location_id
+        ON CONFLICT ON CONSTRAINT uix_daily_controller_revenue DO UPDATE SET
+            payments_amount = excluded.payments_amount,
+            cash_payments_amount = excluded.cash_payments_amount,
+            cashless_payments_amount = excluded.cashless_payments_amount,
+            paypass_payments_amount = excluded.paypass_payments_amount,
+            liqpay_payments_amount = excluded.liqpay_payments_amount,
+            monopay_payments_amount = excluded.monopay_payments_amount
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_created_at", table_name="payments")
+    op.drop_index("ix_transactions_created_at", table_name="transactions")
+    op.drop_table("daily_controller_revenue")
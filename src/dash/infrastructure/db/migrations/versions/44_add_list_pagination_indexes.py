@@ -0,0 +1,58 @@
+"""add list pagination indexes
+
+Revision ID: 44
+Revises: 43
+Create Date: 2026-10-18 14:37:12.604118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "44"
+down_revision: Union[str, None] = "43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_controller_id_created_at",
+        "transactions",
+        ["controller_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transactions_location_id_created_at",
+        "transactions",
+        ["location_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_payments_controller_id_created_at",
+        "payments",
+        ["controller_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_payments_location_id_created_at",
+        "payments",
+        ["location_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_encashments_controller_id_created_at",
+        "encashments",
+        ["controller_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_encashments_controller_id_created_at", table_name="encashments")
+    op.drop_index("ix_payments_location_id_created_at", table_name="payments")
+    op.drop_index("ix_payments_controller_id_created_at", table_name="payments")
+    op.drop_index("ix_transactions_location_id_created_at", table_name="transactions")
+    op.drop_index("ix_transactions_controller_id_created_at", table_name="transactions")
@@ -0,0 +1,78 @@
+"""add fiscalization_jobs
+
+Revision ID: 45
+Revises: 44
+Create Date: 2026-10-18 16:02:41.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "45"
+down_revision: Union[str, None] = "44"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sa.Enum("PENDING", "DONE", "DEAD", name="fiscalizationjobstatus").create(
+        op.get_bind()
+    )
+    op.create_table(
+        "fiscalization_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("payment_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PENDING",
+                "DONE",
+                "DEAD",
+                name="fiscalizationjobstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "run_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["payment_id"], ["payments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("payment_id"),
+    )
+    op.create_index(
+        "ix_fiscalization_jobs_pending_run_at",
+        "fiscalization_jobs",
+        ["run_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_fiscalization_jobs_pending_run_at",
+        table_name="fiscalization_jobs",
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.drop_table("fiscalization_jobs")
+    sa.Enum("PENDING", "DONE", "DEAD", name="fiscalizationjobstatus").drop(
+        op.get_bind()
+    )
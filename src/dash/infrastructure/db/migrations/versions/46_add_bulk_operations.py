@@ -0,0 +1,131 @@
+"""add bulk_operations
+
+Revision ID: 46
+Revises: 45
+Create Date: 2026-10-18 18:24:09.551730
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "46"
+down_revision: Union[str, None] = "45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sa.Enum(
+        "SET_SETTINGS",
+        "SET_CONFIG",
+        "SYNC_SETTINGS",
+        "REBOOT",
+        name="bulkoperationtype",
+    ).create(op.get_bind())
+    sa.Enum("PENDING", "COMPLETED", name="bulkoperationstatus").create(op.get_bind())
+    sa.Enum("PENDING", "SUCCEEDED", "FAILED", name="bulkoperationitemstatus").create(
+        op.get_bind()
+    )
+    op.create_table(
+        "bulk_operations",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM(
+                "SET_SETTINGS",
+                "SET_CONFIG",
+                "SYNC_SETTINGS",
+                "REBOOT",
+                name="bulkoperationtype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PENDING",
+                "COMPLETED",
+                name="bulkoperationstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_by", sa.UUID(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["created_by"], ["admin_users.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "bulk_operation_items",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("operation_id", sa.UUID(), nullable=False),
+        sa.Column("controller_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PENDING",
+                "SUCCEEDED",
+                "FAILED",
+                name="bulkoperationitemstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["operation_id"], ["bulk_operations.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["controller_id"], ["controllers.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_bulk_operation_items_operation_id"),
+        "bulk_operation_items",
+        ["operation_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_bulk_operation_items_operation_id"),
+        table_name="bulk_operation_items",
+    )
+    op.drop_table("bulk_operation_items")
+    op.drop_table("bulk_operations")
+    sa.Enum("PENDING", "SUCCEEDED", "FAILED", name="bulkoperationitemstatus").drop(
+        op.get_bind()
+    )
+    sa.Enum("PENDING", "COMPLETED", name="bulkoperationstatus").drop(op.get_bind())
+    sa.Enum(
+        "SET_SETTINGS",
+        "SET_CONFIG",
+        "SYNC_SETTINGS",
+        "REBOOT",
+        name="bulkoperationtype",
+    ).drop(op.get_bind())
@@ -0,0 +1,107 @@
+"""add acquiring_webhooks
+
+Revision ID: 47
+Revises: 46
+Create Date: 2026-10-18 20:41:17.204583
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "47"
+down_revision: Union[str, None] = "46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sa.Enum("PENDING", "DONE", "DEAD", name="acquiringwebhookstatus").create(
+        op.get_bind()
+    )
+    op.create_table(
+        "acquiring_webhooks",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "gateway_type",
+            postgresql.ENUM(
+                "MONOPAY",
+                "LIQPAY",
+                "PAYPASS",
+                name="paymentgatewaytype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("invoice_id", sa.String(), nullable=False),
+        sa.Column("payment_status", sa.String(), nullable=False),
+        sa.Column("modified_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "PENDING",
+                "DONE",
+                "DEAD",
+                name="acquiringwebhookstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "run_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "gateway_type",
+            "invoice_id",
+            "modified_at",
+            "payment_status",
+            name="uix_acquiring_webhooks_delivery",
+        ),
+    )
+    op.create_index(
+        "ix_acquiring_webhooks_invoice_modified_at",
+        "acquiring_webhooks",
+        ["invoice_id", "modified_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_acquiring_webhooks_pending_run_at",
+        "acquiring_webhooks",
+        ["run_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_acquiring_webhooks_pending_run_at",
+        table_name="acquiring_webhooks",
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.drop_index(
+        "ix_acquiring_webhooks_invoice_modified_at",
+        table_name="acquiring_webhooks",
+    )
+    op.drop_table("acquiring_webhooks")
+    sa.Enum("PENDING", "DONE", "DEAD", name="acquiringwebhookstatus").drop(
+        op.get_bind()
+    )
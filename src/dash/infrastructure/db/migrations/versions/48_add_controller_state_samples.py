@@ -0,0 +1,36 @@
+"""add controller_state_samples
+
+Revision ID: 48
+Revises: 47
+Create Date: 2026-10-18 22:05:43.518207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "48"
+down_revision: Union[str, None] = "47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "controller_state_samples",
+        sa.Column("controller_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("state", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["controller_id"], ["controllers.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("controller_id", "created_at"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("controller_state_samples")
@@ -0,0 +1,40 @@
+"""add energy_samples
+
+Revision ID: 49
+Revises: 48
+Create Date: 2026-10-18 23:12:08.640915
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "49"
+down_revision: Union[str, None] = "48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "energy_samples",
+        sa.Column("controller_id", sa.UUID(), nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("power_sum", sa.Float(), nullable=False),
+        sa.Column("power_max", sa.Float(), nullable=False),
+        sa.Column("voltage_sum", sa.Float(), nullable=False),
+        sa.Column("current_sum", sa.Float(), nullable=False),
+        sa.Column("energy_total", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["controller_id"], ["controllers.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("controller_id", "bucket"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("energy_samples")
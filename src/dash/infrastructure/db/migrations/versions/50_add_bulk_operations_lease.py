@@ -0,0 +1,57 @@
+"""add bulk_operations lease
+
+Revision ID: 50
+Revises: 49
+Create Date: 2026-10-19 10:02:41.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from alembic_postgresql_enum import TableReference
+
+# revision identifiers, used by Alembic.
+revision: str = "50"
+down_revision: Union[str, None] = "49"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bulk_operations",
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.sync_enum_values(  # type: ignore
+        enum_schema="public",
+        enum_name="bulkoperationstatus",
+        new_values=["PENDING", "RUNNING", "COMPLETED"],
+        affected_columns=[
+            TableReference(
+                table_schema="public",
+                table_name="bulk_operations",
+                column_name="status",
+            )
+        ],
+        enum_values_to_rename=[],
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE bulk_operations SET status = 'PENDING' WHERE status = 'RUNNING'")
+    op.sync_enum_values(  # type: ignore
+        enum_schema="public",
+        enum_name="bulkoperationstatus",
+        new_values=["PENDING", "COMPLETED"],
+        affected_columns=[
+            TableReference(
+                table_schema="public",
+                table_name="bulk_operations",
+                column_name="status",
+            )
+        ],
+        enum_values_to_rename=[],
+    )
+    op.drop_column("bulk_operations", "lease_until")
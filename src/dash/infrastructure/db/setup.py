@@ -11,7 +11,11 @@ from dash.main.config import PostgresConfig
 
 
 async def get_async_engine(config: PostgresConfig) -> AsyncGenerator[AsyncEngine, None]:
-    engine = create_async_engine(config.build_dsn())
+    engine = create_async_engine(
+        config.build_dsn(),
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+    )
 
     yield engine
 
@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.energy_state import EnergyStateRepository
+from dash.services.iot.dto import EnergyStateDTO
+
+logger = get_logger()
+
+
+@dataclass
+class EnergyBucket:
+    samples: int = 0
+    power_sum: float = 0
+    power_max: float = 0
+    voltage_sum: float = 0
+    current_sum: float = 0
+    energy_total: float = 0
+
+    def add(self, data: EnergyStateDTO) -> None:
+        self.samples += 1
+        self.power_sum += data.power
+        self.power_max = max(self.power_max, data.power)
+        self.voltage_sum += data.voltage
+        self.current_sum += data.current
+        self.energy_total = max(self.energy_total, data.energy_total)
+
+    def merge(self, other: "EnergyBucket") -> None:
+        self.samples += other.samples
+        self.power_sum += other.power_sum
+        self.power_max = max(self.power_max, other.power_max)
+        self.voltage_sum += other.voltage_sum
+        self.current_sum += other.current_sum
+        self.energy_total = max(self.energy_total, other.energy_total)
+
+
+class EnergyRecorder:
+    FLUSH_INTERVAL = 30
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        self.sessionmaker = sessionmaker
+        self._buckets: dict[tuple[UUID, datetime], EnergyBucket] = {}
+        # the last daily row known to exist, so the check runs once a day
+        self._recorded_days: dict[UUID, date] = {}
+        self._worker: asyncio.Task[None] | None = None
+
+    def add(self, controller_id: UUID, data: EnergyStateDTO) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        # device clocks are local and drift, buckets follow the receive time
+        minute = datetime.now(UTC).replace(second=0, microsecond=0)
+        bucket = self._buckets.get((controller_id, minute))
+        if bucket is None:
+            bucket = self._buckets[(controller_id, minute)] = EnergyBucket()
+        bucket.add(data)
+
+    def is_day_recorded(self, controller_id: UUID, day: date) -> bool:
+        return self._recorded_days.get(controller_id) == day
+
+    def mark_day_recorded(self, controller_id: UUID, day: date) -> None:
+        self._recorded_days[controller_id] = day
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            # a flush interrupted by the cancellation puts its buckets back first
+            await asyncio.gather(self._worker, return_exceptions=True)
+        try:
+            await self.flush(include_current=True)
+        except Exception:
+            logger.exception("Energy samples flush failed on shutdown")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Energy samples flush failed")
+
+    async def flush(self, include_current: bool = False) -> None:
+        minute = datetime.now(UTC).replace(second=0, microsecond=0)
+        keys = [key for key in self._buckets if include_current or key[1] < minute]
+        if not keys:
+            return
+
+        buckets = {key: self._buckets.pop(key) for key in keys}
+        try:
+            async with self.sessionmaker() as session:
+                repository = EnergyStateRepository(session)
+                await repository.upsert_samples(
+                    [
+                        {
+                            "controller_id": controller_id,
+                            "bucket": bucket_start,
+                            "samples": bucket.samples,
+                            "power_sum": bucket.power_sum,
+                            "power_max": bucket.power_max,
+                            "voltage_sum": bucket.voltage_sum,
+                            "current_sum": bucket.current_sum,
+                            "energy_total": bucket.energy_total,
+                        }
+                        for (controller_id, bucket_start), bucket in buckets.items()
+                    ]
+                )
+                await repository.commit()
+        except BaseException:
+            # keep the readings for the next flush, the upsert merges them
+            for key, bucket in buckets.items():
+                if key in self._buckets:
+                    self._buckets[key].merge(bucket)
+                else:
+                    self._buckets[key] = bucket
+            raise
+
+        metrics.incr("energy_samples.flushed", len(buckets))
+
+
+async def get_energy_recorder(
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[EnergyRecorder]:
+    recorder = EnergyRecorder(sessionmaker)
+    yield recorder
+    await recorder.close()
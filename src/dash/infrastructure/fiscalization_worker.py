@@ -0,0 +1,175 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+
+from dash.infrastructure.acquiring.checkbox import (
+    CheckboxRejectedError,
+    CheckboxService,
+    CheckboxShiftClosedError,
+)
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.fiscalization_job import (
+    FiscalizationJobRepository,
+)
+from dash.main.config import AppConfig
+from dash.models import Controller
+from dash.models.fiscalization_job import FiscalizationJob, FiscalizationJobStatus
+from dash.models.payment import Payment
+
+logger = get_logger()
+
+
+class FiscalizationWorker:
+    WORKERS = 8
+    POLL_INTERVAL = 1
+    DEPTH_REPORT_INTERVAL = 30
+    LEASE = timedelta(minutes=5)
+    MAX_ATTEMPTS = 10
+    BASE_BACKOFF = timedelta(seconds=30)
+    MAX_BACKOFF = timedelta(hours=1)
+    SHIFT_OPENS_AT = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        checkbox_service: CheckboxService,
+        config: AppConfig,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.checkbox_service = checkbox_service
+        self.config = config
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run_worker()) for _ in range(self.WORKERS)
+        ]
+        self._tasks.append(asyncio.create_task(self._report_depth()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run_worker(self) -> None:
+        while True:
+            try:
+                processed = await self.process_next()
+            except Exception:
+                logger.exception("Fiscalization worker failed")
+                processed = False
+
+            if not processed:
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _report_depth(self) -> None:
+        while True:
+            try:
+                async with self.sessionmaker() as session:
+                    depth = await FiscalizationJobRepository(session).count_pending()
+                metrics.gauge("fiscalization.queue_depth", depth)
+            except Exception:
+                logger.exception("Failed to report fiscalization queue depth")
+
+            await asyncio.sleep(self.DEPTH_REPORT_INTERVAL)
+
+    async def process_next(self) -> bool:
+        async with self.sessionmaker() as session:
+            job = await FiscalizationJobRepository(session).claim(self.LEASE)
+            await session.commit()
+            if job is None:
+                return False
+
+            payment = await session.get(Payment, job.payment_id)
+            controller = None
+            if payment is not None and payment.controller_id is not None:
+                controller = await session.get(Controller, payment.controller_id)
+            # release the connection before calling Checkbox
+            await session.commit()
+
+            started = time.perf_counter()
+            try:
+                if payment is None or controller is None:
+                    raise CheckboxRejectedError("Controller not found")
+                await self.checkbox_service.create_receipt(
+                    controller, payment, payment.receipt_id
+                )
+            except CheckboxShiftClosedError:
+                result = self._postpone(job)
+            except CheckboxRejectedError as e:
+                result = self._mark_dead(job, payment, e)
+            except Exception as e:
+                result = self._retry(job, payment, e)
+            else:
+                job.status = FiscalizationJobStatus.DONE
+                job.last_error = None
+                payment.checkbox_error = None
+                result = "done"
+
+            await session.commit()
+
+        metrics.incr("fiscalization.processed", result=result)
+        metrics.observe(
+            "fiscalization.duration", time.perf_counter() - started, result=result
+        )
+        return True
+
+    def _postpone(self, job: FiscalizationJob) -> str:
+        # a closed shift is not a failure, the receipt goes out once it reopens
+        now = datetime.now(self.config.timezone)
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        job.run_at = tomorrow.replace(tzinfo=now.tzinfo) + self.SHIFT_OPENS_AT
+        job.attempts -= 1
+        return "postponed"
+
+    def _mark_dead(
+        self, job: FiscalizationJob, payment: Payment | None, error: Exception
+    ) -> str:
+        job.status = FiscalizationJobStatus.DEAD
+        job.last_error = str(error)
+        if payment is not None:
+            payment.checkbox_error = str(error)
+
+        logger.error(
+            "Fiscalization job dead-lettered",
+            job_id=job.id,
+            payment_id=job.payment_id,
+            attempts=job.attempts,
+            error=str(error),
+        )
+        return "dead"
+
+    def _retry(
+        self, job: FiscalizationJob, payment: Payment | None, error: Exception
+    ) -> str:
+        if job.attempts >= self.MAX_ATTEMPTS:
+            return self._mark_dead(job, payment, error)
+
+        backoff = min(self.BASE_BACKOFF * 2 ** (job.attempts - 1), self.MAX_BACKOFF)
+        job.run_at = datetime.now(self.config.timezone) + backoff
+        job.last_error = str(error)
+
+        logger.warning(
+            "Fiscalization job failed, retrying",
+            job_id=job.id,
+            payment_id=job.payment_id,
+            attempts=job.attempts,
+            retry_in=backoff.total_seconds(),
+            error=str(error),
+        )
+        return "retry"
+
+
+async def get_fiscalization_worker(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    checkbox_service: CheckboxService,
+    config: AppConfig,
+) -> AsyncIterator[FiscalizationWorker]:
+    worker = FiscalizationWorker(sessionmaker, checkbox_service, config)
+    worker.start()
+    yield worker
+    await worker.close()
@@ -8,4 +8,4 @@ class CarCleanerIoTDispatcher(BaseIoTDispatcher):
 
 
 class CarCleanerIoTClient(BaseIoTClient):
-    pass
+    device_type = "car_cleaner"
@@ -1,6 +1,10 @@
 from npc_iot.base import MessageHandler
 
-from dash.infrastructure.iot.common.base_client import BaseIoTClient, BaseIoTDispatcher
+from dash.infrastructure.iot.common.base_client import (
+    BaseIoTClient,
+    BaseIoTDispatcher,
+    CommandPriority,
+)
 
 
 class CarwashIoTDispatcher(BaseIoTDispatcher):
@@ -8,6 +12,8 @@ class CarwashIoTDispatcher(BaseIoTDispatcher):
 
 
 class CarwashIoTClient(BaseIoTClient):
+    device_type = "carwash"
+
     async def set_session(
         self, device_id: str, payload: dict[str, str], ttl: int = 5
     ) -> None:
@@ -17,4 +23,5 @@ class CarwashIoTClient(BaseIoTClient):
             payload=payload,
             ttl=ttl,
             qos=1,
+            priority=CommandPriority.PAYMENT,
         )
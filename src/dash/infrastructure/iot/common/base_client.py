@@ -1,8 +1,16 @@
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from enum import IntEnum
 from typing import Any, Literal, Mapping
 
 from npc_iot.base import BaseClient, BaseDispatcher, MessageHandler
 from npc_iot.exception import DeviceResponceError
 
+from dash.infrastructure.metrics import metrics
 from dash.services.common.errors.controller import (
     ControllerResponseError,
     ControllerTimeoutError,
@@ -28,7 +36,135 @@ class BaseIoTDispatcher(BaseDispatcher):
     paypass = MessageHandler(topic="/+/server/paypass/set")
 
 
+class CommandPriority(IntEnum):
+    PAYMENT = 0
+    CONTROL = 1
+    READ = 2
+    CONFIG = 3
+
+
+class DeviceCommandQueue:
+    def __init__(self, max_in_flight: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and not self._waiters
+
+    async def acquire(self, priority: CommandPriority) -> None:
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over right before the cancellation
+                self.release()
+            else:
+                self._waiters = [w for w in self._waiters if w[2] is not future]
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # the slot passes straight to the waiter, in_flight stays the same
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class ReadAbandonedError(Exception):
+    """The caller leading a coalesced read was cancelled before the response."""
+
+
 class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
+    device_type = "iot"
+
+    def __init__(
+        self,
+        *args: Any,
+        read_cache_ttl: float = 0,
+        max_in_flight: int = 2,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.read_cache_ttl = read_cache_ttl
+        self.max_in_flight = max_in_flight
+        self._queues: dict[str, DeviceCommandQueue] = {}
+        self._reads: dict[tuple[str, str, str], asyncio.Future[dict[str, Any]]] = {}
+        self._read_cache: dict[tuple[str, str, str], tuple[float, dict[str, Any]]] = {}
+        # bumped by every write, a read that overlapped one is not cached
+        self._write_generations: dict[str, int] = {}
+
+    async def _read(
+        self,
+        device_id: str,
+        topic: str,
+        payload: Mapping[str, Any],
+        ttl: int,
+    ) -> dict[str, Any]:
+        # identical concurrent reads share one round-trip to the device
+        key = (device_id, topic, json.dumps(payload, sort_keys=True))
+
+        cached = self._read_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] <= self.read_cache_ttl:
+                metrics.incr("iot.read_coalesced", topic=topic, source="cache")
+                return dict(cached[1])
+            del self._read_cache[key]
+
+        while (pending := self._reads.get(key)) is not None:
+            metrics.incr("iot.read_coalesced", topic=topic, source="inflight")
+            try:
+                return dict(await asyncio.shield(pending))
+            except ReadAbandonedError:
+                # the leading caller was cancelled, one of the others takes over
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._reads[key] = future
+        generation = self._write_generations.get(device_id, 0)
+        try:
+            response = await self._wait_for_response(
+                device_id=device_id,
+                topic=topic,
+                qos=1,
+                payload=payload,
+                ttl=ttl,
+                priority=CommandPriority.READ,
+            )
+        except asyncio.CancelledError:
+            # only this caller gave up, the ones sharing the read must not
+            future.set_exception(ReadAbandonedError())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # nobody may be waiting, mark the error as retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            if (
+                self.read_cache_ttl > 0
+                and self._write_generations.get(device_id, 0) == generation
+            ):
+                self._read_cache[key] = (time.monotonic(), response)
+        finally:
+            del self._reads[key]
+
+        metrics.incr("iot.read", topic=topic)
+        return dict(response)
+
     async def _wait_for_response(
         self,
         device_id: str,
@@ -36,17 +172,70 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
         qos: Literal[0, 1, 2],
         payload: Mapping[str, Any] | None,
         ttl: int,
+        priority: CommandPriority = CommandPriority.CONTROL,
     ) -> dict[str, Any]:
-        waiter = await self.send_message(device_id, topic, qos, payload, ttl)
+        is_write = not topic.endswith("/get")
+        if is_write:
+            # a write makes any cached read of the device stale
+            self._invalidate_reads(device_id)
+
+        queue = self._queues.get(device_id)
+        if queue is None:
+            queue = self._queues[device_id] = DeviceCommandQueue(self.max_in_flight)
+
+        queued_at = time.perf_counter()
         try:
-            response = await waiter.wait(timeout=ttl)
+            async with asyncio.timeout(ttl):
+                await queue.acquire(priority)
+        except TimeoutError:
+            metrics.incr("iot.command.queue_timeout", device_type=self.device_type)
+            raise ControllerTimeoutError
+        finally:
+            if queue.idle:
+                self._queues.pop(device_id, None)
+
+        sent_at = time.perf_counter()
+        metrics.observe(
+            "iot.command.queue_time",
+            sent_at - queued_at,
+            device_type=self.device_type,
+            priority=priority.name,
+        )
+        # the time spent queued counts against the caller's ttl
+        remaining = ttl - (sent_at - queued_at)
+        try:
+            waiter = await self.send_message(
+                device_id, topic, qos, payload, max(1, math.ceil(remaining))
+            )
+            response = await waiter.wait(timeout=remaining)
         except DeviceResponceError:
             raise ControllerResponseError
         except TimeoutError:
+            metrics.incr("iot.command.timeout", device_type=self.device_type)
             raise ControllerTimeoutError
+        finally:
+            queue.release()
+            if queue.idle:
+                self._queues.pop(device_id, None)
+            if is_write:
+                # reads that completed while the write was in flight saw the old state
+                self._invalidate_reads(device_id)
 
+        metrics.observe(
+            "iot.command.response_time",
+            time.perf_counter() - sent_at,
+            device_type=self.device_type,
+            topic=topic,
+        )
         return response
 
+    def _invalidate_reads(self, device_id: str) -> None:
+        self._write_generations[device_id] = (
+            self._write_generations.get(device_id, 0) + 1
+        )
+        for key in [key for key in self._read_cache if key[0] == device_id]:
+            del self._read_cache[key]
+
     async def reboot(
         self,
         device_id: str,
@@ -70,6 +259,7 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
             qos=1,
             payload=payload,
             ttl=ttl,
+            priority=CommandPriority.CONFIG,
         )
 
     async def get_config(
@@ -78,10 +268,9 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
         if fields is None:
             fields = []
 
-        return await self._wait_for_response(
+        return await self._read(
             device_id=device_id,
             topic="client/config/get",
-            qos=1,
             payload={"fields": fields},
             ttl=ttl,
         )
@@ -95,6 +284,7 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
             qos=1,
             payload=payload,
             ttl=ttl,
+            priority=CommandPriority.CONFIG,
         )
 
     async def get_settings(
@@ -103,10 +293,9 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
         if fields is None:
             fields = []
 
-        return await self._wait_for_response(
+        return await self._read(
             device_id=device_id,
             topic="client/setting/get",
-            qos=1,
             payload={"fields": fields},
             ttl=ttl,
         )
@@ -117,10 +306,9 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
         if fields is None:
             fields = []
 
-        return await self._wait_for_response(
+        return await self._read(
             device_id=device_id,
             topic="client/display/get",
-            qos=1,
             payload={"fields": fields},
             ttl=ttl,
         )
@@ -134,6 +322,7 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
             qos=1,
             payload=payload,
             ttl=ttl,
+            priority=CommandPriority.PAYMENT,
         )
 
     async def set_action(
@@ -180,11 +369,10 @@ class BaseIoTClient(BaseClient[BaseIoTDispatcher]):
         if fields is None:
             fields = []
 
-        return await self._wait_for_response(
+        return await self._read(
             device_id=device_id,
             topic="client/state/get",
             payload={"fields": fields},
-            qos=1,
             ttl=ttl,
         )
 
@@ -2,4 +2,4 @@ from dash.infrastructure.iot.common.base_client import BaseIoTClient
 
 
 class FiscalizerIoTClient(BaseIoTClient):
-    pass
+    device_type = "fiscalizer"
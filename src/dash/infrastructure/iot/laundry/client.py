@@ -10,6 +10,8 @@ class LaundryIoTDispatcher(BaseIoTDispatcher):
 
 
 class LaundryIoTClient(BaseIoTClient):
+    device_type = "laundry"
+
     async def set_state(
         self,
         device_id: str,
@@ -25,11 +27,10 @@ class LaundryIoTClient(BaseIoTClient):
         )
 
     async def get_state(self, device_id: str, ttl: int = 5) -> dict[str, Any]:
-        return await self._wait_for_response(
+        return await self._read(
             device_id=device_id,
             topic="client/state/get",
             payload={"relay": [0, 1], "output": [0, 1, 2, 3, 4, 5], "input": [0, 1]},
-            qos=1,
             ttl=ttl,
         )
 
@@ -21,6 +21,8 @@ async def get_laundry_client(
         port=config.port,
         username=config.username,
         password=config.password,
+        read_cache_ttl=config.read_cache_ttl,
+        max_in_flight=config.max_in_flight_per_device,
         topic_prefix="v2",
         dispatcher_class=LaundryIoTDispatcher,
         dispatcher_kwargs={"callback_kwargs": {"di_container": di_container}},
@@ -8,4 +8,4 @@ class VacuumIoTDispatcher(BaseIoTDispatcher):
 
 
 class VacuumIoTClient(BaseIoTClient):
-    pass
+    device_type = "vacuum"
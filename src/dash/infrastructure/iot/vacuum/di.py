@@ -27,6 +27,8 @@ async def get_vacuum_client(
         port=config.port,
         username=config.username,
         password=config.password,
+        read_cache_ttl=config.read_cache_ttl,
+        max_in_flight=config.max_in_flight_per_device,
         topic_prefix="car_vacuum_cleaner",
         dispatcher_class=VacuumIoTDispatcher,
         dispatcher_kwargs={"callback_kwargs": {"di_container": di_container}},
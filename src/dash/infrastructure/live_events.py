@@ -0,0 +1,143 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, AsyncIterator, Collection, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from structlog import get_logger
+
+from dash.infrastructure.metrics import metrics
+
+logger = get_logger()
+
+
+class LiveEventType(StrEnum):
+    TRANSACTION = "transaction"
+    PAYMENT = "payment"
+    ONLINE = "online"
+    STATE = "state"
+
+
+@dataclass(eq=False)
+class LiveSubscriber:
+    controller_ids: Collection[UUID] | None
+    queue: asyncio.Queue[bytes] = field(
+        default_factory=lambda: asyncio.Queue(LiveEvents.QUEUE_SIZE)
+    )
+    overflowed: bool = False
+
+
+class LiveEvents:
+    CHANNEL = "live:events"
+    QUEUE_SIZE = 1000
+    HEARTBEAT_INTERVAL = 15
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self._subscribers: set[LiveSubscriber] = set()
+        self._listener: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def encode(
+        event_type: LiveEventType, controller_id: UUID, data: dict[str, Any]
+    ) -> str:
+        # subscribers are filtered by controller, an event without one can't be routed
+        if controller_id is None:
+            raise ValueError(f"{event_type} event published without a controller_id")
+        return json.dumps(
+            {"type": event_type, "controller_id": controller_id, "data": data},
+            default=str,
+        )
+
+    async def publish(
+        self, event_type: LiveEventType, controller_id: UUID, data: dict[str, Any]
+    ) -> None:
+        await self.redis.publish(
+            self.CHANNEL, self.encode(event_type, controller_id, data)
+        )
+
+    async def publish_many(
+        self, events: Sequence[tuple[LiveEventType, UUID, dict[str, Any]]]
+    ) -> None:
+        if not events:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.publish(self.CHANNEL, self.encode(*event))
+            await pipe.execute()
+
+    async def subscribe(
+        self, controller_ids: Collection[UUID] | None
+    ) -> AsyncIterator[bytes | None]:
+        """Yields raw events of the controllers, None when idle for a heartbeat"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+        subscriber = LiveSubscriber(controller_ids)
+        self._subscribers.add(subscriber)
+        metrics.gauge("live_events.subscribers", len(self._subscribers))
+        try:
+            while not subscriber.overflowed:
+                try:
+                    yield await asyncio.wait_for(
+                        subscriber.queue.get(), self.HEARTBEAT_INTERVAL
+                    )
+                except TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(subscriber)
+            metrics.gauge("live_events.subscribers", len(self._subscribers))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+
+    async def _listen(self) -> None:
+        # a single subscription per process, fanned out to the local clients
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live events listener failed")
+                await asyncio.sleep(1)
+
+    def _dispatch(self, raw: bytes) -> None:
+        if not self._subscribers:
+            return
+
+        try:
+            controller_id = UUID(json.loads(raw)["controller_id"])
+        except (ValueError, KeyError, TypeError):
+            # one malformed message must not stop the listener for everyone
+            logger.warning("Malformed live event", raw=raw[:200])
+            metrics.incr("live_events.malformed")
+            return
+
+        for subscriber in self._subscribers:
+            if (
+                subscriber.controller_ids is not None
+                and controller_id not in subscriber.controller_ids
+            ):
+                continue
+
+            try:
+                subscriber.queue.put_nowait(raw)
+            except asyncio.QueueFull:
+                # the client can't keep up, it reconnects and reloads the dashboard
+                subscriber.overflowed = True
+                metrics.incr("live_events.overflow")
+
+
+async def get_live_events(redis: Redis) -> AsyncIterator[LiveEvents]:
+    live_events = LiveEvents(redis)
+    yield live_events
+    await live_events.close()
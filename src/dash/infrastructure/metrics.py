@@ -0,0 +1,88 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else self.max
+
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: dict[str, int] = defaultdict(int)
+        self.gauges: dict[str, float] = {}
+        self.histograms: dict[str, Histogram] = defaultdict(Histogram)
+
+    @staticmethod
+    def _key(name: str, tags: dict[str, Any]) -> str:
+        if not tags:
+            return name
+
+        labels = ",".join(f"{key}={value}" for key, value in sorted(tags.items()))
+        return f"{name}{{{labels}}}"
+
+    def incr(self, name: str, value: int = 1, **tags: Any) -> None:
+        self.counters[self._key(name, tags)] += value
+
+    def gauge(self, name: str, value: float, **tags: Any) -> None:
+        self.gauges[self._key(name, tags)] = value
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        self.histograms[self._key(name, tags)].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **tags: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **tags)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": {
+                key: histogram.snapshot() for key, histogram in self.histograms.items()
+            },
+        }
+
+
+metrics = Metrics()
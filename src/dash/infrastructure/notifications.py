@@ -0,0 +1,164 @@
+import asyncio
+import os
+import socket
+import time
+from collections import defaultdict
+from typing import AsyncIterator
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from structlog import get_logger
+
+from dash.infrastructure.rate_limiter import RateLimiter
+
+logger = get_logger()
+
+Entry = tuple[bytes, dict[bytes, bytes]]
+
+
+class TgNotificationOutbox:
+    STREAM = "tg:outbox"
+    GROUP = "tg_senders"
+    MAX_LEN = 100_000
+    READ_COUNT = 100
+    READ_BLOCK_MS = 5000
+    COALESCE_WINDOW_SECONDS = 5.0
+    CLAIM_INTERVAL_SECONDS = 30.0
+    CLAIM_MIN_IDLE_MS = 60_000
+    MAX_LINES = 20
+    MAX_MESSAGE_LENGTH = 4096
+
+    def __init__(self, redis: Redis, bot: Bot, rate_limiter: RateLimiter) -> None:
+        self.redis = redis
+        self.bot = bot
+        self.rate_limiter = rate_limiter
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._last_claim = 0.0
+        self._worker: asyncio.Task[None] | None = None
+
+    async def enqueue(self, chat_id: str, text: str) -> None:
+        try:
+            await self.redis.xadd(
+                self.STREAM,
+                {"chat_id": chat_id, "text": text},
+                maxlen=self.MAX_LEN,
+                approximate=True,
+            )
+        except Exception:
+            logger.exception("Failed to enqueue telegram message", chat_id=chat_id)
+
+    def start(self) -> None:
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._ensure_group()
+                while True:
+                    entries = await self._claim_stale() + await self._read_window()
+                    if entries:
+                        await self._deliver(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Telegram outbox worker failed")
+                await asyncio.sleep(1)
+
+    async def _ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(
+                self.STREAM, self.GROUP, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _read(self, block_ms: int) -> list[Entry]:
+        response = await self.redis.xreadgroup(
+            self.GROUP,
+            self.consumer,
+            {self.STREAM: ">"},
+            count=self.READ_COUNT,
+            block=block_ms,
+        )
+        return [entry for _, entries in response for entry in entries]
+
+    async def _read_window(self) -> list[Entry]:
+        entries = await self._read(self.READ_BLOCK_MS)
+        if not entries:
+            return entries
+
+        # keep reading for a while so bursts for the same chat end up in one message
+        deadline = time.monotonic() + self.COALESCE_WINDOW_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            entries += await self._read(max(1, int(remaining * 1000)))
+
+        return entries
+
+    async def _claim_stale(self) -> list[Entry]:
+        if time.monotonic() - self._last_claim < self.CLAIM_INTERVAL_SECONDS:
+            return []
+        self._last_claim = time.monotonic()
+
+        _, entries, *_ = await self.redis.xautoclaim(
+            self.STREAM,
+            self.GROUP,
+            self.consumer,
+            min_idle_time=self.CLAIM_MIN_IDLE_MS,
+            count=self.READ_COUNT,
+        )
+        return entries
+
+    async def _deliver(self, entries: list[Entry]) -> None:
+        by_chat: dict[str, list[Entry]] = defaultdict(list)
+        for entry in entries:
+            by_chat[entry[1][b"chat_id"].decode()].append(entry)
+
+        for chat_id, chat_entries in by_chat.items():
+            text = self._coalesce(
+                [fields[b"text"].decode() for _, fields in chat_entries]
+            )
+
+            try:
+                await self.rate_limiter.enforce_with_retry("tg_send")
+                await self.bot.send_message(chat_id, text)
+            except TelegramRetryAfter as e:
+                # left pending, picked up again by _claim_stale
+                logger.warning("Telegram flood control", retry_after=e.retry_after)
+                await asyncio.sleep(e.retry_after)
+                continue
+            except (TelegramBadRequest, TelegramForbiddenError):
+                logger.exception("Telegram rejected message", chat_id=chat_id)
+            except Exception:
+                logger.exception("Failed to send telegram message", chat_id=chat_id)
+                continue
+
+            await self.redis.xack(
+                self.STREAM, self.GROUP, *[entry_id for entry_id, _ in chat_entries]
+            )
+
+    def _coalesce(self, texts: list[str]) -> str:
+        lines = texts[: self.MAX_LINES]
+        if len(texts) > self.MAX_LINES:
+            lines.append(f"... та ще {len(texts) - self.MAX_LINES}")
+
+        return "\n".join(lines)[: self.MAX_MESSAGE_LENGTH]
+
+
+async def get_tg_notification_outbox(
+    redis: Redis, bot: Bot, rate_limiter: RateLimiter
+) -> AsyncIterator[TgNotificationOutbox]:
+    outbox = TgNotificationOutbox(redis, bot, rate_limiter)
+    outbox.start()
+    yield outbox
+    await outbox.close()
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import exists, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+from uuid_utils.compat import uuid7
+
+from dash.infrastructure.repositories.base import BaseRepository
+from dash.models.acquiring_webhook import AcquiringWebhook, AcquiringWebhookStatus
+from dash.models.payment import PaymentGatewayType
+
+
+class AcquiringWebhookRepository(BaseRepository):
+    CLAIM_LOCK_ID = 7_420_001
+
+    async def enqueue(
+        self,
+        gateway_type: PaymentGatewayType,
+        invoice_id: str,
+        payment_status: str,
+        modified_at: datetime,
+        payload: dict[str, Any],
+    ) -> bool:
+        stmt = (
+            insert(AcquiringWebhook)
+            .values(
+                id=uuid7(),
+                gateway_type=gateway_type,
+                invoice_id=invoice_id,
+                payment_status=payment_status,
+                modified_at=modified_at,
+                payload=payload,
+                status=AcquiringWebhookStatus.PENDING,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(constraint="uix_acquiring_webhooks_delivery")
+            .returning(AcquiringWebhook.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def claim(self, lease: timedelta) -> AcquiringWebhook | None:
+        # claims are serialized, so each one sees the leases taken before it
+        await self.session.execute(
+            select(func.pg_advisory_xact_lock(self.CLAIM_LOCK_ID))
+        )
+
+        earlier = aliased(AcquiringWebhook)
+        other = aliased(AcquiringWebhook)
+        next_webhook_id = (
+            select(AcquiringWebhook.id)
+            .where(
+                AcquiringWebhook.status == AcquiringWebhookStatus.PENDING,
+                AcquiringWebhook.run_at <= func.now(),
+                # only the oldest pending delivery of an invoice is eligible,
+                # so the transitions of one payment never run concurrently
+                ~exists().where(
+                    earlier.gateway_type == AcquiringWebhook.gateway_type,
+                    earlier.invoice_id == AcquiringWebhook.invoice_id,
+                    earlier.status == AcquiringWebhookStatus.PENDING,
+                    tuple_(earlier.modified_at, earlier.id)
+                    < tuple_(AcquiringWebhook.modified_at, AcquiringWebhook.id),
+                ),
+                # nor while another one is leased or backing off, a late
+                # delivery then waits to be superseded instead of racing it
+                ~exists().where(
+                    other.gateway_type == AcquiringWebhook.gateway_type,
+                    other.invoice_id == AcquiringWebhook.invoice_id,
+                    other.status == AcquiringWebhookStatus.PENDING,
+                    other.id != AcquiringWebhook.id,
+                    other.run_at > func.now(),
+                ),
+            )
+            .order_by(AcquiringWebhook.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(AcquiringWebhook)
+            .where(AcquiringWebhook.id == next_webhook_id)
+            .values(
+                attempts=AcquiringWebhook.attempts + 1,
+                run_at=func.now() + lease,
+            )
+            .returning(AcquiringWebhook)
+        )
+        return await self.session.scalar(stmt)
+
+    async def is_superseded(self, webhook: AcquiringWebhook) -> bool:
+        stmt = select(
+            exists().where(
+                AcquiringWebhook.gateway_type == webhook.gateway_type,
+                AcquiringWebhook.invoice_id == webhook.invoice_id,
+                AcquiringWebhook.status == AcquiringWebhookStatus.DONE,
+                AcquiringWebhook.modified_at > webhook.modified_at,
+            )
+        )
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def count_pending(self) -> int:
+        stmt = select(func.count()).where(
+            AcquiringWebhook.status == AcquiringWebhookStatus.PENDING
+        )
+        return (await self.session.execute(stmt)).scalar_one()
@@ -1,10 +1,32 @@
-from sqlalchemy import Select, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import json
+from typing import Any, Sequence
+
+from sqlalchemy import ClauseElement, Executable, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
 
 from dash.models.base import Base
+from dash.services.common.pagination import CountMode, CursorPagination, decode_cursor
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt: Select) -> None:
+        self.stmt = stmt
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.stmt, **kw)}"
 
 
 class BaseRepository:
+    # below this estimate an exact count is cheap enough to run anyway
+    EXACT_COUNT_THRESHOLD = 10_000
+    STREAM_BATCH_SIZE = 1000
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -21,3 +43,44 @@ class BaseRepository:
         total_stmt = select(func.count()).select_from(stmt.subquery())
         total = (await self.session.execute(total_stmt)).scalar_one()
         return total
+
+    async def _stream(self, stmt: Select) -> AsyncResult:
+        return await self.session.stream(
+            stmt.execution_options(yield_per=self.STREAM_BATCH_SIZE)
+        )
+
+    async def _get_estimated_count(self, stmt: Select) -> int:
+        plan = (await self.session.execute(Explain(stmt))).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+        if estimate < self.EXACT_COUNT_THRESHOLD:
+            return await self._get_count(stmt)
+
+        return estimate
+
+    async def _get_page(
+        self, stmt: Select, data: CursorPagination, model: Any
+    ) -> tuple[Sequence[Any], int | None]:
+        paginated_stmt = stmt.order_by(model.created_at.desc(), model.id.desc()).limit(
+            data.limit
+        )
+
+        if data.cursor is not None:
+            paginated_stmt = paginated_stmt.where(
+                tuple_(model.created_at, model.id) < tuple_(*decode_cursor(data.cursor))
+            )
+        else:
+            paginated_stmt = paginated_stmt.offset(data.offset)
+
+        paginated = (await self.session.scalars(paginated_stmt)).unique().all()
+
+        if data.count is CountMode.EXACT:
+            total = await self._get_count(stmt)
+        elif data.count is CountMode.ESTIMATED:
+            total = await self._get_estimated_count(stmt)
+        else:
+            total = None
+
+        return paginated, total
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, update
+
+from dash.infrastructure.repositories.base import BaseRepository
+from dash.models.bulk_operation import (
+    BulkOperation,
+    BulkOperationItem,
+    BulkOperationItemStatus,
+    BulkOperationStatus,
+    BulkOperationType,
+)
+
+
+class BulkOperationRepository(BaseRepository):
+    async def get(self, operation_id: UUID) -> BulkOperation | None:
+        return await self.session.get(BulkOperation, operation_id)
+
+    async def get_items(
+        self,
+        operation_id: UUID,
+        status: BulkOperationItemStatus | None = None,
+    ) -> Sequence[BulkOperationItem]:
+        stmt = select(BulkOperationItem).where(
+            BulkOperationItem.operation_id == operation_id
+        )
+        if status is not None:
+            stmt = stmt.where(BulkOperationItem.status == status)
+
+        return (await self.session.scalars(stmt)).all()
+
+    async def claim(self, operation_id: UUID, lease: timedelta) -> bool:
+        stmt = (
+            update(BulkOperation)
+            .where(
+                BulkOperation.id == operation_id,
+                BulkOperation.status == BulkOperationStatus.PENDING,
+            )
+            .values(status=BulkOperationStatus.RUNNING, lease_until=func.now() + lease)
+            .returning(BulkOperation.id)
+        )
+        return await self.session.scalar(stmt) is not None
+
+    async def claim_abandoned(self, lease: timedelta) -> Sequence[UUID]:
+        abandoned = (
+            select(BulkOperation.id)
+            .where(
+                or_(
+                    # created, but the replica died before submitting it
+                    and_(
+                        BulkOperation.status == BulkOperationStatus.PENDING,
+                        BulkOperation.created_at < func.now() - lease,
+                    ),
+                    # a reboot may have reached part of the devices already
+                    and_(
+                        BulkOperation.status == BulkOperationStatus.RUNNING,
+                        BulkOperation.lease_until < func.now(),
+                        BulkOperation.type != BulkOperationType.REBOOT,
+                    ),
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(BulkOperation)
+            .where(BulkOperation.id.in_(abandoned))
+            .values(status=BulkOperationStatus.RUNNING, lease_until=func.now() + lease)
+            .returning(BulkOperation.id)
+        )
+        return (await self.session.scalars(stmt)).all()
+
+    async def fail_interrupted_reboots(self, error: str) -> Sequence[UUID]:
+        interrupted = (
+            select(BulkOperation.id)
+            .where(
+                BulkOperation.status == BulkOperationStatus.RUNNING,
+                BulkOperation.lease_until < func.now(),
+                BulkOperation.type == BulkOperationType.REBOOT,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        operation_ids = (
+            await self.session.scalars(
+                update(BulkOperation)
+                .where(BulkOperation.id.in_(interrupted))
+                .values(status=BulkOperationStatus.COMPLETED, lease_until=None)
+                .returning(BulkOperation.id)
+            )
+        ).all()
+        if operation_ids:
+            await self.session.execute(
+                update(BulkOperationItem)
+                .where(
+                    BulkOperationItem.operation_id.in_(operation_ids),
+                    BulkOperationItem.status == BulkOperationItemStatus.PENDING,
+                )
+                .values(status=BulkOperationItemStatus.FAILED, error=error)
+            )
+        return operation_ids
+
+    async def extend_lease(self, operation_id: UUID, lease: timedelta) -> None:
+        stmt = (
+            update(BulkOperation)
+            .where(
+                BulkOperation.id == operation_id,
+                BulkOperation.status == BulkOperationStatus.RUNNING,
+            )
+            .values(lease_until=func.now() + lease)
+        )
+        await self.session.execute(stmt)
@@ -8,7 +8,7 @@ from dash.infrastructure.repositories.base import BaseRepository
 from dash.models.company import Company
 from dash.models.controllers.car_cleaner import CarCleanerController
 from dash.models.controllers.carwash import CarwashController
-from dash.models.controllers.controller import Controller
+from dash.models.controllers.controller import Controller, ControllerType
 from dash.models.controllers.dummy import DummyController
 from dash.models.controllers.fiscalizer import FiscalizerController
 from dash.models.controllers.laundry import LaundryController
@@ -101,6 +101,26 @@ class ControllerRepository(BaseRepository):
         )
         return await self.session.scalar(stmt)
 
+    async def get_concrete_by_device_id(self, device_id: str) -> Controller | None:
+        loader_opt = selectin_polymorphic(
+            Controller,
+            [
+                WaterVendingController,
+                CarwashController,
+                FiscalizerController,
+                LaundryController,
+                VacuumController,
+                CarCleanerController,
+                DummyController,
+            ],
+        )
+        stmt = (
+            select(Controller)
+            .where(Controller.device_id == device_id)
+            .options(loader_opt)
+        )
+        return await self.session.scalar(stmt)
+
     async def exists_by_qr(self, qr: str) -> bool:
         stmt = select(exists().where(Controller.qr == qr))
         return (await self.session.execute(stmt)).scalar_one()
@@ -201,7 +221,7 @@ class ControllerRepository(BaseRepository):
         self,
         data: ReadControllerListRequest,
         whereclause: ColumnElement[Any] | None = None,
-    ) -> tuple[Sequence[Controller], int]:
+    ) -> tuple[Sequence[Controller], int | None]:
         stmt = select(Controller)
 
         if data.type is not None:
@@ -216,25 +236,16 @@ class ControllerRepository(BaseRepository):
         if whereclause is not None:
             stmt = stmt.where(whereclause)
 
-        paginated_stmt = (
-            stmt.order_by(Controller.created_at.desc())
-            .offset(data.offset)
-            .limit(data.limit)
-        )
-
-        paginated = (await self.session.scalars(paginated_stmt)).unique().all()
-        total = await self._get_count(stmt)
-
-        return paginated, total
+        return await self._get_page(stmt, data, Controller)
 
     async def get_list_all(
         self, data: ReadControllerListRequest
-    ) -> tuple[Sequence[Controller], int]:
+    ) -> tuple[Sequence[Controller], int | None]:
         return await self._get_list(data)
 
     async def get_list_by_owner(
         self, data: ReadControllerListRequest, user_id: UUID
-    ) -> tuple[Sequence[Controller], int]:
+    ) -> tuple[Sequence[Controller], int | None]:
         whereclause = Controller.location_id.in_(
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
@@ -242,11 +253,34 @@ class ControllerRepository(BaseRepository):
 
     async def get_list_by_admin(
         self, data: ReadControllerListRequest, user_id: UUID
-    ) -> tuple[Sequence[Controller], int]:
+    ) -> tuple[Sequence[Controller], int | None]:
         whereclause = Controller.location_id.in_(
             select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
         )
         return await self._get_list(data, whereclause)
 
+    async def get_many(
+        self,
+        controller_ids: Sequence[UUID] | None = None,
+        location_id: UUID | None = None,
+        company_id: UUID | None = None,
+        controller_type: ControllerType | None = None,
+    ) -> Sequence[Controller]:
+        stmt = select(Controller)
+
+        if controller_ids is not None:
+            stmt = stmt.where(Controller.id.in_(controller_ids))
+
+        if location_id is not None:
+            stmt = stmt.where(Controller.location_id == location_id)
+
+        if company_id is not None:
+            stmt = stmt.where(Controller.company_id == company_id)
+
+        if controller_type is not None:
+            stmt = stmt.where(Controller.type == controller_type)
+
+        return (await self.session.scalars(stmt)).unique().all()
+
     async def delete(self, controller: Controller) -> None:
         await self.session.delete(controller)
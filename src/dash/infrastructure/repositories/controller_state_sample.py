@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from dash.infrastructure.repositories.base import BaseRepository
+from dash.models.controller_state_sample import ControllerStateSample
+from dash.models.controllers.controller import Controller
+
+
+class ControllerStateSampleRepository(BaseRepository):
+    # asyncpg caps a statement at 32767 parameters
+    INSERT_CHUNK_SIZE = 5000
+
+    async def add_many(self, samples: Sequence[dict[str, Any]]) -> None:
+        if not samples:
+            return
+
+        # the history of a deleted controller outlives it in Redis
+        existing = set(
+            await self.session.scalars(
+                select(Controller.id).where(
+                    Controller.id.in_({sample["controller_id"] for sample in samples})
+                )
+            )
+        )
+        samples = [sample for sample in samples if sample["controller_id"] in existing]
+
+        for i in range(0, len(samples), self.INSERT_CHUNK_SIZE):
+            await self.session.execute(
+                insert(ControllerStateSample)
+                .values(samples[i : i + self.INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing()
+            )
+
+    async def get_range(
+        self,
+        controller_id: UUID,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        limit: int,
+    ) -> Sequence[ControllerStateSample]:
+        stmt = (
+            select(ControllerStateSample)
+            .where(ControllerStateSample.controller_id == controller_id)
+            .limit(limit)
+        )
+        if date_to is not None:
+            stmt = stmt.where(ControllerStateSample.created_at < date_to)
+        if date_from is not None:
+            stmt = stmt.where(ControllerStateSample.created_at >= date_from)
+            return (
+                await self.session.scalars(
+                    stmt.order_by(ControllerStateSample.created_at)
+                )
+            ).all()
+
+        # without a start the most recent samples are the interesting ones
+        stmt = stmt.order_by(ControllerStateSample.created_at.desc())
+        return (await self.session.scalars(stmt)).all()[::-1]
+
+    async def delete_before(self, before: datetime) -> None:
+        await self.session.execute(
+            delete(ControllerStateSample).where(
+                ControllerStateSample.created_at < before
+            )
+        )
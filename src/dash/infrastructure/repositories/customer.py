@@ -1,7 +1,8 @@
-from typing import Any, Sequence
+from decimal import Decimal
+from typing import Any, Mapping, Sequence
 from uuid import UUID
 
-from sqlalchemy import ColumnElement, exists, select
+from sqlalchemy import ColumnElement, exists, func, select, update
 
 from dash.infrastructure.repositories.base import BaseRepository
 from dash.models import Customer
@@ -61,6 +62,17 @@ class CustomerRepository(BaseRepository):
         result = await self.session.execute(stmt)
         return result.scalar_one()
 
+    async def deduct_balances(self, amounts: Mapping[UUID, Decimal]) -> None:
+        for customer_id, amount in amounts.items():
+            await self.session.execute(
+                update(Customer)
+                .where(Customer.id == customer_id)
+                .values(
+                    balance=Customer.balance - amount,
+                    last_balance_update=func.now(),
+                )
+            )
+
     async def delete(self, customer: Customer) -> None:
         await self.session.delete(customer)
 
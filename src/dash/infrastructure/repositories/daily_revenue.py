@@ -0,0 +1,188 @@
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Date,
+    DateTime,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from dash.infrastructure.repositories.base import BaseRepository
+from dash.models.daily_revenue import DailyControllerRevenue
+from dash.models.payment import Payment, PaymentGatewayType, PaymentStatus, PaymentType
+from dash.models.transactions.transaction import Transaction
+
+# The last RAW_DAYS days (today included) are always read from raw rows,
+# so late payment status updates and the refresh interval never show up on
+# the dashboard.
+RAW_DAYS = 2
+
+
+def sum_as_int(expression: ColumnElement[Any]) -> ColumnElement[int]:
+    return cast(func.coalesce(func.sum(expression), 0), BigInteger)
+
+
+def get_day_start(day: date) -> ColumnElement[datetime]:
+    return cast(literal(day, Date), DateTime(timezone=True))
+
+
+def get_rollup_cutoff() -> ColumnElement[datetime]:
+    today_start = func.date_trunc("day", func.now(), type_=DateTime(timezone=True))
+    return today_start - timedelta(days=RAW_DAYS - 1)
+
+
+def get_rollup_bounds(
+    date_from: datetime, date_to: datetime
+) -> tuple[ColumnElement[datetime], ColumnElement[datetime]]:
+    """Returns [start, end) covering the whole days of the range served by the rollup.
+
+    Partial days at the edges of the range and everything after the cutoff
+    have to be read from raw rows. `end <= start` means the rollup is unused.
+    """
+    start = func.date_trunc(
+        "day",
+        literal(date_from, DateTime(timezone=True)) - timedelta(microseconds=1),
+        type_=DateTime(timezone=True),
+    ) + timedelta(days=1)
+    end = func.least(
+        func.date_trunc(
+            "day",
+            literal(date_to, DateTime(timezone=True)) + timedelta(microseconds=1),
+            type_=DateTime(timezone=True),
+        ),
+        get_rollup_cutoff(),
+    )
+    return start, end
+
+
+class DailyRevenueRepository(BaseRepository):
+    async def get_current_date(self) -> date:
+        return (await self.session.execute(select(func.current_date()))).scalar_one()
+
+    async def refresh_recent(self) -> None:
+        today = await self.get_current_date()
+        await self.refresh(today - timedelta(days=RAW_DAYS), today - timedelta(days=1))
+
+    async def refresh(self, date_from: date, date_to: date) -> None:
+        await self.session.execute(
+            delete(DailyControllerRevenue).where(
+                DailyControllerRevenue.day >= date_from,
+                DailyControllerRevenue.day <= date_to,
+            )
+        )
+        await self._insert_transactions(date_from, date_to)
+        await self._upsert_payments(date_from, date_to)
+
+    async def _insert_transactions(self, date_from: date, date_to: date) -> None:
+        day = cast(Transaction.created_at, Date)
+
+        stmt = (
+            select(
+                day,
+                Transaction.controller_id,
+                Transaction.location_id,
+                func.sum(Transaction.bill_amount),
+                func.sum(Transaction.coin_amount),
+                func.sum(Transaction.qr_amount),
+                func.sum(Transaction.paypass_amount),
+                func.sum(Transaction.card_amount),
+                func.count(),
+            )
+            .where(
+                Transaction.created_at >= get_day_start(date_from),
+                Transaction.created_at < get_day_start(date_to + timedelta(days=1)),
+            )
+            .group_by(day, Transaction.controller_id, Transaction.location_id)
+        )
+
+        await self.session.execute(
+            insert(DailyControllerRevenue).from_select(
+                [
+                    DailyControllerRevenue.day,
+                    DailyControllerRevenue.controller_id,
+                    DailyControllerRevenue.location_id,
+                    DailyControllerRevenue.bill_amount,
+                    DailyControllerRevenue.coin_amount,
+                    DailyControllerRevenue.qr_amount,
+                    DailyControllerRevenue.paypass_amount,
+                    DailyControllerRevenue.card_amount,
+                    DailyControllerRevenue.transactions_count,
+                ],
+                stmt,
+            )
+        )
+
+    async def _upsert_payments(self, date_from: date, date_to: date) -> None:
+        day = cast(Payment.created_at, Date)
+
+        aggregations = [
+            (
+                DailyControllerRevenue.cash_payments_amount,
+                Payment.type == PaymentType.CASH,
+            ),
+            (
+                DailyControllerRevenue.cashless_payments_amount,
+                Payment.type == PaymentType.CASHLESS,
+            ),
+            (
+                DailyControllerRevenue.paypass_payments_amount,
+                Payment.gateway_type == PaymentGatewayType.PAYPASS,
+            ),
+            (
+                DailyControllerRevenue.liqpay_payments_amount,
+                Payment.gateway_type == PaymentGatewayType.LIQPAY,
+            ),
+            (
+                DailyControllerRevenue.monopay_payments_amount,
+                Payment.gateway_type == PaymentGatewayType.MONOPAY,
+            ),
+        ]
+
+        stmt = (
+            select(
+                day,
+                Payment.controller_id,
+                Payment.location_id,
+                func.sum(Payment.amount),
+                *[
+                    func.coalesce(func.sum(Payment.amount).filter(cond), 0)
+                    for _, cond in aggregations
+                ],
+            )
+            .where(
+                Payment.status == PaymentStatus.COMPLETED,
+                Payment.created_at >= get_day_start(date_from),
+                Payment.created_at < get_day_start(date_to + timedelta(days=1)),
+            )
+            .group_by(day, Payment.controller_id, Payment.location_id)
+        )
+
+        insert_stmt = insert(DailyControllerRevenue).from_select(
+            [
+                DailyControllerRevenue.day,
+                DailyControllerRevenue.controller_id,
+                DailyControllerRevenue.location_id,
+                DailyControllerRevenue.payments_amount,
+                *[column for column, _ in aggregations],
+            ],
+            stmt,
+        )
+        await self.session.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uix_daily_controller_revenue",
+                set_={
+                    column.key: insert_stmt.excluded[column.key]
+                    for column in (
+                        DailyControllerRevenue.payments_amount,
+                        *[column for column, _ in aggregations],
+                    )
+                },
+            )
+        )
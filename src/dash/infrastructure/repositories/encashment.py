@@ -19,18 +19,9 @@ class EncashmentRepository(BaseRepository):
 
     async def get_list(
         self, data: ReadEncashmentListRequest
-    ) -> tuple[Sequence[Encashment], int]:
+    ) -> tuple[Sequence[Encashment], int | None]:
         stmt = select(Encashment).where(Encashment.controller_id == data.controller_id)
-
-        paginated_stmt = (
-            stmt.order_by(Encashment.created_at.desc())
-            .offset(data.offset)
-            .limit(data.limit)
-        )
-        paginated = (await self.session.scalars(paginated_stmt)).unique().all()
-        total = await self._get_count(stmt)
-
-        return paginated, total
+        return await self._get_page(stmt, data, Encashment)
 
     async def insert_with_conflict_ignore(self, model: Encashment) -> bool:
         insert_tx = (
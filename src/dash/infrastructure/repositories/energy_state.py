@@ -1,14 +1,35 @@
-from datetime import UTC, date, datetime, timedelta
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import exists, func, select
+from sqlalchemy import ColumnElement, exists, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 
 from dash.infrastructure.repositories.base import BaseRepository
-from dash.models.energy_state import DailyEnergyState
-from dash.services.controller.dto import GetEnergyStatsRequest, GetEnergyStatsResponse
+from dash.models.controllers.controller import Controller
+from dash.models.energy_state import DailyEnergyState, EnergySample
+from dash.services.controller.dto import (
+    EnergyInterval,
+    EnergySampleScheme,
+    EnergyStatsPoint,
+    GetEnergyStatsRequest,
+    GetEnergyStatsResponse,
+    ReadEnergySamplesRequest,
+    ReadEnergySamplesResponse,
+)
+
+
+def _truncate(interval: EnergyInterval) -> ColumnElement[datetime]:
+    # inlined, a bound unit would differ between SELECT and GROUP BY
+    return func.date_trunc(
+        literal_column(f"'{interval.value}'"), EnergySample.bucket
+    ).label("time")
 
 
 class EnergyStateRepository(BaseRepository):
+    # asyncpg caps a statement at 32767 parameters
+    INSERT_CHUNK_SIZE = 4000
+
     async def exists_by_date(self, date_: date, controller_id: UUID) -> bool:
         stmt = select(
             exists(DailyEnergyState).where(
@@ -28,4 +49,124 @@ class EnergyStateRepository(BaseRepository):
             DailyEnergyState.date <= now.date(),
         )
         result = await self.session.execute(stmt)
-        return GetEnergyStatsResponse(total_energy=result.scalar_one())
+
+        breakdown = None
+        if data.breakdown is EnergyInterval.DAY:
+            breakdown = await self._get_daily_breakdown(data, now)
+        elif data.breakdown is not None:
+            breakdown = await self._get_sampled_breakdown(data, now)
+
+        return GetEnergyStatsResponse(
+            total_energy=result.scalar_one() or 0, breakdown=breakdown
+        )
+
+    async def _get_daily_breakdown(
+        self, data: GetEnergyStatsRequest, now: datetime
+    ) -> list[EnergyStatsPoint]:
+        stmt = (
+            select(DailyEnergyState.date, func.sum(DailyEnergyState.energy))
+            .where(
+                DailyEnergyState.controller_id == data.controller_id,
+                DailyEnergyState.date >= (now - timedelta(days=data.period)).date(),
+                DailyEnergyState.date <= now.date(),
+            )
+            .group_by(DailyEnergyState.date)
+            .order_by(DailyEnergyState.date)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            EnergyStatsPoint(time=datetime.combine(date_, time(), UTC), energy=energy)
+            for date_, energy in result.all()
+        ]
+
+    async def _get_sampled_breakdown(
+        self, data: GetEnergyStatsRequest, now: datetime
+    ) -> list[EnergyStatsPoint]:
+        bucket = _truncate(data.breakdown)  # type: ignore
+        # every sample covers a minute at its average power, W·min to kWh
+        energy = func.sum(EnergySample.power_sum / EnergySample.samples) / 60 / 1000
+
+        stmt = (
+            select(bucket, energy)
+            .where(
+                EnergySample.controller_id == data.controller_id,
+                EnergySample.bucket >= now - timedelta(days=data.period),
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            EnergyStatsPoint(time=time_, energy=energy)
+            for time_, energy in result.all()
+        ]
+
+    async def upsert_samples(self, samples: Sequence[dict[str, Any]]) -> None:
+        if not samples:
+            return
+
+        # readings of a just deleted controller may still be buffered
+        existing = set(
+            await self.session.scalars(
+                select(Controller.id).where(
+                    Controller.id.in_({sample["controller_id"] for sample in samples})
+                )
+            )
+        )
+        samples = [sample for sample in samples if sample["controller_id"] in existing]
+
+        for i in range(0, len(samples), self.INSERT_CHUNK_SIZE):
+            stmt = insert(EnergySample).values(samples[i : i + self.INSERT_CHUNK_SIZE])
+            # another replica or a restart may have written part of the minute
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EnergySample.controller_id, EnergySample.bucket],
+                set_={
+                    "samples": EnergySample.samples + stmt.excluded.samples,
+                    "power_sum": EnergySample.power_sum + stmt.excluded.power_sum,
+                    "power_max": func.greatest(
+                        EnergySample.power_max, stmt.excluded.power_max
+                    ),
+                    "voltage_sum": EnergySample.voltage_sum + stmt.excluded.voltage_sum,
+                    "current_sum": EnergySample.current_sum + stmt.excluded.current_sum,
+                    "energy_total": func.greatest(
+                        EnergySample.energy_total, stmt.excluded.energy_total
+                    ),
+                },
+            )
+            await self.session.execute(stmt)
+
+    async def get_samples(
+        self, data: ReadEnergySamplesRequest
+    ) -> ReadEnergySamplesResponse:
+        bucket = _truncate(data.interval)
+        samples = func.sum(EnergySample.samples)
+
+        stmt = (
+            select(
+                bucket,
+                func.sum(EnergySample.power_sum) / samples,
+                func.max(EnergySample.power_max),
+                func.sum(EnergySample.voltage_sum) / samples,
+                func.sum(EnergySample.current_sum) / samples,
+            )
+            .where(
+                EnergySample.controller_id == data.controller_id,
+                EnergySample.bucket >= data.date_from,
+                EnergySample.bucket < data.date_to,
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        result = await self.session.execute(stmt)
+        return ReadEnergySamplesResponse(
+            samples=[
+                EnergySampleScheme(
+                    time=time_,
+                    power_avg=power_avg,
+                    power_max=power_max,
+                    voltage_avg=voltage_avg,
+                    current_avg=current_avg,
+                )
+                for time_, power_avg, power_max, voltage_avg, current_avg in result
+            ]
+        )
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+
+from dash.infrastructure.repositories.base import BaseRepository
+from dash.models.fiscalization_job import FiscalizationJob, FiscalizationJobStatus
+from dash.models.payment import Payment
+
+
+class FiscalizationJobRepository(BaseRepository):
+    def enqueue(self, payment: Payment) -> None:
+        self.add(FiscalizationJob(payment=payment))
+
+    async def claim(self, lease: timedelta) -> FiscalizationJob | None:
+        next_job_id = (
+            select(FiscalizationJob.id)
+            .where(
+                FiscalizationJob.status == FiscalizationJobStatus.PENDING,
+                FiscalizationJob.run_at <= func.now(),
+            )
+            .order_by(FiscalizationJob.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        # pushing run_at forward leases the job; it is picked up again
+        # if the worker dies before recording the outcome
+        stmt = (
+            update(FiscalizationJob)
+            .where(FiscalizationJob.id == next_job_id)
+            .values(
+                attempts=FiscalizationJob.attempts + 1,
+                run_at=func.now() + lease,
+            )
+            .returning(FiscalizationJob)
+        )
+        return await self.session.scalar(stmt)
+
+    async def count_pending(self) -> int:
+        stmt = select(func.count()).where(
+            FiscalizationJob.status == FiscalizationJobStatus.PENDING
+        )
+        return (await self.session.execute(stmt)).scalar_one()
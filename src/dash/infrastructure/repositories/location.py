@@ -1,4 +1,4 @@
-from typing import Any, Sequence
+from typing import Any, Collection, Sequence
 from uuid import UUID
 
 from sqlalchemy import ColumnElement, exists, select
@@ -64,5 +64,11 @@ class LocationRepository(BaseRepository):
         )
         return await self._get_list(data, whereclause)
 
+    async def get_company_ids(self, location_ids: Collection[UUID]) -> dict[UUID, UUID]:
+        stmt = select(Location.id, Location.company_id).where(
+            Location.id.in_(location_ids)
+        )
+        return dict((await self.session.execute(stmt)).tuples().all())
+
     async def delete(self, location: Location) -> None:
         await self.session.delete(location)
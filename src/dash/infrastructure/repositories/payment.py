@@ -1,12 +1,17 @@
-from datetime import UTC, datetime
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import ColumnElement, Date, cast, func, select
+from sqlalchemy import ColumnElement, Date, Select, cast, func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncResult
 
 from dash.infrastructure.repositories.base import BaseRepository
+from dash.infrastructure.repositories.daily_revenue import (
+    get_rollup_bounds,
+    sum_as_int,
+)
 from dash.models.company import Company
 from dash.models.controllers.controller import Controller
+from dash.models.daily_revenue import DailyControllerRevenue
 from dash.models.location import Location
 from dash.models.location_admin import LocationAdmin
 from dash.models.payment import Payment, PaymentGatewayType, PaymentStatus, PaymentType
@@ -18,6 +23,7 @@ from dash.services.dashboard.dto import (
     PaymentStatsDTO,
 )
 from dash.services.payment.dto import (
+    ExportPaymentListRequest,
     ReadPaymentListRequest,
     ReadPublicPaymentListRequest,
 )
@@ -35,9 +41,16 @@ class PaymentRepository(BaseRepository):
         self,
         data: ReadPaymentListRequest,
         whereclause: ColumnElement[Any] | None = None,
-    ) -> tuple[Sequence[Payment], int]:
-        stmt = select(Payment)
+    ) -> tuple[Sequence[Payment], int | None]:
+        stmt = self._filter_list(select(Payment), data, whereclause)
+        return await self._get_page(stmt, data, Payment)
 
+    def _filter_list(
+        self,
+        stmt: Select,
+        data: ReadPaymentListRequest | ExportPaymentListRequest,
+        whereclause: ColumnElement[Any] | None = None,
+    ) -> Select:
         if data.date_from:
             stmt = stmt.where(Payment.created_at >= data.date_from)
 
@@ -45,7 +58,11 @@ class PaymentRepository(BaseRepository):
             stmt = stmt.where(Payment.created_at <= data.date_to)
 
         if data.company_id is not None:
-            stmt = stmt.join(Location).where(Location.company_id == data.company_id)
+            stmt = stmt.where(
+                Payment.location_id.in_(
+                    select(Location.id).where(Location.company_id == data.company_id)
+                )
+            )
 
         if data.controller_id is not None:
             stmt = stmt.where(Payment.controller_id == data.controller_id)
@@ -64,25 +81,16 @@ class PaymentRepository(BaseRepository):
         if whereclause is not None:
             stmt = stmt.where(whereclause)
 
-        paginated_stmt = (
-            stmt.order_by(Payment.created_at.desc())
-            .offset(data.offset)
-            .limit(data.limit)
-        )
-
-        paginated = (await self.session.scalars(paginated_stmt)).unique().all()
-        total = await self._get_count(stmt)
-
-        return paginated, total
+        return stmt
 
     async def get_list_all(
         self, data: ReadPaymentListRequest
-    ) -> tuple[Sequence[Payment], int]:
+    ) -> tuple[Sequence[Payment], int | None]:
         return await self._get_list(data)
 
     async def get_list_by_owner(
         self, data: ReadPaymentListRequest, user_id: UUID
-    ) -> tuple[Sequence[Payment], int]:
+    ) -> tuple[Sequence[Payment], int | None]:
         whereclause = Payment.location_id.in_(
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
@@ -90,12 +98,58 @@ class PaymentRepository(BaseRepository):
 
     async def get_list_by_admin(
         self, data: ReadPaymentListRequest, user_id: UUID
-    ) -> tuple[Sequence[Payment], int]:
+    ) -> tuple[Sequence[Payment], int | None]:
         whereclause = Payment.location_id.in_(
             select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
         )
         return await self._get_list(data, whereclause)
 
+    async def _stream_export(
+        self,
+        data: ExportPaymentListRequest,
+        whereclause: ColumnElement[Any] | None = None,
+    ) -> AsyncResult:
+        stmt = (
+            select(
+                Payment.id,
+                Payment.created_at,
+                Payment.invoice_id,
+                Controller.name.label("controller_name"),
+                Location.name.label("location_name"),
+                Payment.amount,
+                Payment.status,
+                Payment.type,
+                Payment.gateway_type,
+                Payment.masked_pan,
+                Payment.transaction_id,
+                Payment.receipt_id,
+                Payment.failure_reason,
+            )
+            .outerjoin(Controller, Controller.id == Payment.controller_id)
+            .outerjoin(Location, Location.id == Payment.location_id)
+            .order_by(Payment.created_at, Payment.id)
+        )
+        return await self._stream(self._filter_list(stmt, data, whereclause))
+
+    async def stream_export_all(self, data: ExportPaymentListRequest) -> AsyncResult:
+        return await self._stream_export(data)
+
+    async def stream_export_by_owner(
+        self, data: ExportPaymentListRequest, user_id: UUID
+    ) -> AsyncResult:
+        whereclause = Payment.location_id.in_(
+            select(Location.id).join(Company).where(Company.owner_id == user_id)
+        )
+        return await self._stream_export(data, whereclause)
+
+    async def stream_export_by_admin(
+        self, data: ExportPaymentListRequest, user_id: UUID
+    ) -> AsyncResult:
+        whereclause = Payment.location_id.in_(
+            select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
+        )
+        return await self._stream_export(data, whereclause)
+
     async def get_list_public(
         self, data: ReadPublicPaymentListRequest, limit: int
     ) -> Sequence[Payment]:
@@ -114,10 +168,10 @@ class PaymentRepository(BaseRepository):
     async def _get_stats(
         self,
         data: ReadPaymentStatsRequest,
-        whereclause: ColumnElement[Any] | None = None,
+        location_ids: Select[tuple[UUID]] | None = None,
     ) -> list[PaymentStatsDTO]:
-        date_expression = cast(Payment.created_at, Date).label("date")
-        total_expression = func.coalesce(func.sum(Payment.amount), 0).label("total")
+        rollup_start, rollup_end = get_rollup_bounds(data.date_from, data.date_to)
+        date_expression = cast(Payment.created_at, Date)
 
         aggregations = [
             ("cash", Payment.type == PaymentType.CASH),
@@ -127,39 +181,78 @@ class PaymentRepository(BaseRepository):
             ("monopay", Payment.gateway_type == PaymentGatewayType.MONOPAY),
         ]
 
-        select_expressions = [
-            date_expression,
-            total_expression,
-            *[
-                func.coalesce(func.sum(Payment.amount).filter(cond), 0).label(label)
-                for label, cond in aggregations
-            ],
-        ]
-
-        stmt = (
-            select(*select_expressions)
+        raw_stmt = (
+            select(
+                date_expression.label("date"),
+                func.sum(Payment.amount).label("total"),
+                *[
+                    func.sum(Payment.amount).filter(cond).label(label)
+                    for label, cond in aggregations
+                ],
+            )
             .where(
                 Payment.created_at >= data.date_from,
                 Payment.created_at <= data.date_to,
+                or_(
+                    Payment.created_at < rollup_start,
+                    Payment.created_at >= rollup_end,
+                ),
                 Payment.status == PaymentStatus.COMPLETED,
             )
             .group_by(date_expression)
-            .order_by(date_expression)
         )
 
-        if data.company_id:
-            stmt = stmt.join(Controller).where(Controller.company_id == data.company_id)
-
-        elif data.location_id:
-            stmt = stmt.join(Controller).where(
-                Controller.location_id == data.location_id
+        rollup_stmt = (
+            select(
+                DailyControllerRevenue.day.label("date"),
+                func.sum(DailyControllerRevenue.payments_amount).label("total"),
+                *[
+                    func.sum(
+                        getattr(DailyControllerRevenue, f"{label}_payments_amount")
+                    ).label(label)
+                    for label, _ in aggregations
+                ],
             )
+            .where(
+                DailyControllerRevenue.day >= cast(rollup_start, Date),
+                DailyControllerRevenue.day < cast(rollup_end, Date),
+            )
+            .group_by(DailyControllerRevenue.day)
+        )
 
-        elif data.controller_id:
-            stmt = stmt.where(Payment.controller_id == data.controller_id)
-
-        elif whereclause is not None:
-            stmt = stmt.where(whereclause)
+        def apply_filters(
+            stmt: Select, model: type[Payment] | type[DailyControllerRevenue]
+        ) -> Select:
+            if data.company_id:
+                return stmt.join(
+                    Controller, Controller.id == model.controller_id
+                ).where(Controller.company_id == data.company_id)
+            if data.location_id:
+                return stmt.join(
+                    Controller, Controller.id == model.controller_id
+                ).where(Controller.location_id == data.location_id)
+            if data.controller_id:
+                return stmt.where(model.controller_id == data.controller_id)
+            if location_ids is not None:
+                return stmt.where(model.location_id.in_(location_ids))
+            return stmt
+
+        combined = union_all(
+            apply_filters(raw_stmt, Payment),
+            apply_filters(rollup_stmt, DailyControllerRevenue),
+        ).subquery()
+        stmt = (
+            select(
+                combined.c.date,
+                sum_as_int(combined.c.total).label("total"),
+                *[
+                    sum_as_int(combined.c[label]).label(label)
+                    for label, _ in aggregations
+                ],
+            )
+            .group_by(combined.c.date)
+            .order_by(combined.c.date)
+        )
 
         result = await self.session.execute(stmt)
         rows = result.mappings().fetchall()
@@ -174,62 +267,51 @@ class PaymentRepository(BaseRepository):
     async def get_stats_by_owner(
         self, data: ReadPaymentStatsRequest, user_id: UUID
     ) -> list[PaymentStatsDTO]:
-        whereclause = Payment.location_id.in_(
+        location_ids = (
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
-        return await self._get_stats(data, whereclause)
+        return await self._get_stats(data, location_ids)
 
     async def get_stats_by_admin(
         self, data: ReadPaymentStatsRequest, user_id: UUID
     ) -> list[PaymentStatsDTO]:
-        whereclause = Payment.location_id.in_(
-            select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
+        location_ids = select(LocationAdmin.location_id).where(
+            LocationAdmin.user_id == user_id
         )
-        return await self._get_stats(data, whereclause)
+        return await self._get_stats(data, location_ids)
 
     async def _get_cashless_percentage(
         self,
         data: GetPaymentAnalyticsRequest,
         whereclause: ColumnElement[Any] | None = None,
     ) -> float:
-        now = datetime.now(UTC)
-
-        total_stmt = select(func.count(Payment.id).label("total")).where(
+        stmt = select(
+            func.count(Payment.id).label("total"),
+            func.count(Payment.id)
+            .filter(Payment.type == PaymentType.CASHLESS)
+            .label("cashless"),
+        ).where(
             Payment.type.in_((PaymentType.CASH, PaymentType.CASHLESS)),
             Payment.status == PaymentStatus.COMPLETED,
             Payment.created_at >= data.date_from,
             Payment.created_at <= data.date_to,
         )
 
-        cashless_stmt = select(func.count(Payment.id).label("cashless")).where(
-            Payment.type == PaymentType.CASHLESS,
-            Payment.status == PaymentStatus.COMPLETED,
-            Payment.created_at >= data.date_from,
-            Payment.created_at <= data.date_to,
-        )
-
-        for stmt in [total_stmt, cashless_stmt]:
-            if data.company_id:
-                stmt = stmt.join(Controller).where(
-                    Controller.company_id == data.company_id
-                )
-            elif data.location_id:
-                stmt = stmt.where(Payment.location_id == data.location_id)
-            elif data.controller_id:
-                stmt = stmt.where(Payment.controller_id == data.controller_id)
-            elif whereclause is not None:
-                stmt = stmt.where(whereclause)
-
-        total_result = await self.session.execute(total_stmt)
-        cashless_result = await self.session.execute(cashless_stmt)
+        if data.company_id:
+            stmt = stmt.join(Controller).where(Controller.company_id == data.company_id)
+        elif data.location_id:
+            stmt = stmt.where(Payment.location_id == data.location_id)
+        elif data.controller_id:
+            stmt = stmt.where(Payment.controller_id == data.controller_id)
+        elif whereclause is not None:
+            stmt = stmt.where(whereclause)
 
-        total_payments = total_result.scalar() or 0
-        cashless_payments = cashless_result.scalar() or 0
+        result = (await self.session.execute(stmt)).one()
 
-        if total_payments == 0:
+        if result.total == 0:
             return 0.0
 
-        return round(((cashless_payments / total_payments) * 100), 2)
+        return round(((result.cashless / result.total) * 100), 2)
 
     async def get_cashless_percentage_all(
         self, data: GetPaymentAnalyticsRequest
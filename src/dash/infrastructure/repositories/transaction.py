@@ -1,16 +1,39 @@
-from datetime import UTC, datetime
+from collections import defaultdict
+from datetime import UTC, date, datetime
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import ColumnElement, Date, cast, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Date,
+    Select,
+    cast,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+)
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncResult
 from sqlalchemy.orm import selectin_polymorphic
+from uuid_utils.compat import uuid7
 
 from dash.infrastructure.repositories.base import BaseRepository
-from dash.infrastructure.repositories.utils import parse_model_fields
+from dash.infrastructure.repositories.daily_revenue import (
+    get_rollup_bounds,
+    get_rollup_cutoff,
+    sum_as_int,
+)
+from dash.infrastructure.repositories.utils import (
+    parse_model_fields,
+    parse_model_rows,
+)
 from dash.models import CarwashTransaction, VacuumTransaction
 from dash.models.company import Company
 from dash.models.controllers.controller import Controller
+from dash.models.daily_revenue import DailyControllerRevenue
 from dash.models.location import Location
 from dash.models.location_admin import LocationAdmin
 from dash.models.transactions.car_cleaner import CarCleanerTransaction
@@ -26,9 +49,28 @@ from dash.services.dashboard.dto import (
     TodayClientsDTO,
 )
 from dash.services.transaction.dto import (
+    ExportTransactionListRequest,
     ReadTransactionListRequest,
 )
 
+REVENUE_CHANNELS = ("bill", "coin", "qr", "paypass", "card")
+
+
+def get_total_amount(
+    model: type[Transaction] | type[DailyControllerRevenue],
+) -> ColumnElement[int]:
+    return (
+        model.bill_amount
+        + model.coin_amount
+        + model.qr_amount
+        + model.paypass_amount
+        + model.card_amount
+    )
+
+
+def get_utc_day_start() -> datetime:
+    return datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
 
 class TransactionRepository(BaseRepository):
     async def insert_with_conflict_ignore(self, model: Transaction) -> bool:
@@ -57,12 +99,45 @@ class TransactionRepository(BaseRepository):
         )
         return True
 
+    async def insert_many_with_conflict_ignore(
+        self, models: Sequence[Transaction]
+    ) -> set[UUID]:
+        for model in models:
+            if model.id is None:
+                model.id = uuid7()
+
+        insert_tx = (
+            insert(Transaction)
+            .values(parse_model_rows(models, Transaction))
+            .on_conflict_do_nothing(
+                constraint="uix_transaction_controller_transaction_id"
+            )
+            .returning(Transaction.id)
+        )
+        result = await self.session.execute(insert_tx)
+        inserted_ids = set(result.scalars().all())
+
+        inserted_by_type: dict[type[Transaction], list[Transaction]] = defaultdict(list)
+        for model in models:
+            if model.id in inserted_ids:
+                inserted_by_type[type(model)].append(model)
+
+        for model_type, typed_models in inserted_by_type.items():
+            rows = parse_model_rows(typed_models, model_type)
+            for model, row in zip(typed_models, rows):
+                row["transaction_id"] = model.id
+
+            await self.session.execute(insert(model_type).values(rows))
+
+        return inserted_ids
+
     async def _get_list(
         self,
         data: ReadTransactionListRequest,
         whereclause: ColumnElement[Any] | None = None,
     ) -> tuple[
-        Sequence[WsmTransaction | CarwashTransaction | FiscalizerTransaction], int
+        Sequence[WsmTransaction | CarwashTransaction | FiscalizerTransaction],
+        int | None,
     ]:
         loader_opt = selectin_polymorphic(
             Transaction,
@@ -76,8 +151,17 @@ class TransactionRepository(BaseRepository):
             ],
         )
 
-        stmt = select(Transaction).options(loader_opt)
+        stmt = self._filter_list(
+            select(Transaction).options(loader_opt), data, whereclause
+        )
+        return await self._get_page(stmt, data, Transaction)  # type: ignore
 
+    def _filter_list(
+        self,
+        stmt: Select,
+        data: ReadTransactionListRequest | ExportTransactionListRequest,
+        whereclause: ColumnElement[Any] | None = None,
+    ) -> Select:
         if data.date_from:
             stmt = stmt.where(Transaction.created_at >= data.date_from)
 
@@ -85,7 +169,11 @@ class TransactionRepository(BaseRepository):
             stmt = stmt.where(Transaction.created_at <= data.date_to)
 
         if data.company_id is not None:
-            stmt = stmt.join(Location).where(Location.company_id == data.company_id)
+            stmt = stmt.where(
+                Transaction.location_id.in_(
+                    select(Location.id).where(Location.company_id == data.company_id)
+                )
+            )
 
         elif data.controller_id is not None:
             stmt = stmt.where(Transaction.controller_id == data.controller_id)
@@ -93,29 +181,19 @@ class TransactionRepository(BaseRepository):
         elif data.location_id is not None:
             stmt = stmt.where(Transaction.location_id == data.location_id)
 
-        elif whereclause is not None:
+        if whereclause is not None:
             stmt = stmt.where(whereclause)
 
-        paginated_stmt = (
-            stmt.order_by(Transaction.created_at.desc())
-            .offset(data.offset)
-            .limit(data.limit)
-            .order_by(Transaction.created_at.desc())
-        )
-
-        paginated = (await self.session.scalars(paginated_stmt)).unique().all()
-        total = await self._get_count(stmt)
-
-        return paginated, total  # type: ignore
+        return stmt
 
     async def get_list_all(
         self, data: ReadTransactionListRequest
-    ) -> tuple[Sequence[Transaction], int]:
+    ) -> tuple[Sequence[Transaction], int | None]:
         return await self._get_list(data)
 
     async def get_list_by_owner(
         self, data: ReadTransactionListRequest, user_id: UUID
-    ) -> tuple[Sequence[Transaction], int]:
+    ) -> tuple[Sequence[Transaction], int | None]:
         whereclause = Transaction.location_id.in_(
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
@@ -123,57 +201,139 @@ class TransactionRepository(BaseRepository):
 
     async def get_list_by_admin(
         self, data: ReadTransactionListRequest, user_id: UUID
-    ) -> tuple[Sequence[Transaction], int]:
+    ) -> tuple[Sequence[Transaction], int | None]:
         whereclause = Transaction.location_id.in_(
             select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
         )
         return await self._get_list(data, whereclause)
 
+    async def _stream_export(
+        self,
+        data: ExportTransactionListRequest,
+        whereclause: ColumnElement[Any] | None = None,
+    ) -> AsyncResult:
+        stmt = (
+            select(
+                Transaction.id,
+                Transaction.created_at,
+                Transaction.type,
+                Controller.name.label("controller_name"),
+                Location.name.label("location_name"),
+                Transaction.controller_transaction_id,
+                Transaction.coin_amount,
+                Transaction.bill_amount,
+                Transaction.prev_amount,
+                Transaction.free_amount,
+                Transaction.qr_amount,
+                Transaction.paypass_amount,
+                Transaction.card_amount,
+                Transaction.sale_type,
+                Transaction.card_uid,
+            )
+            .outerjoin(Controller, Controller.id == Transaction.controller_id)
+            .outerjoin(Location, Location.id == Transaction.location_id)
+            .order_by(Transaction.created_at, Transaction.id)
+        )
+        return await self._stream(self._filter_list(stmt, data, whereclause))
+
+    async def stream_export_all(
+        self, data: ExportTransactionListRequest
+    ) -> AsyncResult:
+        return await self._stream_export(data)
+
+    async def stream_export_by_owner(
+        self, data: ExportTransactionListRequest, user_id: UUID
+    ) -> AsyncResult:
+        whereclause = Transaction.location_id.in_(
+            select(Location.id).join(Company).where(Company.owner_id == user_id)
+        )
+        return await self._stream_export(data, whereclause)
+
+    async def stream_export_by_admin(
+        self, data: ExportTransactionListRequest, user_id: UUID
+    ) -> AsyncResult:
+        whereclause = Transaction.location_id.in_(
+            select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
+        )
+        return await self._stream_export(data, whereclause)
+
     async def _get_stats(
         self,
         data: ReadTransactionStatsRequest,
-        whereclause: ColumnElement[Any] | None = None,
+        location_ids: Select[tuple[UUID]] | None = None,
     ) -> list[TransactionStatsDTO]:
-        date_expression = cast(Transaction.created_at, Date).label("date")
+        rollup_start, rollup_end = get_rollup_bounds(data.date_from, data.date_to)
+
+        def build_stmt(
+            model: type[Transaction] | type[DailyControllerRevenue],
+            date_expression: ColumnElement[date],
+            *whereclause: ColumnElement[bool],
+        ) -> Select:
+            stmt = (
+                select(
+                    date_expression.label("date"),
+                    *[
+                        func.sum(getattr(model, f"{channel}_amount")).label(channel)
+                        for channel in REVENUE_CHANNELS
+                    ],
+                )
+                .where(*whereclause)
+                .group_by(date_expression)
+            )
+
+            if data.company_id:
+                stmt = stmt.join(
+                    Controller, Controller.id == model.controller_id
+                ).where(Controller.company_id == data.company_id)
 
-        now = datetime.now(UTC)
+            if data.location_id:
+                stmt = stmt.where(model.location_id == data.location_id)
 
+            if data.controller_id:
+                stmt = stmt.where(model.controller_id == data.controller_id)
+
+            if location_ids is not None:
+                stmt = stmt.where(model.location_id.in_(location_ids))
+
+            return stmt
+
+        raw_stmt = build_stmt(
+            Transaction,
+            cast(Transaction.created_at, Date),
+            Transaction.created_at >= data.date_from,
+            Transaction.created_at <= data.date_to,
+            or_(
+                Transaction.created_at < rollup_start,
+                Transaction.created_at >= rollup_end,
+            ),
+        )
+        rollup_stmt = build_stmt(
+            DailyControllerRevenue,
+            DailyControllerRevenue.day,
+            DailyControllerRevenue.day >= cast(rollup_start, Date),
+            DailyControllerRevenue.day < cast(rollup_end, Date),
+        )
+
+        combined = union_all(raw_stmt, rollup_stmt).subquery()
         stmt = (
             select(
-                date_expression,
-                func.sum(
-                    Transaction.bill_amount
-                    + Transaction.coin_amount
-                    + Transaction.qr_amount
-                    + Transaction.paypass_amount
-                    + Transaction.card_amount
+                combined.c.date,
+                sum_as_int(
+                    combined.c.bill
+                    + combined.c.coin
+                    + combined.c.qr
+                    + combined.c.paypass
+                    + combined.c.card
                 ).label("total"),
-                func.sum(Transaction.bill_amount).label("bill"),
-                func.sum(Transaction.coin_amount).label("coin"),
-                func.sum(Transaction.qr_amount).label("qr"),
-                func.sum(Transaction.paypass_amount).label("paypass"),
-                func.sum(Transaction.card_amount).label("card"),
+                *[
+                    sum_as_int(combined.c[channel]).label(channel)
+                    for channel in REVENUE_CHANNELS
+                ],
             )
-            .where(
-                Transaction.created_at >= data.date_from,
-                Transaction.created_at <= data.date_to,
-            )
-            .group_by(date_expression)
-            .order_by(date_expression)
+            .group_by(combined.c.date)
+            .order_by(combined.c.date)
         )
 
-        if data.company_id:
-            stmt = stmt.join(Controller).where(Controller.company_id == data.company_id)
-
-        if data.location_id:
-            stmt = stmt.where(Transaction.location_id == data.location_id)
-
-        if data.controller_id:
-            stmt = stmt.where(Transaction.controller_id == data.controller_id)
-
-        if whereclause is not None:
-            stmt = stmt.where(whereclause)
-
         result = await self.session.execute(stmt)
         rows = result.mappings().fetchall()
 
@@ -187,85 +347,69 @@ class TransactionRepository(BaseRepository):
     async def get_stats_by_owner(
         self, data: ReadTransactionStatsRequest, user_id: UUID
     ) -> list[TransactionStatsDTO]:
-        whereclause = Transaction.location_id.in_(
+        location_ids = (
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
-        return await self._get_stats(data, whereclause)
+        return await self._get_stats(data, location_ids)
 
     async def get_stats_by_admin(
         self, data: ReadTransactionStatsRequest, user_id: UUID
     ) -> list[TransactionStatsDTO]:
-        whereclause = Transaction.location_id.in_(
-            select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
+        location_ids = select(LocationAdmin.location_id).where(
+            LocationAdmin.user_id == user_id
         )
-        return await self._get_stats(data, whereclause)
+        return await self._get_stats(data, location_ids)
 
     async def _get_revenue(
         self,
         data: GetRevenueRequest,
-        whereclause: ColumnElement[Any] | None = None,
+        location_ids: Select[tuple[UUID]] | None = None,
     ) -> RevenueDTO:
-        now = datetime.now(UTC)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        total_revenue_query = select(
-            func.coalesce(
-                func.sum(
-                    Transaction.bill_amount
-                    + Transaction.coin_amount
-                    + Transaction.qr_amount
-                    + Transaction.paypass_amount
-                    + Transaction.card_amount
-                ),
-                0,
-            ).label("total_revenue")
+        today_start = data.today_start or get_utc_day_start()
+        rollup_cutoff = get_rollup_cutoff()
+
+        raw_amount = get_total_amount(Transaction)
+        raw_stmt = select(
+            func.sum(raw_amount).label("total"),
+            func.sum(raw_amount)
+            .filter(Transaction.created_at >= today_start)
+            .label("today"),
+        ).where(Transaction.created_at >= rollup_cutoff)
+        if data.exclude_today:
+            raw_stmt = raw_stmt.where(Transaction.created_at < today_start)
+
+        rollup_amount = get_total_amount(DailyControllerRevenue)
+        rollup_stmt = select(
+            func.sum(rollup_amount).label("total"),
+            literal(0).label("today"),
+        ).where(DailyControllerRevenue.day < cast(rollup_cutoff, Date))
+
+        def apply_filters(
+            stmt: Select, model: type[Transaction] | type[DailyControllerRevenue]
+        ) -> Select:
+            if data.company_id:
+                return stmt.join(
+                    Controller, Controller.id == model.controller_id
+                ).where(Controller.company_id == data.company_id)
+            if data.location_id:
+                return stmt.where(model.location_id == data.location_id)
+            if data.controller_id:
+                return stmt.where(model.controller_id == data.controller_id)
+            if location_ids is not None:
+                return stmt.where(model.location_id.in_(location_ids))
+            return stmt
+
+        combined = union_all(
+            apply_filters(raw_stmt, Transaction),
+            apply_filters(rollup_stmt, DailyControllerRevenue),
+        ).subquery()
+        stmt = select(
+            sum_as_int(combined.c.total).label("total"),
+            sum_as_int(combined.c.today).label("today"),
         )
 
-        today_revenue_query = select(
-            func.coalesce(
-                func.sum(
-                    Transaction.bill_amount
-                    + Transaction.coin_amount
-                    + Transaction.qr_amount
-                    + Transaction.paypass_amount
-                    + Transaction.card_amount
-                ),
-                0,
-            ).label("today_revenue")
-        ).where(Transaction.created_at >= today_start)
-
-        if data.company_id:
-            total_revenue_query = total_revenue_query.join(Controller).where(
-                Controller.company_id == data.company_id
-            )
-            today_revenue_query = today_revenue_query.join(Controller).where(
-                Controller.company_id == data.company_id
-            )
-        elif data.location_id:
-            total_revenue_query = total_revenue_query.where(
-                Transaction.location_id == data.location_id
-            )
-            today_revenue_query = today_revenue_query.where(
-                Transaction.location_id == data.location_id
-            )
-        elif data.controller_id:
-            total_revenue_query = total_revenue_query.where(
-                Transaction.controller_id == data.controller_id
-            )
-            today_revenue_query = today_revenue_query.where(
-                Transaction.controller_id == data.controller_id
-            )
-        elif whereclause is not None:
-            total_revenue_query = total_revenue_query.where(whereclause)
-            today_revenue_query = today_revenue_query.where(whereclause)
-
-        total_result = await self.session.execute(total_revenue_query)
-        today_result = await self.session.execute(today_revenue_query)
-
-        total_revenue = total_result.scalar() or 0
-        today_revenue = today_result.scalar() or 0
-
-        return RevenueDTO(total=total_revenue, today=today_revenue)
+        result = await self.session.execute(stmt)
+        return RevenueDTO.model_validate(result.mappings().one())
 
     async def get_revenue_all(self, data: GetRevenueRequest) -> RevenueDTO:
         return await self._get_revenue(data)
@@ -273,29 +417,29 @@ class TransactionRepository(BaseRepository):
     async def get_revenue_by_owner(
         self, data: GetRevenueRequest, user_id: UUID
     ) -> RevenueDTO:
-        whereclause = Transaction.location_id.in_(
+        location_ids = (
             select(Location.id).join(Company).where(Company.owner_id == user_id)
         )
-        return await self._get_revenue(data, whereclause)
+        return await self._get_revenue(data, location_ids)
 
     async def get_revenue_by_admin(
         self, data: GetRevenueRequest, user_id: UUID
     ) -> RevenueDTO:
-        whereclause = Transaction.location_id.in_(
-            select(LocationAdmin.location_id).where(LocationAdmin.user_id == user_id)
+        location_ids = select(LocationAdmin.location_id).where(
+            LocationAdmin.user_id == user_id
         )
-        return await self._get_revenue(data, whereclause)
+        return await self._get_revenue(data, location_ids)
 
     async def _get_today_clients(
         self,
         data: GetRevenueRequest,
         whereclause: ColumnElement[Any] | None = None,
     ) -> TodayClientsDTO:
-        now = datetime.now(UTC)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        today_start = data.today_start or get_utc_day_start()
 
         query = select(func.count(Transaction.id)).where(
-            Transaction.created_at >= today_start, Transaction.created_at <= now
+            Transaction.created_at >= today_start,
+            Transaction.created_at <= datetime.now(UTC),
         )
 
         if data.company_id:
@@ -314,6 +458,33 @@ class TransactionRepository(BaseRepository):
 
         return TodayClientsDTO(count=count)
 
+    async def get_totals_by_controller(
+        self, date_from: datetime, date_to: datetime
+    ) -> Sequence[Row[Any]]:
+        stmt = (
+            select(
+                Transaction.controller_id,
+                Transaction.location_id,
+                Location.company_id,
+                *[
+                    sum_as_int(getattr(Transaction, f"{channel}_amount"))
+                    for channel in REVENUE_CHANNELS
+                ],
+                func.count(),
+            )
+            .outerjoin(Location, Location.id == Transaction.location_id)
+            .where(
+                Transaction.created_at >= date_from,
+                Transaction.created_at < date_to,
+            )
+            .group_by(
+                Transaction.controller_id,
+                Transaction.location_id,
+                Location.company_id,
+            )
+        )
+        return (await self.session.execute(stmt)).all()
+
     async def get_today_clients_all(self, data: GetRevenueRequest) -> TodayClientsDTO:
         return await self._get_today_clients(data)
 
@@ -1,7 +1,7 @@
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import delete, exists, select
+from sqlalchemy import delete, exists, literal, select, union_all
 from sqlalchemy.orm import selectinload
 
 from dash.infrastructure.repositories.base import BaseRepository
@@ -79,6 +79,26 @@ class UserRepository(BaseRepository):
         result = await self.session.execute(stmt)
         return result.scalar_one()
 
+    async def get_access_ids(
+        self, user_id: UUID
+    ) -> tuple[set[UUID], set[UUID], set[UUID]]:
+        """Owned companies, owned locations and administered locations"""
+        stmt = union_all(
+            select(literal(0), Company.id).where(Company.owner_id == user_id),
+            select(literal(1), Location.id)
+            .join(Company, Location.company_id == Company.id)
+            .where(Company.owner_id == user_id),
+            select(literal(2), LocationAdmin.location_id).where(
+                LocationAdmin.user_id == user_id
+            ),
+        )
+        result = await self.session.execute(stmt)
+
+        ids: tuple[set[UUID], set[UUID], set[UUID]] = (set(), set(), set())
+        for kind, id_ in result:
+            ids[kind].add(id_)
+        return ids
+
     async def delete_location_admin(self, user_id: UUID, location_id: UUID) -> None:
         stmt = delete(LocationAdmin).where(
             LocationAdmin.user_id == user_id, LocationAdmin.location_id == location_id
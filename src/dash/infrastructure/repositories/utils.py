@@ -1,4 +1,4 @@
-from typing import Any, Type
+from typing import Any, Sequence, Type
 from dash.models.base import Base
 
 
@@ -8,3 +8,24 @@ def parse_model_fields(instance: Base, model: Type[Base]) -> dict[str, Any]:
         for c in model.__table__.columns
         if hasattr(instance, c.name) and getattr(instance, c.name) is not None
     }
+
+
+def parse_model_rows(
+    instances: Sequence[Base], model: Type[Base]
+) -> list[dict[str, Any]]:
+    columns = [
+        c
+        for c in model.__table__.columns
+        if any(getattr(instance, c.name, None) is not None for instance in instances)
+    ]
+    rows = []
+    for instance in instances:
+        row = {}
+        for c in columns:
+            value = getattr(instance, c.name, None)
+            if value is None and c.default is not None and c.default.is_scalar:
+                value = c.default.arg
+            row[c.name] = value
+        rows.append(row)
+
+    return rows
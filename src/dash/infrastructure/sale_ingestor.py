@@ -0,0 +1,248 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+from uuid_utils.compat import uuid7
+
+from dash.infrastructure.live_events import LiveEvents, LiveEventType
+from dash.infrastructure.repositories.customer import CustomerRepository
+from dash.infrastructure.repositories.fiscalization_job import (
+    FiscalizationJobRepository,
+)
+from dash.infrastructure.repositories.location import LocationRepository
+from dash.infrastructure.repositories.payment import PaymentRepository
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.storages.today_counters import (
+    TodayCountersStorage,
+    TodayIncrement,
+)
+from dash.models.payment import Payment
+from dash.models.transactions.transaction import Transaction
+
+logger = get_logger()
+
+
+@dataclass
+class PendingSale:
+    transaction: Transaction
+    payment: Payment | None
+    future: asyncio.Future[bool]
+
+
+class SaleIngestor:
+    MAX_BATCH_SIZE = 200
+    MAX_LINGER_SECONDS = 0.005
+    MAX_CONCURRENT_FLUSHES = 4
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        today_counters: TodayCountersStorage,
+        live_events: LiveEvents,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.today_counters = today_counters
+        self.live_events = live_events
+        self._queue: asyncio.Queue[PendingSale] = asyncio.Queue()
+        self._flush_slots = asyncio.Semaphore(self.MAX_CONCURRENT_FLUSHES)
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def submit(
+        self, transaction: Transaction, payment: Payment | None = None
+    ) -> bool:
+        if transaction.id is None:
+            transaction.id = uuid7()
+        if payment is not None:
+            payment.transaction_id = transaction.id
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(PendingSale(transaction, payment, future))
+
+        return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            # every queued sale has been handed to a flush, unless the worker died
+            drained = asyncio.create_task(self._queue.join())
+            await asyncio.wait(
+                (drained, self._worker), return_when=asyncio.FIRST_COMPLETED
+            )
+            drained.cancel()
+            self._worker.cancel()
+            self._fail_queued()
+
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _fail_queued(self) -> None:
+        while not self._queue.empty():
+            sale = self._queue.get_nowait()
+            self._queue.task_done()
+            if not sale.future.done():
+                sale.future.set_exception(RuntimeError("Sale ingestor is closed"))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._flush_slots.acquire()
+                await self._fill_batch(batch)
+            except Exception as e:
+                # the sales already taken off the queue would wait forever
+                for sale in batch:
+                    self._queue.task_done()
+                    if not sale.future.done():
+                        sale.future.set_exception(e)
+                raise
+
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._on_flush_done)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _fill_batch(self, batch: list[PendingSale]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.MAX_LINGER_SECONDS
+
+        while len(batch) < self.MAX_BATCH_SIZE:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except TimeoutError:
+                break
+
+    def _on_flush_done(self, task: asyncio.Task[None]) -> None:
+        self._flushes.discard(task)
+        self._flush_slots.release()
+
+    async def _flush(self, batch: list[PendingSale]) -> None:
+        try:
+            inserted_ids = await self._write(batch)
+        except Exception as e:
+            if len(batch) > 1:
+                logger.exception(
+                    "Sale batch write failed, retrying sales one by one",
+                    batch_size=len(batch),
+                )
+                for sale in batch:
+                    await self._flush([sale])
+                return
+
+            logger.exception(
+                "Sale write failed",
+                controller_id=batch[0].transaction.controller_id,
+                controller_transaction_id=batch[
+                    0
+                ].transaction.controller_transaction_id,
+            )
+            if not batch[0].future.done():
+                batch[0].future.set_exception(e)
+            return
+
+        for sale in batch:
+            if not sale.future.done():
+                sale.future.set_result(sale.transaction.id in inserted_ids)
+
+    async def _write(self, batch: list[PendingSale]) -> set[UUID]:
+        async with self.sessionmaker() as session:
+            transaction_repository = TransactionRepository(session)
+            payment_repository = PaymentRepository(session)
+            customer_repository = CustomerRepository(session)
+            fiscalization_job_repository = FiscalizationJobRepository(session)
+
+            inserted_ids = (
+                await transaction_repository.insert_many_with_conflict_ignore(
+                    [sale.transaction for sale in batch]
+                )
+            )
+
+            card_amounts: dict[UUID, Decimal] = defaultdict(Decimal)
+            for sale in batch:
+                transaction = sale.transaction
+                if transaction.id not in inserted_ids:
+                    continue
+
+                if sale.payment is not None:
+                    payment_repository.add(sale.payment)
+                    if sale.payment.receipt_id is not None:
+                        fiscalization_job_repository.enqueue(sale.payment)
+
+                if transaction.customer_id is not None and transaction.card_amount:
+                    card_amounts[transaction.customer_id] += (
+                        Decimal(transaction.card_amount) / 100
+                    )
+
+            if card_amounts:
+                await customer_repository.deduct_balances(card_amounts)
+
+            inserted = [
+                sale.transaction
+                for sale in batch
+                if sale.transaction.id in inserted_ids
+            ]
+            company_ids = await LocationRepository(session).get_company_ids(
+                {t.location_id for t in inserted if t.location_id is not None}
+            )
+
+            await session.commit()
+
+        increments = [
+            TodayIncrement.from_transaction(
+                transaction, company_ids.get(transaction.location_id)
+            )
+            for transaction in inserted
+        ]
+        await self._count_sales(increments)
+        await self._notify_sales(inserted, increments)
+        return inserted_ids
+
+    async def _notify_sales(
+        self, transactions: list[Transaction], increments: list[TodayIncrement]
+    ) -> None:
+        try:
+            await self.live_events.publish_many(
+                [
+                    (
+                        LiveEventType.TRANSACTION,
+                        transaction.controller_id,
+                        {"id": transaction.id, "amounts": increment.amounts},
+                    )
+                    for transaction, increment in zip(transactions, increments)
+                    if transaction.controller_id is not None
+                ]
+            )
+        except Exception:
+            logger.exception("Failed to publish sales", sales=len(transactions))
+
+    async def _count_sales(self, increments: list[TodayIncrement]) -> None:
+        # the sales are already committed, the counters get rebuilt from them
+        try:
+            await self.today_counters.increment(increments)
+        except Exception:
+            logger.exception("Failed to update today counters", sales=len(increments))
+
+
+async def get_sale_ingestor(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    today_counters: TodayCountersStorage,
+    live_events: LiveEvents,
+) -> AsyncIterator[SaleIngestor]:
+    ingestor = SaleIngestor(sessionmaker, today_counters, live_events)
+    yield ingestor
+    await ingestor.close()
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from dishka import AsyncContainer
+from structlog import get_logger
+
+from dash.infrastructure.repositories.controller_state_sample import (
+    ControllerStateSampleRepository,
+)
+from dash.infrastructure.storages.iot import IoTStorage
+from dash.main.config import StateHistoryConfig
+
+logger = get_logger()
+
+
+async def persist_state_history(di_container: AsyncContainer) -> None:
+    async with di_container() as dic:
+        iot_storage = await dic.get(IoTStorage)
+        sample_repository = await dic.get(ControllerStateSampleRepository)
+        config = await dic.get(StateHistoryConfig)
+        interval = timedelta(seconds=config.sample_interval)
+
+        controller_ids = await iot_storage.get_state_history_controller_ids()
+        cursors = await iot_storage.get_state_history_cursors(controller_ids)
+
+        samples: list[dict[str, Any]] = []
+        new_cursors: dict[UUID, datetime] = {}
+        for controller_id, cursor in zip(controller_ids, cursors):
+            next_at = cursor + interval if cursor else None
+            history = await iot_storage.get_state_history(
+                controller_id, next_at, None, IoTStorage.HISTORY_MAXLEN
+            )
+            # the first state of every interval since the last sample
+            for created_at, state in history:
+                if next_at is not None and created_at < next_at:
+                    continue
+                samples.append(
+                    {
+                        "controller_id": controller_id,
+                        "created_at": created_at,
+                        "state": state,
+                    }
+                )
+                new_cursors[controller_id] = created_at
+                next_at = created_at + interval
+
+        await sample_repository.add_many(samples)
+        await sample_repository.delete_before(
+            datetime.now(UTC) - timedelta(days=config.retention_days)
+        )
+        await sample_repository.commit()
+
+        # moved only after the commit, a failed run is retried from the same place
+        await iot_storage.set_state_history_cursors(new_cursors)
+
+    logger.info(
+        "State history persisted",
+        controllers=len(controller_ids),
+        samples=len(samples),
+    )
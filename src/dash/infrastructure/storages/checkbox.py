@@ -0,0 +1,42 @@
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+
+
+class CheckboxStorage:
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.cashier_key = "checkbox:token:{login}"
+        self.shift_key = "checkbox:shift:{license_key}"
+        self.shift_lock_key = "checkbox:shift_lock:{login}"
+
+        self.shift_lock_timeout = 60
+
+    async def set_token(self, login: str, token: str, ttl: int) -> None:
+        await self.redis.set(self.cashier_key.format(login=login), token, ex=ttl)
+
+    async def get_token(self, login: str) -> str | None:
+        token = await self.redis.get(self.cashier_key.format(login=login))
+        return token.decode("utf-8") if token else None
+
+    async def delete_token(self, login: str) -> None:
+        await self.redis.delete(self.cashier_key.format(login=login))
+
+    async def set_shift_opened(self, license_key: str, ttl: int) -> None:
+        await self.redis.set(
+            self.shift_key.format(license_key=license_key), "OPENED", ex=ttl
+        )
+
+    async def is_shift_opened(self, license_key: str) -> bool:
+        return bool(
+            await self.redis.exists(self.shift_key.format(license_key=license_key))
+        )
+
+    async def delete_shift(self, license_key: str) -> None:
+        await self.redis.delete(self.shift_key.format(license_key=license_key))
+
+    def shift_lock(self, login: str) -> Lock:
+        return self.redis.lock(
+            self.shift_lock_key.format(login=login),
+            timeout=self.shift_lock_timeout,
+            blocking_timeout=self.shift_lock_timeout,
+        )
@@ -1,76 +1,274 @@
-import json
-from datetime import timedelta
-from typing import Any
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Sequence
 from uuid import UUID
 
+import orjson
 from redis.asyncio import Redis
 
+from dash.infrastructure.live_events import LiveEvents, LiveEventType
+
 
 class IoTStorage:
+    # one hash per controller, fields are read and written independently
+    STATE = "state"
+    CREATED = "created"
+    ENERGY = "energy"
+    ENERGY_AT = "energy_at"
+    BROKER_ONLINE = "broker_online"
+    LAST_ONLINE = "last_online"
+
+    TTL = timedelta(days=365)
+    ENERGY_TTL = timedelta(days=1)
+    # per device budget, a few hundred KB at the usual report rate and size
+    HISTORY_MAXLEN = 2000
+    HISTORY_TTL = timedelta(days=7)
+
     def __init__(self, redis: Redis) -> None:
         self.redis = redis
-        self.state_key = "iot:state:{controller_id}"
-        self.energy_state_key = "iot:energy_state:{controller_id}"
-        self.online_key = "iot:online:{device_id}"
-        self.status_key = "iot:status:{controller_id}"
+        self.controller_key = "iot:controller:{controller_id}"
+        self.last_seen_key = "iot:last_seen"
+        self.history_key = "iot:state_history:{controller_id}"
+        self.history_cursor_key = "iot:state_history_cursor"
+
+    def _key(self, controller_id: UUID) -> str:
+        return self.controller_key.format(controller_id=controller_id)
+
+    def _history_key(self, controller_id: UUID) -> str:
+        return self.history_key.format(controller_id=controller_id)
+
+    @staticmethod
+    def _stream_id(dt: datetime) -> int:
+        return int(dt.timestamp() * 1000)
+
+    @staticmethod
+    def _stream_time(entry_id: bytes) -> datetime:
+        return datetime.fromtimestamp(int(entry_id.split(b"-")[0]) / 1000, UTC)
+
+    @staticmethod
+    def _load_flag(value: bytes | None) -> bool | None:
+        return None if value is None else value == b"1"
+
+    @staticmethod
+    def _dump_flag(value: bool) -> bytes:
+        return b"1" if value else b"0"
+
+    def _load_energy(
+        self, energy: bytes | None, energy_at: bytes | None
+    ) -> dict[str, Any] | None:
+        if not energy or not energy_at:
+            return None
+        if float(energy_at) < time.time() - self.ENERGY_TTL.total_seconds():
+            return None
+        return orjson.loads(energy)
+
+    async def _set_fields(
+        self, controller_id: UUID, fields: dict[str, bytes | str]
+    ) -> None:
+        key = self._key(controller_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=fields)  # type: ignore
+            pipe.expire(key, self.TTL)
+            await pipe.execute()
+
+    async def get_fields(
+        self, controller_id: UUID, fields: Sequence[str]
+    ) -> list[bytes | None]:
+        return await self.redis.hmget(self._key(controller_id), fields)  # type: ignore
+
+    async def get_fields_many(
+        self, controller_ids: Sequence[UUID], fields: Sequence[str]
+    ) -> list[list[bytes | None]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for controller_id in controller_ids:
+                pipe.hmget(self._key(controller_id), fields)
+            return await pipe.execute()
 
     async def set_state(self, state: dict[str, Any], controller_id: UUID) -> None:
-        await self.redis.setex(
-            name=self.state_key.format(controller_id=controller_id),
-            value=json.dumps(state),
-            time=timedelta(days=365),
-        )
+        encoded = orjson.dumps(state)
+        fields: dict[str, bytes | str] = {self.STATE: encoded}
+        # kept apart so online checks don't decode the state
+        created = state.get("created")
+        if created:
+            fields[self.CREATED] = created
+
+        key = self._key(controller_id)
+        history_key = self._history_key(controller_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=fields)  # type: ignore
+            if not created:
+                # a report without a time doesn't inherit the previous one
+                pipe.hdel(key, self.CREATED)
+            pipe.expire(key, self.TTL)
+            # the history rides the same round trip as the state itself
+            pipe.xadd(
+                history_key,
+                {self.STATE: encoded},
+                maxlen=self.HISTORY_MAXLEN,
+                approximate=True,
+            )
+            pipe.expire(history_key, self.HISTORY_TTL)
+            pipe.publish(
+                LiveEvents.CHANNEL,
+                LiveEvents.encode(LiveEventType.STATE, controller_id, state),
+            )
+            await pipe.execute()
 
     async def get_state(self, controller_id: UUID) -> dict[str, Any] | None:
-        state = await self.redis.get(self.state_key.format(controller_id=controller_id))
+        state = await self.redis.hget(self._key(controller_id), self.STATE)  # type: ignore
         if state:
-            return json.loads(state)
+            return orjson.loads(state)
         return None
 
+    async def get_state_history(
+        self,
+        controller_id: UUID,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        limit: int,
+    ) -> list[tuple[datetime, dict[str, Any]]]:
+        # the end is exclusive, like the Postgres samples
+        max_id = self._stream_id(date_to) - 1 if date_to else "+"
+        if date_from is None:
+            # without a start the most recent states are the interesting ones
+            entries = await self.redis.xrevrange(
+                self._history_key(controller_id), max=max_id, min="-", count=limit
+            )
+            entries.reverse()
+        else:
+            entries = await self.redis.xrange(
+                self._history_key(controller_id),
+                min=self._stream_id(date_from),
+                max=max_id,
+                count=limit,
+            )
+        return [
+            (self._stream_time(entry_id), orjson.loads(fields[self.STATE.encode()]))
+            for entry_id, fields in entries
+        ]
+
+    async def get_state_history_controller_ids(self) -> list[UUID]:
+        prefix = self.history_key.format(controller_id="")
+        return [
+            UUID(key.decode().removeprefix(prefix))
+            async for key in self.redis.scan_iter(match=f"{prefix}*", count=1000)
+        ]
+
+    async def get_state_history_cursors(
+        self, controller_ids: Sequence[UUID]
+    ) -> list[datetime | None]:
+        if not controller_ids:
+            return []
+
+        values = await self.redis.hmget(  # type: ignore
+            self.history_cursor_key, [str(id_) for id_ in controller_ids]
+        )
+        return [
+            datetime.fromtimestamp(float(value), UTC) if value else None
+            for value in values
+        ]
+
+    async def set_state_history_cursors(self, cursors: dict[UUID, datetime]) -> None:
+        if not cursors:
+            return
+
+        await self.redis.hset(  # type: ignore
+            self.history_cursor_key,
+            mapping={str(id_): dt.timestamp() for id_, dt in cursors.items()},
+        )
+
+    async def get_state_and_energy(
+        self, controller_id: UUID
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        state, energy, energy_at = await self.get_fields(
+            controller_id, (self.STATE, self.ENERGY, self.ENERGY_AT)
+        )
+        return (
+            orjson.loads(state) if state else None,
+            self._load_energy(energy, energy_at),
+        )
+
+    async def get_online_markers(
+        self, controller_ids: Sequence[UUID]
+    ) -> list[tuple[datetime | None, bool]]:
+        values = await self.get_fields_many(
+            controller_ids, (self.CREATED, self.BROKER_ONLINE)
+        )
+        return [
+            (
+                datetime.fromisoformat(created.decode()) if created else None,
+                bool(self._load_flag(broker_online)),
+            )
+            for created, broker_online in values
+        ]
+
     async def set_energy_state(
         self, energy_state: dict[str, Any], controller_id: UUID
     ) -> None:
-        await self.redis.setex(
-            name=self.energy_state_key.format(controller_id=controller_id),
-            value=json.dumps(energy_state),
-            time=timedelta(days=1),
+        await self._set_fields(
+            controller_id,
+            {
+                self.ENERGY: orjson.dumps(energy_state),
+                self.ENERGY_AT: str(time.time()),
+            },
         )
 
     async def get_energy_state(self, controller_id: UUID) -> dict[str, Any] | None:
-        energy_state = await self.redis.get(
-            self.energy_state_key.format(controller_id=controller_id)
+        energy, energy_at = await self.get_fields(
+            controller_id, (self.ENERGY, self.ENERGY_AT)
         )
-        if energy_state:
-            return json.loads(energy_state)
-        return None
+        return self._load_energy(energy, energy_at)
 
-    async def set_broker_online_status(self, value: bool, device_id: str) -> None:
-        await self.redis.setex(
-            name=self.online_key.format(device_id=device_id),
-            value=json.dumps(value),
-            time=timedelta(days=365),
+    async def set_broker_online_status(self, value: bool, controller_id: UUID) -> None:
+        await self._set_fields(
+            controller_id, {self.BROKER_ONLINE: self._dump_flag(value)}
         )
 
-    async def get_broker_online_status(self, device_id: str) -> bool:
-        status = await self.redis.get(self.online_key.format(device_id=device_id))
+    async def get_broker_online_status(self, controller_id: UUID) -> bool:
+        status = await self.redis.hget(  # type: ignore
+            self._key(controller_id), self.BROKER_ONLINE
+        )
+        return bool(self._load_flag(status))
 
-        if not status:
-            return False
+    async def set_last_online_status(self, controller_id: UUID, value: bool) -> None:
+        await self._set_fields(
+            controller_id, {self.LAST_ONLINE: self._dump_flag(value)}
+        )
 
-        return json.loads(status)
+    async def swap_last_online_status(
+        self, controller_id: UUID, value: bool
+    ) -> bool | None:
+        key = self._key(controller_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hget(key, self.LAST_ONLINE)
+            pipe.hset(key, self.LAST_ONLINE, self._dump_flag(value))
+            pipe.expire(key, self.TTL)
+            status, *_ = await pipe.execute()
 
-    async def set_last_online_status(self, controller_id: UUID, value: bool) -> None:
-        await self.redis.setex(
-            name=self.status_key.format(controller_id=controller_id),
-            value=json.dumps(value),
-            time=timedelta(days=7),
+        return self._load_flag(status)
+
+    async def touch_last_seen(self, seen_at: dict[str, datetime]) -> None:
+        await self.redis.zadd(
+            self.last_seen_key,
+            {device_id: dt.timestamp() for device_id, dt in seen_at.items()},
         )
 
+    async def pop_last_seen_before(self, before: datetime) -> list[str]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrangebyscore(self.last_seen_key, "-inf", before.timestamp())
+            pipe.zremrangebyscore(self.last_seen_key, "-inf", before.timestamp())
+            device_ids, _ = await pipe.execute()
+
+        return [device_id.decode() for device_id in device_ids]
+
+    async def get_last_online_statuses(
+        self, controller_ids: Sequence[UUID]
+    ) -> list[bool | None]:
+        values = await self.get_fields_many(controller_ids, (self.LAST_ONLINE,))
+        return [self._load_flag(status) for (status,) in values]
+
     async def get_last_online_status(self, controller_id: UUID) -> bool | None:
-        status = await self.redis.get(
-            self.status_key.format(controller_id=controller_id)
+        status = await self.redis.hget(  # type: ignore
+            self._key(controller_id), self.LAST_ONLINE
         )
-        if not status:
-            return None
-
-        return json.loads(status)
+        return self._load_flag(status)
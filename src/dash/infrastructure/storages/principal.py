@@ -0,0 +1,78 @@
+import hashlib
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from dash.infrastructure.auth.dto import Principal
+
+
+class PrincipalStorage:
+    # a load that raced an invalidation must not cache what it read
+    _LUA_SET_IF_CURRENT = """
+    local generation = redis.call('GET', KEYS[2]) or '0'
+    local version = redis.call('GET', KEYS[3]) or '0'
+    if generation == ARGV[1] and version == ARGV[2] then
+      redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[4])
+    end
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.principal_key = "principal:{}"
+        self.version_key = "principal_version:{}"
+        self.generation_key = "principal_generation"
+        self.ttl = 300
+        # outlives every entry cached before the bump
+        self.version_ttl = 60 * 60 * 24
+
+        self._set_if_current = redis.register_script(self._LUA_SET_IF_CURRENT)
+
+    def _key(self, token: str) -> str:
+        # the token itself is a credential, keep only its hash in redis
+        return self.principal_key.format(hashlib.sha256(token.encode()).hexdigest())
+
+    async def get(self, token: str, user_id: UUID) -> tuple[Principal | None, str]:
+        """The cached principal and the stamp a miss passes back to `set`"""
+        raw, generation, version = await self.redis.mget(
+            self._key(token), self.generation_key, self.version_key.format(user_id)
+        )
+        stamp = f"{int(generation or 0)}:{int(version or 0)}"
+        if not raw:
+            return None, stamp
+
+        cached_stamp, _, data = raw.decode().partition("|")
+        if cached_stamp != stamp:
+            return None, stamp
+        return Principal.model_validate_json(data), stamp
+
+    async def set(self, token: str, principal: Principal, stamp: str) -> None:
+        generation, version = stamp.split(":")
+        await self._set_if_current(
+            keys=[
+                self._key(token),
+                self.generation_key,
+                self.version_key.format(principal.id),
+            ],
+            args=[
+                generation,
+                version,
+                f"{stamp}|{principal.model_dump_json()}",
+                self.ttl,
+            ],
+        )
+
+    async def delete(self, token: str) -> None:
+        await self.redis.delete(self._key(token))
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        if not user_ids:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in set(user_ids):
+                pipe.incr(self.version_key.format(user_id))
+                pipe.expire(self.version_key.format(user_id), self.version_ttl)
+            await pipe.execute()
+
+    async def invalidate_all(self) -> None:
+        await self.redis.incr(self.generation_key)
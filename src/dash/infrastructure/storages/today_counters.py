@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from dash.main.config import AppConfig
+from dash.models.transactions.transaction import Transaction
+
+
+@dataclass
+class TodayIncrement:
+    controller_id: UUID | None
+    location_id: UUID | None
+    company_id: UUID | None
+    amounts: dict[str, int]
+    clients: int = 1
+    at: datetime | None = None
+
+    @classmethod
+    def from_transaction(
+        cls, transaction: Transaction, company_id: UUID | None
+    ) -> "TodayIncrement":
+        return cls(
+            controller_id=transaction.controller_id,
+            location_id=transaction.location_id,
+            company_id=company_id,
+            amounts={
+                "bill": transaction.bill_amount or 0,
+                "coin": transaction.coin_amount or 0,
+                "qr": transaction.qr_amount or 0,
+                "paypass": transaction.paypass_amount or 0,
+                "card": transaction.card_amount or 0,
+            },
+        )
+
+
+class TodayCountersStorage:
+    CHANNELS = ("bill", "coin", "qr", "paypass", "card")
+    CLIENTS = "clients"
+
+    CONTROLLER = "controller"
+    LOCATION = "location"
+    COMPANY = "company"
+    ALL = "all"
+
+    def __init__(self, redis: Redis, config: AppConfig) -> None:
+        self.redis = redis
+        self.timezone = config.timezone
+        self.counters_key = "today:{day}:{scope}:{id}"
+        self.ready_key = "today:{day}:ready"
+        self.ttl = timedelta(days=2)
+
+    def get_day(self, at: datetime | None = None) -> date:
+        return (at or datetime.now(UTC)).astimezone(self.timezone).date()
+
+    def get_day_start(self, day: date) -> datetime:
+        return datetime.combine(day, time.min, tzinfo=self.timezone)
+
+    async def increment(self, increments: Sequence[TodayIncrement]) -> None:
+        if not increments:
+            return
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for increment in increments:
+                self._add(pipe, self.get_day(increment.at), increment)
+            await pipe.execute()
+
+    async def replace(self, day: date, increments: Sequence[TodayIncrement]) -> None:
+        stale_keys = [
+            key
+            async for key in self.redis.scan_iter(
+                match=self.counters_key.format(day=day, scope="*", id="*")
+            )
+        ]
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if stale_keys:
+                pipe.delete(*stale_keys)
+            for increment in increments:
+                self._add(pipe, day, increment)
+            pipe.set(self.ready_key.format(day=day), 1, ex=self.ttl)
+            await pipe.execute()
+
+    async def is_ready(self, day: date) -> bool:
+        return bool(await self.redis.exists(self.ready_key.format(day=day)))
+
+    async def get(
+        self, scopes: Sequence[tuple[str, UUID | str]]
+    ) -> dict[str, int] | None:
+        """Sums today's counters over the scopes, None until they were rebuilt"""
+        day = self.get_day()
+        fields = (*self.CHANNELS, self.CLIENTS)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self.ready_key.format(day=day))
+            for scope, id_ in scopes:
+                pipe.hmget(
+                    self.counters_key.format(day=day, scope=scope, id=id_), fields
+                )
+            ready, *rows = await pipe.execute()
+
+        if not ready:
+            return None
+
+        totals = dict.fromkeys(fields, 0)
+        for row in rows:
+            for field, value in zip(fields, row):
+                if value is not None:
+                    totals[field] += int(value)
+        return totals
+
+    def _add(self, pipe: Pipeline, day: date, increment: TodayIncrement) -> None:
+        scopes = (
+            (self.CONTROLLER, increment.controller_id),
+            (self.LOCATION, increment.location_id),
+            (self.COMPANY, increment.company_id),
+            (self.ALL, self.ALL),
+        )
+        for scope, id_ in scopes:
+            if id_ is None:
+                continue
+
+            key = self.counters_key.format(day=day, scope=scope, id=id_)
+            for channel, amount in increment.amounts.items():
+                if amount:
+                    pipe.hincrby(key, channel, amount)
+            if increment.clients:
+                pipe.hincrby(key, self.CLIENTS, increment.clients)
+            pipe.expire(key, self.ttl)
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from dishka import AsyncContainer
+from structlog import get_logger
+
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.storages.today_counters import (
+    TodayCountersStorage,
+    TodayIncrement,
+)
+
+logger = get_logger()
+
+
+async def rebuild_today_counters(di_container: AsyncContainer) -> None:
+    async with di_container() as dic:
+        today_counters = await dic.get(TodayCountersStorage)
+        transaction_repository = await dic.get(TransactionRepository)
+
+        day = today_counters.get_day()
+        day_start = today_counters.get_day_start(day)
+        rows = await transaction_repository.get_totals_by_controller(
+            day_start, day_start + timedelta(days=1)
+        )
+
+    await today_counters.replace(
+        day,
+        [
+            TodayIncrement(
+                controller_id=controller_id,
+                location_id=location_id,
+                company_id=company_id,
+                amounts=dict(zip(TodayCountersStorage.CHANNELS, amounts)),
+                clients=clients,
+            )
+            for controller_id, location_id, company_id, *amounts, clients in rows
+        ],
+    )
+    logger.info("Today counters rebuilt", day=day, controllers=len(rows))
+
+
+async def ensure_today_counters(di_container: AsyncContainer) -> None:
+    today_counters = await di_container.get(TodayCountersStorage)
+    if not await today_counters.is_ready(today_counters.get_day()):
+        await rebuild_today_counters(di_container)
@@ -7,7 +7,13 @@ from fastapi import FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
-from dash.infrastructure.controllers_online_monitor import monitor_controllers_online
+from dash.infrastructure.cluster import ClusterMembership, leader_only
+from dash.infrastructure.controllers_online_monitor import (
+    reconcile_controllers_online,
+    sweep_controllers_online,
+)
+from dash.infrastructure.daily_revenue_refresher import refresh_daily_revenue
+from dash.infrastructure.fiscalization_worker import FiscalizationWorker
 from dash.infrastructure.iot.car_cleaner.client import CarCleanerIoTClient
 from dash.infrastructure.iot.carwash.client import CarwashIoTClient
 from dash.infrastructure.iot.fiscalizer.client import FiscalizerIoTClient
@@ -15,16 +21,25 @@ from dash.infrastructure.iot.laundry.client import LaundryIoTClient
 from dash.infrastructure.iot.mqtt.client import MqttClient
 from dash.infrastructure.iot.vacuum.client import VacuumIoTClient
 from dash.infrastructure.iot.wsm.client import WsmIoTClient
-from dash.main.config import Config
+from dash.infrastructure.notifications import TgNotificationOutbox
+from dash.infrastructure.state_history_sampler import persist_state_history
+from dash.infrastructure.today_counters_rebuilder import (
+    ensure_today_counters,
+    rebuild_today_counters,
+)
+from dash.main.config import AppConfig, Config, StateHistoryConfig
 from dash.main.di import setup_di
 from dash.main.logging.access import access_logs_middleware
 from dash.presentation.exception_handlers import setup_exception_handlers
 from dash.presentation.routes.root import root_router
+from dash.services.bulk_operation.runner import BulkOperationRunner
+from dash.services.payment.webhook_worker import AcquiringWebhookWorker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     di_container: AsyncContainer = app.state.dishka_container
+    await di_container.get(ClusterMembership)
     await di_container.get(WsmIoTClient)
     await di_container.get(CarwashIoTClient)
     await di_container.get(FiscalizerIoTClient)
@@ -32,13 +47,45 @@ async def lifespan(app: FastAPI):
     await di_container.get(LaundryIoTClient)
     await di_container.get(VacuumIoTClient)
     await di_container.get(CarCleanerIoTClient)
+    await di_container.get(FiscalizationWorker)
+    await di_container.get(TgNotificationOutbox)
+    await di_container.get(BulkOperationRunner)
+    await di_container.get(AcquiringWebhookWorker)
+    await leader_only(ensure_today_counters, ttl=60)(di_container)
 
     aiocron.Cron(
         "* * * * *",
-        func=monitor_controllers_online,
+        func=leader_only(sweep_controllers_online, ttl=50),
         args=(di_container,),
         start=True,
     )
+    aiocron.Cron(
+        "0 * * * *",
+        func=leader_only(reconcile_controllers_online, ttl=50 * 60),
+        args=(di_container,),
+        start=True,
+    )
+    aiocron.Cron(
+        "*/15 * * * *",
+        func=leader_only(refresh_daily_revenue, ttl=14 * 60),
+        args=(di_container,),
+        start=True,
+    )
+    # a new day starts with empty counters, this marks them complete
+    aiocron.Cron(
+        "0 0 * * *",
+        func=leader_only(rebuild_today_counters, ttl=50 * 60),
+        args=(di_container,),
+        start=True,
+        tz=(await di_container.get(AppConfig)).timezone,
+    )
+    if (await di_container.get(StateHistoryConfig)).persist:
+        aiocron.Cron(
+            "*/5 * * * *",
+            func=leader_only(persist_state_history, ttl=4 * 60),
+            args=(di_container,),
+            start=True,
+        )
 
     yield
 
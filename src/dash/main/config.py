@@ -16,6 +16,8 @@ class PostgresConfig(BaseModel):
     user: str
     password: str
     db: str
+    pool_size: int = 10
+    max_overflow: int = 20
 
     def build_dsn(self) -> str:
         # import here to avoid import sqlalchemy before datadog integration
@@ -44,6 +46,8 @@ class MqttConfig(BaseModel):
     username: str
     password: str
     client_id: str | None = Field(default=None)
+    read_cache_ttl: float = 1.0
+    max_in_flight_per_device: int = 2
 
 
 class AppConfig(BaseModel):
@@ -102,6 +106,30 @@ class S3Config(BaseModel):
     bucket_name: str
 
 
+class HttpClientConfig(BaseModel):
+    limit: int = 100
+    limit_per_host: int = 20
+    keepalive_timeout: float = 30
+    connect_timeout: float = 5
+    total_timeout: float = 30
+    retry_attempts: int = 3
+    retry_backoff: float = 0.5
+
+
+class ClusterConfig(BaseModel):
+    # partition device traffic between replicas; off for single-replica setups
+    enabled: bool = False
+    heartbeat_interval: float = 5
+    member_ttl: float = 15
+
+
+class StateHistoryConfig(BaseModel):
+    # downsampled copies of the Redis history kept in Postgres; off by default
+    persist: bool = False
+    sample_interval: int = 300
+    retention_days: int = 90
+
+
 class Config(BaseSettings):
     # Mock init to avoid lint error when creating config from env
     def __init__(self, *args, **kwargs):
@@ -118,6 +146,9 @@ class Config(BaseSettings):
     sms: SMSConfig
     s3: S3Config
     bot: TgBotConfig
+    http: HttpClientConfig = HttpClientConfig()
+    cluster: ClusterConfig = ClusterConfig()
+    state_history: StateHistoryConfig = StateHistoryConfig()
 
     model_config = {
         "arbitrary_types_allowed": True,
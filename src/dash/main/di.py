@@ -5,16 +5,26 @@ from fastapi import Request
 from dash.infrastructure.acquiring.checkbox import CheckboxService
 from dash.infrastructure.acquiring.liqpay import LiqpayGateway
 from dash.infrastructure.acquiring.monopay import MonopayGateway
+from dash.infrastructure.acquiring.monopay_keys import MonopayKeyCache
+from dash.infrastructure.api_client import APIClient, get_api_client
 from dash.infrastructure.auth.auth_service import AuthService
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.auth.password_processor import PasswordProcessor
 from dash.infrastructure.auth.sms_sender import SMSClient
 from dash.infrastructure.auth.token_processor import JWTTokenProcessor
+from dash.infrastructure.cluster import ClusterMembership, get_cluster_membership
+from dash.infrastructure.controller_cache import ControllerCache, get_controller_cache
+from dash.infrastructure.controllers_online_monitor import ControllersOnlineMonitor
 from dash.infrastructure.db.setup import (
     get_async_engine,
     get_async_session,
     get_async_sessionmaker,
 )
+from dash.infrastructure.energy_recorder import EnergyRecorder, get_energy_recorder
+from dash.infrastructure.fiscalization_worker import (
+    FiscalizationWorker,
+    get_fiscalization_worker,
+)
 from dash.infrastructure.iot.car_cleaner.client import CarCleanerIoTClient
 from dash.infrastructure.iot.car_cleaner.di import get_car_cleaner_client
 from dash.infrastructure.iot.carwash.client import CarwashIoTClient
@@ -29,27 +39,49 @@ from dash.infrastructure.iot.vacuum.client import VacuumIoTClient
 from dash.infrastructure.iot.vacuum.di import get_vacuum_client
 from dash.infrastructure.iot.wsm.client import WsmIoTClient
 from dash.infrastructure.iot.wsm.di import get_wsm_client
+from dash.infrastructure.live_events import LiveEvents, get_live_events
+from dash.infrastructure.notifications import (
+    TgNotificationOutbox,
+    get_tg_notification_outbox,
+)
 from dash.infrastructure.rate_limiter import RateLimiter
+from dash.infrastructure.repositories.acquiring_webhook import (
+    AcquiringWebhookRepository,
+)
+from dash.infrastructure.repositories.bulk_operation import BulkOperationRepository
 from dash.infrastructure.repositories.company import CompanyRepository
 from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.repositories.controller_state_sample import (
+    ControllerStateSampleRepository,
+)
 from dash.infrastructure.repositories.customer import CustomerRepository
+from dash.infrastructure.repositories.daily_revenue import DailyRevenueRepository
 from dash.infrastructure.repositories.encashment import EncashmentRepository
 from dash.infrastructure.repositories.energy_state import EnergyStateRepository
+from dash.infrastructure.repositories.fiscalization_job import (
+    FiscalizationJobRepository,
+)
 from dash.infrastructure.repositories.location import LocationRepository
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.infrastructure.repositories.transaction import TransactionRepository
 from dash.infrastructure.repositories.user import UserRepository
 from dash.infrastructure.s3 import S3Service
+from dash.infrastructure.sale_ingestor import SaleIngestor, get_sale_ingestor
 from dash.infrastructure.storages.acquiring import AcquiringStorage
 from dash.infrastructure.storages.carwash_session import CarwashSessionStorage
+from dash.infrastructure.storages.checkbox import CheckboxStorage
 from dash.infrastructure.storages.iot import IoTStorage
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.infrastructure.storages.redis import get_redis_client
 from dash.infrastructure.storages.session import SessionStorage
+from dash.infrastructure.storages.today_counters import TodayCountersStorage
 from dash.infrastructure.storages.verification import VerificationStorage
 from dash.infrastructure.tgbot import get_tg_bot
 from dash.main.config import (
     AppConfig,
+    ClusterConfig,
     Config,
+    HttpClientConfig,
     JWTConfig,
     LiqpayConfig,
     MonopayConfig,
@@ -58,8 +90,14 @@ from dash.main.config import (
     RedisConfig,
     S3Config,
     SMSConfig,
+    StateHistoryConfig,
     TgBotConfig,
 )
+from dash.services.bulk_operation.runner import (
+    BulkOperationRunner,
+    get_bulk_operation_runner,
+)
+from dash.services.bulk_operation.service import BulkOperationService
 from dash.services.common.check_online_interactor import CheckOnlineInteractor
 from dash.services.common.payment_helper import PaymentHelper
 from dash.services.company.service import CompanyService
@@ -76,7 +114,12 @@ from dash.services.iot.laundry.service import LaundryService
 from dash.services.iot.vacuum.service import VacuumService
 from dash.services.iot.wsm.service import WsmService
 from dash.services.location.service import LocationService
+from dash.services.metrics.service import MetricsService
 from dash.services.payment.service import PaymentService
+from dash.services.payment.webhook_worker import (
+    AcquiringWebhookWorker,
+    get_acquiring_webhook_worker,
+)
 from dash.services.transaction.service import TransactionService
 from dash.services.user.service import UserService
 
@@ -95,6 +138,9 @@ def provide_configs() -> Provider:
     provider.from_context(SMSConfig, scope=Scope.APP)
     provider.from_context(S3Config, scope=Scope.APP)
     provider.from_context(TgBotConfig, scope=Scope.APP)
+    provider.from_context(HttpClientConfig, scope=Scope.APP)
+    provider.from_context(ClusterConfig, scope=Scope.APP)
+    provider.from_context(StateHistoryConfig, scope=Scope.APP)
 
     return provider
 
@@ -134,6 +180,8 @@ def provide_services() -> Provider:
         DashboardService,
         CarCleanerService,
         DummyService,
+        MetricsService,
+        BulkOperationService,
     )
     return provider
 
@@ -144,18 +192,24 @@ def provide_gateways() -> Provider:
     provider.provide_all(
         UserRepository,
         ControllerRepository,
+        ControllerStateSampleRepository,
         CustomerRepository,
         TransactionRepository,
         PaymentRepository,
         AcquiringStorage,
         LocationRepository,
         SessionStorage,
+        PrincipalStorage,
         VerificationStorage,
         CompanyRepository,
         IoTStorage,
         CarwashSessionStorage,
         EncashmentRepository,
         EnergyStateRepository,
+        DailyRevenueRepository,
+        FiscalizationJobRepository,
+        BulkOperationRepository,
+        AcquiringWebhookRepository,
     )
     return provider
 
@@ -170,6 +224,9 @@ def provide_infrastructure() -> Provider:
     provider.provide(AuthService, scope=Scope.REQUEST)
     provider.provide(IdProvider, scope=Scope.REQUEST)
 
+    provider.provide(
+        get_cluster_membership, scope=Scope.APP, provides=ClusterMembership
+    )
     provider.provide(get_wsm_client, scope=Scope.APP, provides=WsmIoTClient)
     provider.provide(get_carwash_client, scope=Scope.APP, provides=CarwashIoTClient)
     provider.provide(
@@ -184,13 +241,36 @@ def provide_infrastructure() -> Provider:
 
     provider.provide(LiqpayGateway, scope=Scope.REQUEST)
     provider.provide(MonopayGateway, scope=Scope.REQUEST)
-    provider.provide(CheckboxService, scope=Scope.REQUEST)
+    provider.provide(MonopayKeyCache, scope=Scope.APP)
+    provider.provide(CheckboxStorage, scope=Scope.APP)
+    provider.provide(TodayCountersStorage, scope=Scope.APP)
+    provider.provide(get_live_events, scope=Scope.APP, provides=LiveEvents)
+    provider.provide(CheckboxService, scope=Scope.APP)
+    provider.provide(get_api_client, scope=Scope.APP, provides=APIClient)
 
     provider.provide(SMSClient, scope=Scope.REQUEST)
     provider.provide(S3Service, scope=Scope.REQUEST)
 
     provider.provide(get_tg_bot, scope=Scope.APP, provides=Bot)
     provider.provide(RateLimiter, scope=Scope.APP)
+    provider.provide(
+        get_tg_notification_outbox, scope=Scope.APP, provides=TgNotificationOutbox
+    )
+    provider.provide(ControllersOnlineMonitor, scope=Scope.REQUEST)
+    provider.provide(get_sale_ingestor, scope=Scope.APP, provides=SaleIngestor)
+    provider.provide(get_energy_recorder, scope=Scope.APP, provides=EnergyRecorder)
+    provider.provide(
+        get_fiscalization_worker, scope=Scope.APP, provides=FiscalizationWorker
+    )
+    provider.provide(get_controller_cache, scope=Scope.APP, provides=ControllerCache)
+    provider.provide(
+        get_bulk_operation_runner, scope=Scope.APP, provides=BulkOperationRunner
+    )
+    provider.provide(
+        get_acquiring_webhook_worker,
+        scope=Scope.APP,
+        provides=AcquiringWebhookWorker,
+    )
 
     return provider
 
@@ -220,5 +300,8 @@ def setup_di(config: Config) -> AsyncContainer:
             SMSConfig: config.sms,
             S3Config: config.s3,
             TgBotConfig: config.bot,
+            HttpClientConfig: config.http,
+            ClusterConfig: config.cluster,
+            StateHistoryConfig: config.state_history,
         },
     )
@@ -1,6 +1,9 @@
+from .acquiring_webhook import AcquiringWebhook
 from .admin_user import AdminUser
 from .base import Base
+from .bulk_operation import BulkOperation, BulkOperationItem
 from .company import Company
+from .controller_state_sample import ControllerStateSample
 from .controllers import (
     CarwashController,
     Controller,
@@ -10,8 +13,10 @@ from .controllers import (
     WaterVendingController,
 )
 from .customer import Customer
+from .daily_revenue import DailyControllerRevenue
 from .encashment import Encashment
-from .energy_state import DailyEnergyState
+from .energy_state import DailyEnergyState, EnergySample
+from .fiscalization_job import FiscalizationJob
 from .location import Location
 from .location_admin import LocationAdmin
 from .payment import Payment
@@ -26,13 +31,18 @@ from .transactions import (
 )
 
 __all__ = [
+    "AcquiringWebhook",
     "AdminUser",
     "Base",
+    "BulkOperation",
+    "BulkOperationItem",
     "CarwashController",
     "CarwashTransaction",
     "Company",
     "Controller",
+    "ControllerStateSample",
     "Customer",
+    "DailyControllerRevenue",
     "Location",
     "LocationAdmin",
     "Payment",
@@ -43,6 +53,8 @@ __all__ = [
     "WsmTransaction",
     "Encashment",
     "DailyEnergyState",
+    "EnergySample",
+    "FiscalizationJob",
     "FiscalizerController",
     "LaundryController",
     "LaundryTransaction",
@@ -0,0 +1,53 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import Index, UniqueConstraint, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dash.models.base import Base, TimestampMixin, UUIDMixin
+from dash.models.payment import PaymentGatewayType
+
+
+class AcquiringWebhookStatus(StrEnum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    DEAD = "DEAD"
+
+
+class AcquiringWebhook(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "acquiring_webhooks"
+
+    gateway_type: Mapped[PaymentGatewayType] = mapped_column()
+    invoice_id: Mapped[str] = mapped_column()
+    payment_status: Mapped[str] = mapped_column()
+    modified_at: Mapped[datetime] = mapped_column()
+    payload: Mapped[dict[str, Any]] = mapped_column()
+    status: Mapped[AcquiringWebhookStatus] = mapped_column(
+        default=AcquiringWebhookStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    run_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), default=func.now()
+    )
+    last_error: Mapped[str | None] = mapped_column()
+
+    __table_args__ = (
+        UniqueConstraint(
+            "gateway_type",
+            "invoice_id",
+            "modified_at",
+            "payment_status",
+            name="uix_acquiring_webhooks_delivery",
+        ),
+        Index(
+            "ix_acquiring_webhooks_invoice_modified_at",
+            "invoice_id",
+            "modified_at",
+        ),
+        Index(
+            "ix_acquiring_webhooks_pending_run_at",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
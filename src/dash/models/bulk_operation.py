@@ -0,0 +1,59 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dash.models.base import Base, TimestampMixin, UUIDMixin
+
+
+class BulkOperationType(StrEnum):
+    SET_SETTINGS = "SET_SETTINGS"
+    SET_CONFIG = "SET_CONFIG"
+    SYNC_SETTINGS = "SYNC_SETTINGS"
+    REBOOT = "REBOOT"
+
+
+class BulkOperationStatus(StrEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+
+
+class BulkOperationItemStatus(StrEnum):
+    PENDING = "PENDING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class BulkOperation(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "bulk_operations"
+
+    type: Mapped[BulkOperationType] = mapped_column()
+    payload: Mapped[dict[str, Any]] = mapped_column()
+    status: Mapped[BulkOperationStatus] = mapped_column(
+        default=BulkOperationStatus.PENDING
+    )
+    created_by: Mapped[UUID | None] = mapped_column(
+        ForeignKey("admin_users.id", ondelete="SET NULL")
+    )
+    # a running operation whose lease expired lost its replica
+    lease_until: Mapped[datetime | None] = mapped_column()
+
+
+class BulkOperationItem(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "bulk_operation_items"
+
+    operation_id: Mapped[UUID] = mapped_column(
+        ForeignKey("bulk_operations.id", ondelete="CASCADE"), index=True
+    )
+    controller_id: Mapped[UUID] = mapped_column(
+        ForeignKey("controllers.id", ondelete="CASCADE")
+    )
+    status: Mapped[BulkOperationItemStatus] = mapped_column(
+        default=BulkOperationItemStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    error: Mapped[str | None] = mapped_column()
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dash.models.base import Base
+
+
+class ControllerStateSample(Base):
+    __tablename__ = "controller_state_samples"
+
+    controller_id: Mapped[UUID] = mapped_column(
+        ForeignKey("controllers.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
+    state: Mapped[dict[str, Any]] = mapped_column()
@@ -0,0 +1,42 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Date, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dash.models.base import Base, Int64
+
+
+class DailyControllerRevenue(Base):
+    __tablename__ = "daily_controller_revenue"
+
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=func.gen_random_uuid()
+    )
+    day: Mapped[date] = mapped_column(Date)
+    controller_id: Mapped[UUID | None] = mapped_column()
+    location_id: Mapped[UUID | None] = mapped_column()
+
+    bill_amount: Mapped[Int64] = mapped_column(default=0)
+    coin_amount: Mapped[Int64] = mapped_column(default=0)
+    qr_amount: Mapped[Int64] = mapped_column(default=0)
+    paypass_amount: Mapped[Int64] = mapped_column(default=0)
+    card_amount: Mapped[Int64] = mapped_column(default=0)
+    transactions_count: Mapped[int] = mapped_column(default=0)
+
+    payments_amount: Mapped[Int64] = mapped_column(default=0)
+    cash_payments_amount: Mapped[Int64] = mapped_column(default=0)
+    cashless_payments_amount: Mapped[Int64] = mapped_column(default=0)
+    paypass_payments_amount: Mapped[Int64] = mapped_column(default=0)
+    liqpay_payments_amount: Mapped[Int64] = mapped_column(default=0)
+    monopay_payments_amount: Mapped[Int64] = mapped_column(default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            day,
+            controller_id,
+            location_id,
+            name="uix_daily_controller_revenue",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dash.models.base import Base, TimestampMixin, UUIDMixin
@@ -40,4 +40,10 @@ class Encashment(Base, UUIDMixin, TimestampMixin):
             created_at_controller,
             name="uix_encashment_controller_encashment_id",
         ),
+        Index(
+            "ix_encashments_controller_id_created_at",
+            "controller_id",
+            "created_at",
+            "id",
+        ),
     )
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 from uuid import UUID
 
 from sqlalchemy import Date, ForeignKey
@@ -15,3 +15,20 @@ class DailyEnergyState(Base, UUIDMixin, CreatedAtMixin):
     )
     energy: Mapped[float] = mapped_column()
     date: Mapped["date"] = mapped_column(Date)
+
+
+class EnergySample(Base):
+    __tablename__ = "energy_samples"
+
+    controller_id: Mapped[UUID] = mapped_column(
+        ForeignKey("controllers.id", ondelete="CASCADE"), primary_key=True
+    )
+    # start of the minute the readings were received in
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)
+    # sums rather than averages, so partial buckets merge on conflict
+    samples: Mapped[int] = mapped_column()
+    power_sum: Mapped[float] = mapped_column()
+    power_max: Mapped[float] = mapped_column()
+    voltage_sum: Mapped[float] = mapped_column()
+    current_sum: Mapped[float] = mapped_column()
+    energy_total: Mapped[float] = mapped_column()
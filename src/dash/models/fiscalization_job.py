@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from dash.models.base import Base, TimestampMixin, UUIDMixin
+from dash.models.payment import Payment
+
+
+class FiscalizationJobStatus(StrEnum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    DEAD = "DEAD"
+
+
+class FiscalizationJob(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "fiscalization_jobs"
+
+    payment_id: Mapped[UUID] = mapped_column(
+        ForeignKey("payments.id", ondelete="CASCADE"), unique=True
+    )
+    status: Mapped[FiscalizationJobStatus] = mapped_column(
+        default=FiscalizationJobStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    run_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), default=func.now()
+    )
+    last_error: Mapped[str | None] = mapped_column()
+
+    # orders the job insert after the payment it references
+    payment: Mapped[Payment] = relationship()
+
+    __table_args__ = (
+        Index(
+            "ix_fiscalization_jobs_pending_run_at",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
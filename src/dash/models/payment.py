@@ -3,7 +3,7 @@ from enum import StrEnum
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dash.models.base import Base, TimestampMixin, UUIDMixin
@@ -55,6 +55,14 @@ class Payment(Base, UUIDMixin, TimestampMixin):
     extra: Mapped[dict[str, Any] | None] = mapped_column()
     masked_pan: Mapped[str | None] = mapped_column()
 
+    __table_args__ = (
+        Index("ix_payments_created_at", "created_at"),
+        Index(
+            "ix_payments_controller_id_created_at", "controller_id", "created_at", "id"
+        ),
+        Index("ix_payments_location_id_created_at", "location_id", "created_at", "id"),
+    )
+
     @property
     def receipt_url(self) -> str | None:
         if not self.receipt_id:
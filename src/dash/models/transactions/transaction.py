@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from dash.models.base import Base, CreatedAtMixin, UUIDMixin
@@ -56,4 +56,17 @@ class Transaction(Base, UUIDMixin, CreatedAtMixin):
             created_at_controller,
             name="uix_transaction_controller_transaction_id",
         ),
+        Index("ix_transactions_created_at", "created_at"),
+        Index(
+            "ix_transactions_controller_id_created_at",
+            "controller_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_transactions_location_id_created_at",
+            "location_id",
+            "created_at",
+            "id",
+        ),
     )
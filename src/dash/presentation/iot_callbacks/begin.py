@@ -1,11 +1,10 @@
 from datetime import datetime
 from typing import Any
 
-from aiogram import Bot
 from dishka import FromDishka
 from structlog import get_logger
 
-from dash.infrastructure.rate_limiter import RateLimiter
+from dash.infrastructure.notifications import TgNotificationOutbox
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.presentation.iot_callbacks.common.di_injector import inject, request_scope
 
@@ -18,8 +17,7 @@ async def begin_callback(
     device_id: str,
     data: dict[str, Any],
     controller_repository: FromDishka[ControllerRepository],
-    bot: FromDishka[Bot],
-    rate_limiter: FromDishka[RateLimiter],
+    notification_outbox: FromDishka[TgNotificationOutbox],
 ) -> None:
     logger.info("begin received", device_id=device_id)
     controller = await controller_repository.get_by_device_id(device_id)
@@ -31,8 +29,6 @@ async def begin_callback(
     await controller_repository.commit()
 
     if controller.company and (chat_id := controller.company.tg_chat_id):
-        await rate_limiter.enforce_with_retry("tg_send")
-        await bot.send_message(
-            chat_id=chat_id,
-            text=f"Пристрій {controller.name} ({controller.device_id}) запущено 🤖",
+        await notification_outbox.enqueue(
+            chat_id, f"Пристрій {controller.name} ({controller.device_id}) запущено 🤖"
         )
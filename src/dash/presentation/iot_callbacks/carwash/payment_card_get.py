@@ -5,15 +5,15 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.carwash.client import CarwashIoTClient
-from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.customer import CustomerRepository
 from dash.infrastructure.storages.carwash_session import CarwashSessionStorage
 from dash.presentation.iot_callbacks.common.di_injector import (
+    claimed_request_scope,
     datetime_recipe,
     inject,
     parse_payload,
-    request_scope,
 )
 from dash.presentation.iot_callbacks.common.utils import parse_card_uid
 
@@ -40,19 +40,19 @@ carwash_payment_card_get_retort = Retort(
 
 @tracer.wrap()
 @parse_payload(retort=carwash_payment_card_get_retort)
-@request_scope
+@claimed_request_scope
 @inject
 async def carwash_payment_card_get_callback(
     device_id: str,
     data: CarwashPaymentCardGetRequest,
     customer_repository: FromDishka[CustomerRepository],
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     carwash_client: FromDishka[CarwashIoTClient],
     session_storage: FromDishka[CarwashSessionStorage],
 ) -> None:
     dict_data = carwash_payment_card_get_retort.dump(data)
 
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     if controller is None:
         logger.info(
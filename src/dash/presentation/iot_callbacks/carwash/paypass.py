@@ -6,10 +6,14 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
-from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.payment import PaymentRepository
+from dash.models.controllers.carwash import CarwashController
 from dash.models.payment import PaymentGatewayType, PaymentStatus, PaymentType
-from dash.presentation.iot_callbacks.common.di_injector import inject, request_scope
+from dash.presentation.iot_callbacks.common.di_injector import (
+    claimed_request_scope,
+    inject,
+)
 from dash.presentation.iot_callbacks.common.di_injector import (
     datetime_recipe,
     parse_payload,
@@ -57,20 +61,24 @@ carwash_paypass_retort = Retort(
     ]
 )
 
+dump_paypass_extra = Retort().get_dumper(CarwashPaypassCallbackPayload)
+
 
 @tracer.wrap()
 @parse_payload(retort=carwash_paypass_retort)
-@request_scope
+@claimed_request_scope
 @inject
 async def carwash_paypass_callback(
     device_id: str,
     data: CarwashPaypassCallbackPayload,
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     payment_repository: FromDishka[PaymentRepository],
     payment_helper: FromDishka[PaymentHelper],
     carwash_client: FromDishka[CarwashIoTClient],
 ) -> None:
-    controller = await controller_repository.get_carwash_by_device_id(device_id)
+    controller = await controller_cache.get_typed_by_device_id(
+        device_id, CarwashController
+    )
 
     if controller is None:
         logger.info(
@@ -102,7 +110,7 @@ async def carwash_paypass_callback(
         gateway_type=PaymentGatewayType.PAYPASS,
         invoice_id=data.invoice,
         masked_pan=unify_pan_mask(data.pan),
-        extra=Retort().dump(data),
+        extra=dump_paypass_extra(data),
     )
     if controller.checkbox_active:
         await payment_helper.fiscalize(controller, payment)
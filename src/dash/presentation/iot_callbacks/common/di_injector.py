@@ -1,16 +1,19 @@
 import functools
+import hashlib
 import inspect
 from collections.abc import Callable
 from datetime import datetime
 from inspect import Parameter
-from typing import Awaitable, ParamSpec, TypeVar, get_type_hints
-from unittest.mock import Mock
+from typing import Awaitable, Literal, ParamSpec, TypeVar, get_type_hints
 
 from adaptix import Retort, dumper, loader
 from dishka import AsyncContainer, Scope
 from dishka.integrations.base import wrap_injection
 from fastapi import Request
 
+from dash.infrastructure.auth.background_request import background_request
+from dash.infrastructure.cluster import ClusterMembership
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
@@ -39,28 +42,46 @@ def parse_payload(retort: Retort | None = None):
         retort = default_retort
 
     def _parse_payload(func):
+        payload_type = get_arg_type(func, 1)
+        load = retort.get_loader(payload_type)
+
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            tp = get_arg_type(func, 1)
-
-            data = retort.load(args[1], tp)
-            args = list(args)
-            args[1] = data
-
+            args = (args[0], load(args[1]), *args[2:])
             return await func(*args, **kwargs)
 
+        wrapper.payload_type = payload_type
+        wrapper.retort = retort
         return wrapper
 
     return _parse_payload
 
 
-def request_scope(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+def _scoped(
+    func: Callable[P, Awaitable[T]],
+    routing: Literal["partitioned", "claimed", "everywhere"],
+) -> Callable[P, Awaitable[T | None]]:
     @functools.wraps(func)
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T | None:
         di_container: AsyncContainer = kwargs["di_container"]  # type: ignore
         if di_container.scope is Scope.APP:
+            # every replica receives every message
+            if routing == "partitioned":
+                # only the device owner handles it
+                membership = await di_container.get(ClusterMembership)
+                if not membership.owns(args[0]):  # type: ignore
+                    return None
+            elif routing == "claimed":
+                # the first replica to claim it handles it
+                membership = await di_container.get(ClusterMembership)
+                digest = hashlib.blake2b(
+                    repr(args[1]).encode(), digest_size=16
+                ).hexdigest()
+                if not await membership.claim(f"{func.__name__}:{args[0]}:{digest}"):
+                    return None
+
             async with di_container(
-                scope=Scope.REQUEST, context={Request: Mock(spec=Request)}
+                scope=Scope.REQUEST, context={Request: background_request}
             ) as container:
                 kwargs["di_container"] = container
                 return await func(*args, **kwargs)
@@ -70,6 +91,31 @@ def request_scope(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
     return wrapper
 
 
+def request_scope(
+    func: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T | None]]:
+    # While the replicas disagree on the members, for up to a heartbeat after
+    # one joins or leaves, a partitioned message may be dropped by all of them.
+    # Fine for state reports that the next one replaces, not for money
+    return _scoped(func, routing="partitioned")
+
+
+def idempotent_request_scope(
+    func: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T | None]]:
+    # for callbacks that are safe to handle on every replica, such as sales
+    # deduplicated by the controller transaction id
+    return _scoped(func, routing="everywhere")
+
+
+def claimed_request_scope(
+    func: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T | None]]:
+    # for callbacks that must run once and can't be lost, such as card
+    # requests the device waits on, at the cost of a redis call per message
+    return _scoped(func, routing="claimed")
+
+
 def inject(func: Callable[P, T]) -> Callable[P, T]:
     return wrap_injection(
         func=func,
@@ -7,7 +7,7 @@ from dishka import FromDishka
 from structlog import get_logger
 
 from dash.infrastructure.acquiring.checkbox import CheckboxService
-from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.presentation.iot_callbacks.common.di_injector import (
     datetime_recipe,
@@ -36,12 +36,12 @@ denomination_callback_retort = Retort(recipe=[*datetime_recipe])
 async def denomination_callback(
     device_id: str,
     data: DenominationCallbackPayload,
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     payment_repository: FromDishka[PaymentRepository],
     checkbox_service: FromDishka[CheckboxService],
 ) -> None:
     dict_data = denomination_callback_retort.dump(data)
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     logger.info(
         "Denomination request received",
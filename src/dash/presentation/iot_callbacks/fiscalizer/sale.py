@@ -6,17 +6,18 @@ from adaptix import Retort, name_mapping
 from ddtrace.trace import tracer
 from dishka import FromDishka
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.fiscalizer.client import FiscalizerIoTClient
-from dash.infrastructure.repositories.controller import ControllerRepository
-from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.sale_ingestor import SaleIngestor
 from dash.models import FiscalizerTransaction
-from dash.models.payment import PaymentType, PaymentStatus
+from dash.models.controllers.fiscalizer import FiscalizerController
+from dash.models.payment import PaymentStatus, PaymentType
 from dash.models.transactions.transaction import TransactionType
 from dash.presentation.iot_callbacks.common.di_injector import (
     datetime_recipe,
+    idempotent_request_scope,
     inject,
     parse_payload,
-    request_scope,
 )
 from dash.services.common.payment_helper import PaymentHelper
 
@@ -52,18 +53,20 @@ fiscalizer_sale_callback_retort = Retort(
 
 @tracer.wrap()
 @parse_payload(retort=fiscalizer_sale_callback_retort)
-@request_scope
+@idempotent_request_scope
 @inject
 async def fiscalizer_sale_callback(
     device_id: str,
     data: FiscalizerSaleCallbackPayload,
-    controller_repository: FromDishka[ControllerRepository],
-    transaction_repository: FromDishka[TransactionRepository],
+    controller_cache: FromDishka[ControllerCache],
+    sale_ingestor: FromDishka[SaleIngestor],
     fiscalizer_client: FromDishka[FiscalizerIoTClient],
     payment_helper: FromDishka[PaymentHelper],
 ) -> None:
     dict_data = fiscalizer_sale_callback_retort.dump(data)
-    controller = await controller_repository.get_fiscalizer_by_device_id(device_id)
+    controller = await controller_cache.get_typed_by_device_id(
+        device_id, FiscalizerController
+    )
 
     if controller is None:
         logger.info(
@@ -95,7 +98,19 @@ async def fiscalizer_sale_callback(
         created_at_controller=data.created or data.sended,
     )
 
-    was_inserted = await transaction_repository.insert_with_conflict_ignore(transaction)
+    payment = None
+    if data.add_bill + data.add_coin > 0:
+        payment = payment_helper.create_payment(
+            controller_id=controller.id,
+            location_id=controller.location_id,
+            amount=(data.add_bill + data.add_coin) * 100,
+            payment_type=PaymentType.CASH,
+            status=PaymentStatus.COMPLETED,
+        )
+        if controller.checkbox_active and controller.fiscalize_cash:
+            payment_helper.assign_receipt(payment)
+
+    was_inserted = await sale_ingestor.submit(transaction, payment)
 
     if not was_inserted:
         logger.info(
@@ -108,21 +123,6 @@ async def fiscalizer_sale_callback(
         await fiscalizer_client.sale_ack(device_id, data.id)
         return
 
-    if data.add_bill + data.add_coin > 0:
-        payment = payment_helper.create_payment(
-            controller_id=controller.id,
-            location_id=controller.location_id,
-            transaction_id=transaction.id,
-            amount=(data.add_bill + data.add_coin) * 100,
-            payment_type=PaymentType.CASH,
-            status=PaymentStatus.COMPLETED,
-        )
-        if controller.checkbox_active and controller.fiscalize_cash:
-            await payment_helper.fiscalize(controller, payment)
-
-        payment_helper.save(payment)
-
-    await transaction_repository.commit()
     await fiscalizer_client.sale_ack(device_id, data.id)
     logger.info(
         "Sale ack sent",
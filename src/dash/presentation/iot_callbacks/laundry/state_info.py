@@ -5,6 +5,7 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.controllers_online_monitor import ControllersOnlineMonitor
 from dash.infrastructure.iot.laundry.client import LaundryIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.storages.iot import IoTStorage
@@ -24,6 +25,7 @@ async def laundry_state_info_callback(
     iot_storage: FromDishka[IoTStorage],
     laundry_client: FromDishka[LaundryIoTClient],
     laundry_service: FromDishka[LaundryService],
+    online_monitor: FromDishka[ControllersOnlineMonitor],
 ) -> None:
     controller = await controller_repository.get_laundry_by_device_id(device_id)
 
@@ -62,8 +64,10 @@ async def laundry_state_info_callback(
     elif not (door or btn or led):
         await laundry_service.handle_door_unlocked(controller.id)
 
-    cur_state["created"] = datetime.now(UTC).isoformat()
+    created = datetime.now(UTC)
+    cur_state["created"] = created.isoformat()
     await iot_storage.set_state(cur_state, controller.id)
+    await online_monitor.on_state(controller, created)
 
 
 def parse_state(source: dict[str, Any], key: str, target_id: int) -> bool:
@@ -4,6 +4,8 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
+from dash.infrastructure.controllers_online_monitor import ControllersOnlineMonitor
 from dash.infrastructure.storages.iot import IoTStorage
 from dash.presentation.iot_callbacks.common.di_injector import inject, request_scope
 
@@ -17,12 +19,19 @@ async def sys_connect_callback(
     deivce_id: str,
     data: dict[str, Any],
     iot_storage: FromDishka[IoTStorage],
+    online_monitor: FromDishka[ControllersOnlineMonitor],
+    controller_cache: FromDishka[ControllerCache],
 ) -> None:
     real_device_id = data["username"]
 
     logger.info("$SYS connection established", deivce_id=real_device_id, data=data)
 
-    await iot_storage.set_broker_online_status(True, real_device_id)
+    controller = await controller_cache.get_by_device_id(real_device_id)
+    if controller is None:
+        return
+
+    await iot_storage.set_broker_online_status(True, controller.id)
+    await online_monitor.on_broker_status(real_device_id)
 
 
 @tracer.wrap()
@@ -32,9 +41,16 @@ async def sys_disconnect_callback(
     deivce_id: str,
     data: dict[str, Any],
     iot_storage: FromDishka[IoTStorage],
+    online_monitor: FromDishka[ControllersOnlineMonitor],
+    controller_cache: FromDishka[ControllerCache],
 ) -> None:
     real_device_id = data["username"]
 
     logger.info("$SYS connection lost", deivce_id=deivce_id, data=data)
 
-    await iot_storage.set_broker_online_status(False, real_device_id)
+    controller = await controller_cache.get_by_device_id(real_device_id)
+    if controller is None:
+        return
+
+    await iot_storage.set_broker_online_status(False, controller.id)
+    await online_monitor.on_broker_status(real_device_id)
@@ -5,6 +5,7 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.energy_recorder import EnergyRecorder
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.energy_state import EnergyStateRepository
 from dash.infrastructure.storages.iot import IoTStorage
@@ -54,6 +55,7 @@ async def tasmota_callback(
     controller_repository: FromDishka[ControllerRepository],
     energy_repository: FromDishka[EnergyStateRepository],
     iot_storage: FromDishka[IoTStorage],
+    energy_recorder: FromDishka[EnergyRecorder],
 ) -> None:
     controller = await controller_repository.get_by_tasmota_id(device_id)
 
@@ -70,15 +72,19 @@ async def tasmota_callback(
         controller_id=controller.id,
     )
 
+    energy_recorder.add(controller.id, data)
+
     day_ago_date = (data.created - timedelta(days=1)).date()
 
-    if not await energy_repository.exists_by_date(day_ago_date, controller.id):
-        energy_state = DailyEnergyState(
-            controller_id=controller.id,
-            energy=data.energy_yesterday,
-            date=day_ago_date,
-        )
-        energy_repository.add(energy_state)
-        await energy_repository.commit()
+    if not energy_recorder.is_day_recorded(controller.id, day_ago_date):
+        if not await energy_repository.exists_by_date(day_ago_date, controller.id):
+            energy_state = DailyEnergyState(
+                controller_id=controller.id,
+                energy=data.energy_yesterday,
+                date=day_ago_date,
+            )
+            energy_repository.add(energy_state)
+            await energy_repository.commit()
+        energy_recorder.mark_day_recorded(controller.id, day_ago_date)
 
     await iot_storage.set_energy_state(default_retort.dump(data), controller.id)
@@ -1,10 +1,12 @@
+from datetime import datetime
 from typing import Any
 
 from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
-from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.controller_cache import ControllerCache
+from dash.infrastructure.controllers_online_monitor import ControllersOnlineMonitor
 from dash.infrastructure.storages.iot import IoTStorage
 from dash.models.controllers.controller import ControllerType
 from dash.presentation.iot_callbacks.common.di_injector import inject, request_scope
@@ -19,10 +21,11 @@ logger = get_logger()
 async def state_info_callback(
     device_id: str,
     data: dict[str, Any],
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     iot_storage: FromDishka[IoTStorage],
+    online_monitor: FromDishka[ControllersOnlineMonitor],
 ) -> None:
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     if controller is None:
         logger.info(
@@ -49,3 +52,8 @@ async def state_info_callback(
         data["billState"] = parse_bill_state(data["billState"])
 
     await iot_storage.set_state(data, controller.id)
+
+    created = data.get("created")
+    await online_monitor.on_state(
+        controller, datetime.fromisoformat(created) if created else None
+    )
@@ -5,14 +5,14 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.vacuum.client import VacuumIoTClient
-from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.customer import CustomerRepository
 from dash.presentation.iot_callbacks.common.di_injector import (
+    claimed_request_scope,
     datetime_recipe,
     inject,
     parse_payload,
-    request_scope,
 )
 from dash.presentation.iot_callbacks.common.utils import parse_card_uid
 
@@ -39,18 +39,18 @@ vacuum_payment_card_get_retort = Retort(
 
 @tracer.wrap()
 @parse_payload(retort=vacuum_payment_card_get_retort)
-@request_scope
+@claimed_request_scope
 @inject
 async def vacuum_payment_card_get_callback(
     device_id: str,
     data: VacuumPaymentCardGetRequest,
     customer_repository: FromDishka[CustomerRepository],
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     vacuum_client: FromDishka[VacuumIoTClient],
 ) -> None:
     dict_data = vacuum_payment_card_get_retort.dump(data)
 
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     if controller is None:
         logger.info(
@@ -6,15 +6,15 @@ from ddtrace.trace import tracer
 from dishka import FromDishka
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.wsm.client import WsmIoTClient
-from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.encashment import EncashmentRepository
 from dash.models.encashment import Encashment
 from dash.presentation.iot_callbacks.common.di_injector import (
     datetime_recipe,
+    idempotent_request_scope,
     inject,
     parse_payload,
-    request_scope,
 )
 
 logger = get_logger()
@@ -35,17 +35,17 @@ wsm_encashment_callback_retort = Retort(recipe=[*datetime_recipe])
 
 @tracer.wrap()
 @parse_payload(retort=wsm_encashment_callback_retort)
-@request_scope
+@idempotent_request_scope
 @inject
 async def wsm_encashment_callback(
     device_id: str,
     data: WsmEncashmentCallbackPayload,
-    controller_repository: FromDishka[ControllerRepository],
+    controller_cache: FromDishka[ControllerCache],
     wsm_client: FromDishka[WsmIoTClient],
     encashment_repository: FromDishka[EncashmentRepository],
 ) -> None:
     dict_data = wsm_encashment_callback_retort.dump(data)
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     if controller is None:
         logger.info(
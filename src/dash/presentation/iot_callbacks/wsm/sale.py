@@ -1,24 +1,23 @@
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from decimal import Decimal
+from datetime import datetime
 
 import structlog
 from adaptix import Retort, name_mapping
 from ddtrace.trace import tracer
 from dishka import FromDishka
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.wsm.client import WsmIoTClient
-from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.customer import CustomerRepository
-from dash.infrastructure.repositories.transaction import TransactionRepository
-from dash.models.payment import PaymentType, PaymentStatus
+from dash.infrastructure.sale_ingestor import SaleIngestor
+from dash.models.payment import PaymentStatus, PaymentType
 from dash.models.transactions.transaction import TransactionType
 from dash.models.transactions.water_vending import WsmTransaction
 from dash.presentation.iot_callbacks.common.di_injector import (
     datetime_recipe,
+    idempotent_request_scope,
     inject,
     parse_payload,
-    request_scope,
 )
 from dash.presentation.iot_callbacks.common.utils import parse_card_uid
 from dash.services.common.payment_helper import PaymentHelper
@@ -71,19 +70,19 @@ wsm_sale_callback_retort = Retort(
 
 @tracer.wrap()
 @parse_payload(retort=wsm_sale_callback_retort)
-@request_scope
+@idempotent_request_scope
 @inject
 async def wsm_sale_callback(
     device_id: str,
     data: WsmSaleCallbackPayload,
-    controller_repository: FromDishka[ControllerRepository],
-    transaction_repository: FromDishka[TransactionRepository],
+    controller_cache: FromDishka[ControllerCache],
+    sale_ingestor: FromDishka[SaleIngestor],
     customer_repository: FromDishka[CustomerRepository],
     wsm_client: FromDishka[WsmIoTClient],
     payment_helper: FromDishka[PaymentHelper],
 ) -> None:
     dict_data = wsm_sale_callback_retort.dump(data)
-    controller = await controller_repository.get_by_device_id(device_id)
+    controller = await controller_cache.get_by_device_id(device_id)
 
     if controller is None:
         logger.info(
@@ -119,8 +118,6 @@ async def wsm_sale_callback(
         )
         if customer is not None:
             card_amount = data.card_balance_in - data.card_balance_out
-            customer.balance -= Decimal(card_amount) / 100
-            customer.last_balance_update = datetime.now(UTC)
             customer_id = customer.id
         else:
             logger.error(
@@ -155,7 +152,19 @@ async def wsm_sale_callback(
         card_uid=data.card_uid,
     )
 
-    was_inserted = await transaction_repository.insert_with_conflict_ignore(transaction)
+    payment = None
+    if data.add_bill + data.add_coin > 0:
+        payment = payment_helper.create_payment(
+            controller_id=controller.id,
+            location_id=controller.location_id,
+            amount=data.add_bill + data.add_coin,
+            payment_type=PaymentType.CASH,
+            status=PaymentStatus.COMPLETED,
+        )
+        if controller.checkbox_active and controller.fiscalize_cash:
+            payment_helper.assign_receipt(payment)
+
+    was_inserted = await sale_ingestor.submit(transaction, payment)
 
     if not was_inserted:
         logger.info(
@@ -168,21 +177,6 @@ async def wsm_sale_callback(
         await wsm_client.sale_ack(device_id, data.id)
         return
 
-    if data.add_bill + data.add_coin > 0:
-        payment = payment_helper.create_payment(
-            controller_id=controller.id,
-            location_id=controller.location_id,
-            transaction_id=transaction.id,
-            amount=data.add_bill + data.add_coin,
-            payment_type=PaymentType.CASH,
-            status=PaymentStatus.COMPLETED,
-        )
-        if controller.checkbox_active and controller.fiscalize_cash:
-            await payment_helper.fiscalize(controller, payment)
-
-        payment_helper.save(payment)
-
-    await transaction_repository.commit()
     await wsm_client.sale_ack(device_id, data.id)
 
     logger.info(
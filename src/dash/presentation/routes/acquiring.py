@@ -1,6 +1,6 @@
 import base64
 import json
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, Literal
 
 from dishka import FromDishka
@@ -15,6 +15,10 @@ from dash.infrastructure.acquiring.liqpay import (
 from dash.infrastructure.acquiring.monopay import (
     MonopayGateway,
 )
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.acquiring_webhook import (
+    AcquiringWebhookRepository,
+)
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.infrastructure.storages.acquiring import AcquiringStorage
@@ -25,9 +29,9 @@ from dash.services.common.errors.controller import (
     InsufficientDepositAmountError,
     UnsupportedPaymentGatewayTypeError,
 )
-from dash.services.common.utils import unify_pan_mask
 from dash.services.iot.base import CreateInvoiceRequest, CreateInvoiceResponse
 from dash.services.iot.factory import IoTServiceFactory
+from dash.services.payment.webhook_worker import AcquiringWebhookWorker
 
 acquiring_router = APIRouter(
     prefix="/acquiring", tags=["ACQUIRING"], route_class=DishkaRoute
@@ -65,10 +69,9 @@ async def monopay_invoice(
 async def monopay_webhook(
     request: Request,
     monopay_service: FromDishka[MonopayGateway],
-    payment_repository: FromDishka[PaymentRepository],
-    controller_repository: FromDishka[ControllerRepository],
     storage: FromDishka[AcquiringStorage],
-    factory: FromDishka[IoTServiceFactory],
+    webhook_repository: FromDishka[AcquiringWebhookRepository],
+    webhook_worker: FromDishka[AcquiringWebhookWorker],
 ) -> Any:
     bytes_data = await request.body()
     signature = request.headers.get("X-Sign")
@@ -88,38 +91,39 @@ async def monopay_webhook(
         sign=signature, body=bytes_data, invoice_id=invoice_id, token=token
     )
 
-    current_modified_date = datetime.fromisoformat(dict_data["modifiedDate"])
-    last_modified_date = await storage.get_last_modified_date(invoice_id)
-
-    if last_modified_date and current_modified_date < last_modified_date:
-        return
-
-    await storage.set_last_modified_date(invoice_id, current_modified_date)
-
-    payment = await payment_repository.get_by_invoice_id(invoice_id)
-    if not payment or not payment.controller_id:
-        return
-
-    controller = await controller_repository.get(payment.controller_id)
-    if not controller:
-        return
+    # processing is left to the worker, monobank only waits for the ack
+    await enqueue_webhook(
+        webhook_repository,
+        webhook_worker,
+        gateway_type=PaymentGatewayType.MONOPAY,
+        invoice_id=invoice_id,
+        payment_status=dict_data["status"],
+        modified_at=datetime.fromisoformat(dict_data["modifiedDate"]),
+        payload=dict_data,
+    )
 
-    service = factory.get(controller.type)
-    status = dict_data["status"]
 
-    if pan := await monopay_service.request_pan(invoice_id, controller):
-        payment.masked_pan = unify_pan_mask(pan)
+async def enqueue_webhook(
+    webhook_repository: AcquiringWebhookRepository,
+    webhook_worker: AcquiringWebhookWorker,
+    gateway_type: PaymentGatewayType,
+    invoice_id: str,
+    payment_status: str,
+    modified_at: datetime,
+    payload: dict[str, Any],
+) -> None:
+    created = await webhook_repository.enqueue(
+        gateway_type, invoice_id, payment_status, modified_at, payload
+    )
+    await webhook_repository.commit()
 
-    if status == "hold":
-        await service.process_hold_status(payment)
-    elif status == "processing":
-        await service.process_processing_status(payment)
-    elif status == "success":
-        await service.process_success_status(payment)
-    elif status == "reversed":
-        await service.process_reversed_status(payment)
-    elif status == "failure":
-        await service.process_failed_status(payment, dict_data["failureReason"])
+    metrics.incr(
+        "acquiring_webhook.received",
+        gateway=gateway_type,
+        result="queued" if created else "duplicate",
+    )
+    if created:
+        webhook_worker.notify()
 
 
 class CreateLiqpayInvoiceRequest(CreateInvoiceRequest):
@@ -153,7 +157,8 @@ async def liqpay_webhook(
     liqpay_service: FromDishka[LiqpayGateway],
     payment_repository: FromDishka[PaymentRepository],
     controller_repository: FromDishka[ControllerRepository],
-    factory: FromDishka[IoTServiceFactory],
+    webhook_repository: FromDishka[AcquiringWebhookRepository],
+    webhook_worker: FromDishka[AcquiringWebhookWorker],
     data: str = Form(...),
     signature: str = Form(...),
 ) -> Any:
@@ -178,19 +183,20 @@ async def liqpay_webhook(
     ):
         return
 
-    status = dict_data["status"]
-    service = factory.get(controller.type)
+    # liqpay timestamps are in milliseconds
+    timestamp = dict_data.get("end_date") or dict_data.get("create_date")
+    modified_at = (
+        datetime.fromtimestamp(timestamp / 1000, UTC)
+        if timestamp
+        else datetime.now(UTC)
+    )
 
-    if pan := dict_data.get("sender_card_mask2"):
-        payment.masked_pan = unify_pan_mask(pan)
-
-    if status == "hold_wait":
-        await service.process_hold_status(payment)
-    elif status == "processing":
-        await service.process_processing_status(payment)
-    elif status in ("success", "wait_compensation"):
-        await service.process_success_status(payment)
-    elif status == "reversed":
-        await service.process_reversed_status(payment)
-    elif status in ("failed", "error"):
-        await service.process_failed_status(payment, dict_data["err_description"])
+    await enqueue_webhook(
+        webhook_repository,
+        webhook_worker,
+        gateway_type=PaymentGatewayType.LIQPAY,
+        invoice_id=invoice_id,
+        payment_status=dict_data["status"],
+        modified_at=modified_at,
+        payload=dict_data,
+    )
@@ -94,7 +94,7 @@ class UserScheme(BaseModel):
     ),
 )
 async def me(idp: FromDishka[IdProvider]) -> UserScheme:
-    user = await idp.authorize()
+    user = await idp.get_user()
     return UserScheme.model_validate(user, from_attributes=True)
 
 
@@ -0,0 +1,49 @@
+from dishka import FromDishka
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter, Depends
+
+from dash.presentation.bearer import bearer_scheme
+from dash.presentation.response_builder import build_responses
+from dash.services.bulk_operation.dto import (
+    CreateBulkOperationRequest,
+    CreateBulkOperationResponse,
+    ReadBulkOperationRequest,
+    ReadBulkOperationResponse,
+)
+from dash.services.bulk_operation.service import BulkOperationService
+from dash.services.common.errors.bulk_operation import BulkOperationNotFoundError
+from dash.services.common.errors.controller import ControllerNotFoundError
+
+bulk_operation_router = APIRouter(
+    prefix="/bulk-operations",
+    tags=["BULK OPERATIONS"],
+    route_class=DishkaRoute,
+    dependencies=[bearer_scheme],
+)
+
+
+@bulk_operation_router.post(
+    "",
+    status_code=202,
+    responses=build_responses(
+        (404, (ControllerNotFoundError,)),
+    ),
+)
+async def create_bulk_operation(
+    service: FromDishka[BulkOperationService],
+    data: CreateBulkOperationRequest,
+) -> CreateBulkOperationResponse:
+    return await service.create_bulk_operation(data)
+
+
+@bulk_operation_router.get(
+    "/{operation_id}",
+    responses=build_responses(
+        (404, (BulkOperationNotFoundError,)),
+    ),
+)
+async def read_bulk_operation(
+    service: FromDishka[BulkOperationService],
+    data: ReadBulkOperationRequest = Depends(),
+) -> ReadBulkOperationResponse:
+    return await service.read_bulk_operation(data)
@@ -39,10 +39,14 @@ from dash.services.controller.dto import (
     ReadControllerResponse,
     ReadEncashmentListRequest,
     ReadEncashmentListResponse,
+    ReadEnergySamplesRequest,
+    ReadEnergySamplesResponse,
     ReadPublicControllerListRequest,
     ReadPublicControllerListResponse,
     ReadPublicControllerRequest,
     ReadPublicControllerResponse,
+    ReadStateHistoryRequest,
+    ReadStateHistoryResponse,
     SetMinDepositAmountRequest,
     SetupTasmotaRequest,
 )
@@ -241,6 +245,30 @@ async def read_tasmota_stats(
     return await controller_service.read_energy_stats(data)
 
 
+@controller_router.get(
+    "/{controller_id}/tasmota/samples",
+    dependencies=[bearer_scheme],
+    responses=build_responses((404, (ControllerNotFoundError,))),
+)
+async def read_tasmota_samples(
+    controller_service: FromDishka[ControllerService],
+    data: ReadEnergySamplesRequest = Depends(),
+) -> ReadEnergySamplesResponse:
+    return await controller_service.read_energy_samples(data)
+
+
+@controller_router.get(
+    "/{controller_id}/state-history",
+    dependencies=[bearer_scheme],
+    responses=build_responses((404, (ControllerNotFoundError,))),
+)
+async def read_state_history(
+    controller_service: FromDishka[ControllerService],
+    data: ReadStateHistoryRequest = Depends(),
+) -> ReadStateHistoryResponse:
+    return await controller_service.read_state_history(data)
+
+
 @dataclass
 class MinDepositAmountDTO:
     amount: int
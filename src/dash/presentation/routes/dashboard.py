@@ -1,11 +1,15 @@
+from typing import AsyncIterator
+
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from dash.presentation.bearer import bearer_scheme
 from dash.services.dashboard.dto import (
     ReadDashboardStatsRequest,
     ReadDashboardStatsResponse,
+    ReadLiveEventsRequest,
 )
 from dash.services.dashboard.service import DashboardService
 
@@ -23,3 +27,22 @@ async def read_dashboard_stats(
     data: ReadDashboardStatsRequest = Depends(),
 ) -> ReadDashboardStatsResponse:
     return await dashboard_service.read_dashboard_stats(data)
+
+
+@dashboard_router.get("/live", response_class=StreamingResponse)
+async def read_live_events(
+    dashboard_service: FromDishka[DashboardService],
+    data: ReadLiveEventsRequest = Depends(),
+) -> StreamingResponse:
+    events = await dashboard_service.subscribe_live_events(data)
+
+    async def stream() -> AsyncIterator[bytes]:
+        async for event in events:
+            # a comment line keeps proxies from closing an idle stream
+            yield b"data: " + event + b"\n\n" if event else b": ping\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,21 @@
+from dishka import FromDishka
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter
+
+from dash.presentation.bearer import bearer_scheme
+from dash.services.metrics.dto import ReadMetricsResponse
+from dash.services.metrics.service import MetricsService
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["METRICS"],
+    route_class=DishkaRoute,
+    dependencies=[bearer_scheme],
+)
+
+
+@metrics_router.get("")
+async def read_metrics(
+    metrics_service: FromDishka[MetricsService],
+) -> ReadMetricsResponse:
+    return await metrics_service.read_metrics()
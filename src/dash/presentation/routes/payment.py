@@ -1,9 +1,12 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from dash.presentation.bearer import bearer_scheme
+from dash.services.common.export import EXPORT_MEDIA_TYPES
 from dash.services.payment.dto import (
+    ExportPaymentListRequest,
     ReadPaymentListRequest,
     ReadPaymentListResponse,
     ReadPublicPaymentListRequest,
@@ -26,6 +29,23 @@ async def read_payments(
     return await payment_service.read_payments(data)
 
 
+@payment_router.get(
+    "/export", dependencies=[bearer_scheme], response_class=StreamingResponse
+)
+async def export_payments(
+    payment_service: FromDishka[PaymentService],
+    data: ExportPaymentListRequest = Depends(),
+) -> StreamingResponse:
+    content = await payment_service.export_payments(data)
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[data.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="payments.{data.format}"'
+        },
+    )
+
+
 @payment_router.get("/public")
 async def read_payments_public(
     payment_service: FromDishka[PaymentService],
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from dash.presentation.routes.acquiring import acquiring_router
 from dash.presentation.routes.auth import auth_router
+from dash.presentation.routes.bulk_operation import bulk_operation_router
 from dash.presentation.routes.carwash_customer import router as customer_carwash_router
 from dash.presentation.routes.companies import company_router
 from dash.presentation.routes.controllers.car_cleaner import car_cleaner_router
@@ -14,6 +15,7 @@ from dash.presentation.routes.controllers.wsm import wsm_router
 from dash.presentation.routes.customer import customer_router
 from dash.presentation.routes.dashboard import dashboard_router
 from dash.presentation.routes.location import location_router
+from dash.presentation.routes.metrics import metrics_router
 from dash.presentation.routes.payment import payment_router
 from dash.presentation.routes.transaction import transaction_router
 from dash.presentation.routes.user import user_router
@@ -38,6 +40,8 @@ root_router.include_router(company_router)
 root_router.include_router(customer_router)
 root_router.include_router(customer_carwash_router)
 root_router.include_router(dashboard_router)
+root_router.include_router(metrics_router)
+root_router.include_router(bulk_operation_router)
 
 
 @root_router.get("/health")
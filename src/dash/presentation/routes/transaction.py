@@ -1,9 +1,12 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from dash.presentation.bearer import bearer_scheme
+from dash.services.common.export import EXPORT_MEDIA_TYPES
 from dash.services.transaction.dto import (
+    ExportTransactionListRequest,
     ReadTransactionListRequest,
     ReadTransactionListResponse,
 )
@@ -23,3 +26,18 @@ async def read_transactions(
     data: ReadTransactionListRequest = Depends(),
 ) -> ReadTransactionListResponse:
     return await transaction_service.read_transactions(data)
+
+
+@transaction_router.get("/export", response_class=StreamingResponse)
+async def export_transactions(
+    transaction_service: FromDishka[TransactionService],
+    data: ExportTransactionListRequest = Depends(),
+) -> StreamingResponse:
+    content = await transaction_service.export_transactions(data)
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[data.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{data.format}"'
+        },
+    )
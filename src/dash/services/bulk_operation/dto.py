@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Any, Self
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import ValidationError as PydanticValidationError
+
+from dash.models.bulk_operation import (
+    BulkOperationItemStatus,
+    BulkOperationStatus,
+    BulkOperationType,
+)
+from dash.models.controllers.controller import ControllerType
+from dash.services.common.errors.base import ValidationError
+from dash.services.iot.car_cleaner.dto import (
+    SetCarCleanerConfigRequest,
+    SetCarCleanerSettingsRequest,
+)
+from dash.services.iot.carwash.dto import (
+    SetCarwashConfigRequest,
+    SetCarwashSettingsRequest,
+)
+from dash.services.iot.dto import SetConfigRequest, SetSettingsRequest
+from dash.services.iot.fiscalizer.dto import (
+    SetFiscalizerConfigRequest,
+    SetFiscalizerSettingsRequest,
+)
+from dash.services.iot.vacuum.dto import (
+    SetVacuumConfigRequest,
+    SetVacuumSettingsRequest,
+)
+from dash.services.iot.wsm.dto import SetWsmConfigRequest, SetWsmSettingsRequest
+
+SET_SETTINGS_REQUESTS: dict[ControllerType, type[SetSettingsRequest]] = {
+    ControllerType.CARWASH: SetCarwashSettingsRequest,
+    ControllerType.WATER_VENDING: SetWsmSettingsRequest,
+    ControllerType.VACUUM: SetVacuumSettingsRequest,
+    ControllerType.FISCALIZER: SetFiscalizerSettingsRequest,
+    ControllerType.CAR_CLEANER: SetCarCleanerSettingsRequest,
+}
+SET_CONFIG_REQUESTS: dict[ControllerType, type[SetConfigRequest]] = {
+    ControllerType.CARWASH: SetCarwashConfigRequest,
+    ControllerType.WATER_VENDING: SetWsmConfigRequest,
+    ControllerType.VACUUM: SetVacuumConfigRequest,
+    ControllerType.FISCALIZER: SetFiscalizerConfigRequest,
+    ControllerType.CAR_CLEANER: SetCarCleanerConfigRequest,
+}
+
+
+class BulkOperationTarget(BaseModel):
+    controller_ids: list[UUID] | None = Field(default=None, min_length=1)
+    location_id: UUID | None = None
+    company_id: UUID | None = None
+    type: ControllerType | None = None
+
+    @model_validator(mode="after")
+    def validate_target(self) -> Self:
+        targets = [self.controller_ids, self.location_id, self.company_id]
+        if sum(target is not None for target in targets) != 1:
+            raise ValidationError(
+                "Exactly one of 'controller_ids', 'location_id' or 'company_id' "
+                "must be set"
+            )
+        return self
+
+
+class CreateBulkOperationRequest(BaseModel):
+    type: BulkOperationType
+    target: BulkOperationTarget
+    payload: dict[str, Any] = {}
+
+    @model_validator(mode="after")
+    def validate_payload(self) -> Self:
+        if self.type is BulkOperationType.SET_SETTINGS:
+            field, requests = "settings", SET_SETTINGS_REQUESTS
+        elif self.type is BulkOperationType.SET_CONFIG:
+            field, requests = "config", SET_CONFIG_REQUESTS
+        else:
+            return self
+
+        if self.target.type is None:
+            raise ValidationError(f"'target.type' is required for {self.type}")
+
+        request = requests.get(self.target.type)
+        if request is None:
+            raise ValidationError(
+                f"{self.type} is not supported for {self.target.type}"
+            )
+
+        # the same model and dump the single controller endpoint uses
+        try:
+            model = request.model_fields[field].annotation.model_validate(  # type: ignore
+                self.payload
+            )
+        except PydanticValidationError as e:
+            raise ValidationError(
+                "Invalid payload: "
+                + "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors()
+                )
+            )
+        self.payload = model.model_dump(exclude_unset=True)
+        return self
+
+
+class CreateBulkOperationResponse(BaseModel):
+    operation_id: UUID
+
+
+class ReadBulkOperationRequest(BaseModel):
+    operation_id: UUID
+
+
+class BulkOperationItemScheme(BaseModel):
+    controller_id: UUID
+    status: BulkOperationItemStatus
+    attempts: int
+    error: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReadBulkOperationResponse(BaseModel):
+    id: UUID
+    type: BulkOperationType
+    status: BulkOperationStatus
+    payload: dict[str, Any]
+    created_at: datetime
+    items: list[BulkOperationItemScheme]
@@ -0,0 +1,258 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import AsyncIterator
+from uuid import UUID
+
+from dishka import AsyncContainer, Scope
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+
+from dash.infrastructure.auth.background_request import background_request
+from dash.infrastructure.controller_cache import ControllerCache
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.bulk_operation import BulkOperationRepository
+from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.models.bulk_operation import (
+    BulkOperation,
+    BulkOperationItem,
+    BulkOperationItemStatus,
+    BulkOperationStatus,
+    BulkOperationType,
+)
+from dash.models.controllers.controller import Controller
+from dash.services.common.errors.controller import (
+    ControllerResponseError,
+    ControllerTimeoutError,
+)
+from dash.services.iot.base import BaseIoTService
+from dash.services.iot.factory import IoTServiceFactory
+
+logger = get_logger()
+
+
+class BulkOperationRunner:
+    CONCURRENCY = 20
+    MAX_ATTEMPTS = 3
+    BASE_BACKOFF = 1
+    LEASE = timedelta(minutes=1)
+    RESUME_INTERVAL = 60
+
+    def __init__(
+        self,
+        di_container: AsyncContainer,
+        sessionmaker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self.di_container = di_container
+        self.sessionmaker = sessionmaker
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._resume_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._resume_task = asyncio.create_task(self._resume_abandoned())
+
+    def submit(self, operation_id: UUID, claimed: bool = False) -> None:
+        task = asyncio.create_task(self._run_safe(operation_id, claimed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(
+            *self._tasks, *filter(None, [self._resume_task]), return_exceptions=True
+        )
+
+    async def _resume_abandoned(self) -> None:
+        while True:
+            try:
+                await self.resume()
+            except Exception:
+                logger.exception("Failed to resume bulk operations")
+            await asyncio.sleep(self.RESUME_INTERVAL)
+
+    async def resume(self) -> None:
+        # operations whose replica died are claimed by exactly one of the others
+        async with self.sessionmaker() as session:
+            repository = BulkOperationRepository(session)
+            # items are committed at the end, so any of the devices may have been
+            # rebooted already and sending the reboot again is not safe
+            interrupted = await repository.fail_interrupted_reboots(
+                "Interrupted by a restart"
+            )
+            operation_ids = await repository.claim_abandoned(self.LEASE)
+            await session.commit()
+
+        for operation_id in interrupted:
+            logger.warning("Bulk reboot interrupted", operation_id=operation_id)
+        for operation_id in operation_ids:
+            logger.info("Resuming bulk operation", operation_id=operation_id)
+            self.submit(operation_id, claimed=True)
+
+    async def _run_safe(self, operation_id: UUID, claimed: bool) -> None:
+        try:
+            await self.run(operation_id, claimed)
+        except Exception:
+            logger.exception("Bulk operation failed", operation_id=operation_id)
+
+    async def _keep_lease(self, operation_id: UUID) -> None:
+        while True:
+            await asyncio.sleep(self.LEASE.total_seconds() / 3)
+            try:
+                async with self.sessionmaker() as session:
+                    await BulkOperationRepository(session).extend_lease(
+                        operation_id, self.LEASE
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception(
+                    "Failed to extend bulk operation lease", operation_id=operation_id
+                )
+
+    async def run(self, operation_id: UUID, claimed: bool = False) -> None:
+        if not claimed:
+            async with self.sessionmaker() as session:
+                claimed = await BulkOperationRepository(session).claim(
+                    operation_id, self.LEASE
+                )
+                await session.commit()
+            if not claimed:
+                return
+
+        lease = asyncio.create_task(self._keep_lease(operation_id))
+        try:
+            await self._run_claimed(operation_id)
+        finally:
+            lease.cancel()
+
+    async def _run_claimed(self, operation_id: UUID) -> None:
+        async with self.di_container(
+            scope=Scope.REQUEST, context={Request: background_request}
+        ) as container:
+            repository = await container.get(BulkOperationRepository)
+            controller_repository = await container.get(ControllerRepository)
+            factory = await container.get(IoTServiceFactory)
+            controller_cache = await container.get(ControllerCache)
+
+            operation = await repository.get(operation_id)
+            if operation is None or operation.status is BulkOperationStatus.COMPLETED:
+                return
+
+            # only unfinished items are sent again after a restart
+            items = await repository.get_items(
+                operation_id, BulkOperationItemStatus.PENDING
+            )
+            controllers = {
+                controller.id: controller
+                for controller in await controller_repository.get_many(
+                    controller_ids=[item.controller_id for item in items]
+                )
+            }
+
+            started = time.perf_counter()
+            semaphore = asyncio.Semaphore(self.CONCURRENCY)
+
+            async def process(item: BulkOperationItem) -> None:
+                async with semaphore:
+                    await self._process_item(
+                        operation, item, controllers.get(item.controller_id), factory
+                    )
+
+            # the fan-out only talks to the devices, the session is untouched
+            # until everything is done and committed at once
+            await asyncio.gather(*(process(item) for item in items))
+
+            operation.status = BulkOperationStatus.COMPLETED
+            operation.lease_until = None
+            await repository.commit()
+
+            await controller_cache.invalidate(
+                *(controller.device_id for controller in controllers.values())
+            )
+
+        metrics.observe(
+            "bulk_operation.duration",
+            time.perf_counter() - started,
+            type=operation.type,
+        )
+        logger.info(
+            "Bulk operation completed",
+            operation_id=operation_id,
+            type=operation.type,
+            items=len(items),
+        )
+
+    async def _process_item(
+        self,
+        operation: BulkOperation,
+        item: BulkOperationItem,
+        controller: Controller | None,
+        factory: IoTServiceFactory,
+    ) -> None:
+        if controller is None:
+            item.status = BulkOperationItemStatus.FAILED
+            item.error = "Controller not found"
+            metrics.incr("bulk_operation.item", result="failed", type=operation.type)
+            return
+
+        service = factory.get(controller.type)
+
+        while True:
+            item.attempts += 1
+            try:
+                await self._execute(operation, controller, service)
+            except (ControllerTimeoutError, ControllerResponseError) as e:
+                if item.attempts < self.MAX_ATTEMPTS:
+                    await asyncio.sleep(self.BASE_BACKOFF * 2 ** (item.attempts - 1))
+                    continue
+                item.status = BulkOperationItemStatus.FAILED
+                item.error = e.message
+            except Exception as e:
+                logger.exception(
+                    "Bulk operation item failed",
+                    operation_id=operation.id,
+                    controller_id=controller.id,
+                )
+                item.status = BulkOperationItemStatus.FAILED
+                item.error = str(e)
+            else:
+                item.status = BulkOperationItemStatus.SUCCEEDED
+                item.error = None
+            break
+
+        metrics.incr(
+            "bulk_operation.item",
+            result=item.status.lower(),
+            type=operation.type,
+        )
+
+    async def _execute(
+        self,
+        operation: BulkOperation,
+        controller: Controller,
+        service: BaseIoTService,
+    ) -> None:
+        match operation.type:
+            case BulkOperationType.SET_SETTINGS:
+                await service.update_settings_infra(controller, operation.payload)
+            case BulkOperationType.SET_CONFIG:
+                await service.update_config_infra(controller, operation.payload)
+            case BulkOperationType.SYNC_SETTINGS:
+                await service.sync_settings_infra(controller)
+            case BulkOperationType.REBOOT:
+                await service.reboot_infra(
+                    controller, operation.payload.get("delay", 0)
+                )
+
+
+async def get_bulk_operation_runner(
+    di_container: AsyncContainer,
+    sessionmaker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[BulkOperationRunner]:
+    runner = BulkOperationRunner(di_container, sessionmaker)
+    runner.start()
+    yield runner
+    await runner.close()
@@ -0,0 +1,109 @@
+from typing import Sequence
+
+from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.repositories.bulk_operation import BulkOperationRepository
+from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.models.admin_user import AdminRole
+from dash.models.bulk_operation import BulkOperation, BulkOperationItem
+from dash.models.controllers.controller import Controller
+from dash.services.bulk_operation.dto import (
+    BulkOperationItemScheme,
+    BulkOperationTarget,
+    CreateBulkOperationRequest,
+    CreateBulkOperationResponse,
+    ReadBulkOperationRequest,
+    ReadBulkOperationResponse,
+)
+from dash.services.bulk_operation.runner import BulkOperationRunner
+from dash.services.common.errors.base import AccessForbiddenError
+from dash.services.common.errors.bulk_operation import BulkOperationNotFoundError
+from dash.services.common.errors.controller import ControllerNotFoundError
+
+
+class BulkOperationService:
+    def __init__(
+        self,
+        bulk_operation_repository: BulkOperationRepository,
+        controller_repository: ControllerRepository,
+        identity_provider: IdProvider,
+        bulk_operation_runner: BulkOperationRunner,
+    ) -> None:
+        self.bulk_operation_repository = bulk_operation_repository
+        self.controller_repository = controller_repository
+        self.identity_provider = identity_provider
+        self.bulk_operation_runner = bulk_operation_runner
+
+    async def _get_targets(self, target: BulkOperationTarget) -> Sequence[Controller]:
+        if target.company_id is not None:
+            await self.identity_provider.ensure_company_owner(target.company_id)
+        elif target.location_id is not None:
+            await self.identity_provider.ensure_company_owner(
+                location_id=target.location_id
+            )
+
+        controllers = await self.controller_repository.get_many(
+            controller_ids=target.controller_ids,
+            location_id=target.location_id,
+            company_id=target.company_id,
+            controller_type=target.type,
+        )
+        if not controllers:
+            raise ControllerNotFoundError
+
+        if target.controller_ids is not None:
+            if len(controllers) != len(set(target.controller_ids)):
+                raise ControllerNotFoundError
+
+            for company_id in {controller.company_id for controller in controllers}:
+                await self.identity_provider.ensure_company_owner(company_id)
+
+        return controllers
+
+    async def create_bulk_operation(
+        self, data: CreateBulkOperationRequest
+    ) -> CreateBulkOperationResponse:
+        user = await self.identity_provider.authorize()
+        controllers = await self._get_targets(data.target)
+
+        operation = BulkOperation(
+            type=data.type,
+            payload=data.payload,
+            created_by=user.id,
+        )
+        self.bulk_operation_repository.add(operation)
+        await self.bulk_operation_repository.flush()
+
+        for controller in controllers:
+            self.bulk_operation_repository.add(
+                BulkOperationItem(
+                    operation_id=operation.id, controller_id=controller.id
+                )
+            )
+        await self.bulk_operation_repository.commit()
+
+        self.bulk_operation_runner.submit(operation.id)
+
+        return CreateBulkOperationResponse(operation_id=operation.id)
+
+    async def read_bulk_operation(
+        self, data: ReadBulkOperationRequest
+    ) -> ReadBulkOperationResponse:
+        user = await self.identity_provider.authorize()
+
+        operation = await self.bulk_operation_repository.get(data.operation_id)
+        if operation is None:
+            raise BulkOperationNotFoundError
+
+        if user.role is not AdminRole.SUPERADMIN and operation.created_by != user.id:
+            raise AccessForbiddenError
+
+        items = await self.bulk_operation_repository.get_items(operation.id)
+
+        return ReadBulkOperationResponse(
+            id=operation.id,
+            type=operation.type,
+            status=operation.status,
+            payload=operation.payload,
+            created_at=operation.created_at,
+            items=[BulkOperationItemScheme.model_validate(item) for item in items],
+        )
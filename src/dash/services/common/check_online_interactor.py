@@ -1,22 +1,37 @@
 from datetime import UTC, datetime, timedelta
+from typing import Sequence
+from uuid import UUID
 
 from dash.infrastructure.storages.iot import IoTStorage
 from dash.models.controllers.controller import Controller, ControllerType
 
 
 class CheckOnlineInteractor:
+    ONLINE_THRESHOLD = timedelta(minutes=3)
+
     def __init__(self, iot_storage: IoTStorage):
         self.iot_storage = iot_storage
 
     async def __call__(self, controller: Controller) -> bool:
-        if controller.type == ControllerType.DUMMY:
-            return True
+        return (await self.check_many([controller]))[controller.id]
+
+    async def check_many(self, controllers: Sequence[Controller]) -> dict[UUID, bool]:
+        result = {
+            controller.id: True
+            for controller in controllers
+            if controller.type == ControllerType.DUMMY
+        }
+        controllers = [c for c in controllers if c.id not in result]
+        if not controllers:
+            return result
 
-        state = await self.iot_storage.get_state(controller.id)
+        markers = await self.iot_storage.get_online_markers([c.id for c in controllers])
+        online_threshold = datetime.now(UTC) - self.ONLINE_THRESHOLD
 
-        if state:
-            online_threshold = datetime.now(UTC) - timedelta(minutes=3)
-            if datetime.fromisoformat(state["created"]) < online_threshold:
-                return False
+        for controller, (state_created, broker_online) in zip(controllers, markers):
+            if state_created and state_created < online_threshold:
+                result[controller.id] = False
+            else:
+                result[controller.id] = broker_online
 
-        return await self.iot_storage.get_broker_online_status(controller.device_id)
+        return result
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+from dash.services.common.errors.base import EntityNotFoundError
+
+
+@dataclass
+class BulkOperationNotFoundError(EntityNotFoundError):
+    message: str = "Bulk operation not found"
@@ -1,6 +1,57 @@
-from pydantic import BaseModel
+import base64
+from datetime import datetime
+from enum import StrEnum
+from typing import Protocol, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel, field_validator
+
+from dash.services.common.errors.base import ValidationError
 
 
 class Pagination(BaseModel):
     limit: int = 10
     offset: int = 0
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class CursorPagination(Pagination):
+    cursor: str | None = None
+    count: CountMode = CountMode.EXACT
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None) -> str | None:
+        if value is not None:
+            try:
+                decode_cursor(value)
+            except ValueError:
+                raise ValidationError("Invalid cursor")
+        return value
+
+
+class Paginated(Protocol):
+    id: UUID
+    created_at: datetime
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    created_at, id = base64.urlsafe_b64decode(cursor).decode().split("|")
+    return datetime.fromisoformat(created_at), UUID(id)
+
+
+def get_next_cursor(items: Sequence[Paginated], data: CursorPagination) -> str | None:
+    if not items or data.limit is None or len(items) < data.limit:
+        return None
+
+    return encode_cursor(items[-1].created_at, items[-1].id)
@@ -1,12 +1,13 @@
-import asyncio
 from typing import Any
 from uuid import UUID
 
 from uuid_utils.compat import uuid7
 
-from dash.infrastructure.acquiring.checkbox import CheckboxService
 from dash.infrastructure.acquiring.liqpay import LiqpayGateway
 from dash.infrastructure.acquiring.monopay import MonopayGateway
+from dash.infrastructure.repositories.fiscalization_job import (
+    FiscalizationJobRepository,
+)
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.models import Controller
 from dash.models.payment import PaymentType, PaymentGatewayType, PaymentStatus, Payment
@@ -20,12 +21,12 @@ class PaymentHelper:
         payment_repository: PaymentRepository,
         monopay_gateway: MonopayGateway,
         liqpay_gateway: LiqpayGateway,
-        checkbox_service: CheckboxService,
+        fiscalization_job_repository: FiscalizationJobRepository,
     ) -> None:
         self.payment_repository = payment_repository
         self.monopay_gateway = monopay_gateway
         self.liqpay_gateway = liqpay_gateway
-        self.checkbox_service = checkbox_service
+        self.fiscalization_job_repository = fiscalization_job_repository
 
     @staticmethod
     def create_payment(
@@ -88,11 +89,13 @@ class PaymentHelper:
         await gateway.finalize(controller, payment, amount)
 
     async def fiscalize(self, controller: Controller, payment: Payment) -> None:
-        receipt_id = uuid7()
-        asyncio.create_task(
-            self.checkbox_service.create_receipt(controller, payment, receipt_id)
-        )
-        payment.receipt_id = receipt_id
+        # the job is committed together with the payment by the caller
+        self.assign_receipt(payment)
+        self.fiscalization_job_repository.enqueue(payment)
+
+    @staticmethod
+    def assign_receipt(payment: Payment) -> None:
+        payment.receipt_id = uuid7()
 
     def _get_payment_gateway(
         self, gateway_type: PaymentGatewayType | None
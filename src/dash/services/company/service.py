@@ -1,9 +1,11 @@
 import uuid
 
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.company import CompanyRepository
 from dash.infrastructure.repositories.user import UserRepository
 from dash.infrastructure.s3 import S3Service
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.models.admin_user import AdminRole
 from dash.models.company import Company
 from dash.services.common.errors.base import AccessForbiddenError
@@ -33,12 +35,16 @@ class CompanyService:
         user_repository: UserRepository,
         user_service: UserService,
         s3_service: S3Service,
+        controller_cache: ControllerCache,
+        principal_storage: PrincipalStorage,
     ) -> None:
         self.company_repository = company_repository
         self.identity_provider = identity_provider
         self.user_repository = user_repository
         self.user_service = user_service
         self.s3_service = s3_service
+        self.controller_cache = controller_cache
+        self.principal_storage = principal_storage
 
     async def create_company(self, data: CreateCompanyRequest) -> CreateCompanyResponse:
         await self.identity_provider.ensure_superadmin()
@@ -66,6 +72,7 @@ class CompanyService:
         )
         self.company_repository.add(company)
         await self.company_repository.commit()
+        await self.principal_storage.invalidate(owner_id)
 
         return CreateCompanyResponse(company_id=company.id, created_owner=new_owner)
 
@@ -99,6 +106,7 @@ class CompanyService:
                 setattr(company, key, value)
 
         await self.company_repository.commit()
+        await self.controller_cache.invalidate_all()
 
     async def upload_logo(self, data: UploadLogoRequest) -> UploadLogoResponse:
         await self.identity_provider.ensure_company_owner(data.company_id)
@@ -147,3 +155,5 @@ class CompanyService:
 
         await self.company_repository.delete(company)
         await self.company_repository.commit()
+        await self.controller_cache.invalidate_all()
+        await self.principal_storage.invalidate_all()
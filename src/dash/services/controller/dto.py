@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from enum import StrEnum
 from typing import Any, Literal, Self
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 
 from dash.models.controllers.controller import (
     Controller,
@@ -12,7 +13,7 @@ from dash.models.controllers.controller import (
 from dash.models.controllers.laundry import LaundryStatus, LaundryTariffType
 from dash.services.common.dto import ControllerID, PublicCompanyDTO, PublicLocationDTO
 from dash.services.common.errors.base import ValidationError
-from dash.services.common.pagination import Pagination
+from dash.services.common.pagination import CursorPagination
 from dash.services.iot.car_cleaner.dto import CarCleanerTariffDTO
 from dash.services.iot.carwash.dto import CarwashTariffDTO
 from dash.services.iot.vacuum.dto import VacuumTariffDTO
@@ -38,7 +39,7 @@ class BaseControllerFilters(BaseModel):
         return values
 
 
-class ReadPaginatedControllerListRequest(Pagination, BaseControllerFilters):
+class ReadPaginatedControllerListRequest(CursorPagination, BaseControllerFilters):
     type: ControllerType | None = None
 
 
@@ -67,7 +68,8 @@ class ControllerScheme(BaseModel):
 
 class ReadControllerResponse(BaseModel):
     controllers: list[ControllerScheme]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class AddControllerRequest(BaseModel):
@@ -150,13 +152,14 @@ class EncashmentScheme(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class ReadEncashmentListRequest(Pagination):
+class ReadEncashmentListRequest(CursorPagination):
     controller_id: UUID
 
 
 class ReadEncashmentListResponse(BaseModel):
     encashments: list[EncashmentScheme]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class CloseEncashmentRequest(BaseModel):
@@ -271,12 +274,79 @@ class EditControllerRequest(ControllerID):
     data: EditControllerDTO
 
 
+class EnergyInterval(StrEnum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
 class GetEnergyStatsRequest(ControllerID):
     period: int
+    breakdown: EnergyInterval | None = None
+
+
+class EnergyStatsPoint(BaseModel):
+    time: datetime
+    energy: float
 
 
 class GetEnergyStatsResponse(BaseModel):
     total_energy: float
+    breakdown: list[EnergyStatsPoint] | None = None
+
+
+class ReadEnergySamplesRequest(ControllerID):
+    date_from: datetime
+    date_to: datetime
+    interval: EnergyInterval = EnergyInterval.MINUTE
+
+    @model_validator(mode="after")
+    def validate_range(self) -> Self:
+        step = {
+            EnergyInterval.MINUTE: timedelta(minutes=1),
+            EnergyInterval.HOUR: timedelta(hours=1),
+            EnergyInterval.DAY: timedelta(days=1),
+        }[self.interval]
+
+        if self.date_to <= self.date_from:
+            raise ValidationError("date_to must be after date_from")
+        if (self.date_to - self.date_from) / step > 10_000:
+            raise ValidationError("Range is too long for the interval")
+        return self
+
+
+class EnergySampleScheme(BaseModel):
+    time: datetime
+    power_avg: float
+    power_max: float
+    voltage_avg: float
+    current_avg: float
+
+
+class ReadEnergySamplesResponse(BaseModel):
+    samples: list[EnergySampleScheme]
+
+
+class ReadStateHistoryRequest(ControllerID):
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    limit: int = 500
+
+    @field_validator("limit")
+    @classmethod
+    def validate_limit(cls, value: int) -> int:
+        if not 0 < value <= 2000:
+            raise ValidationError("Limit must be between 1 and 2000")
+        return value
+
+
+class StateHistoryItem(BaseModel):
+    created_at: datetime
+    state: dict[str, Any]
+
+
+class ReadStateHistoryResponse(BaseModel):
+    items: list[StateHistoryItem]
 
 
 class SetMinDepositAmountRequest(ControllerID):
@@ -2,12 +2,19 @@ from typing import Sequence
 from uuid import UUID
 
 
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.repositories.controller_state_sample import (
+    ControllerStateSampleRepository,
+)
 from dash.infrastructure.repositories.encashment import EncashmentRepository
 from dash.infrastructure.repositories.energy_state import EnergyStateRepository
 from dash.infrastructure.repositories.location import LocationRepository
-from dash.models.admin_user import AdminRole, AdminUser
+from dash.infrastructure.storages.iot import IoTStorage
+from dash.main.config import StateHistoryConfig
+from dash.models.admin_user import AdminRole
 from dash.models.controllers.car_cleaner import CarCleanerController
 from dash.models.controllers.carwash import CarwashController
 from dash.models.controllers.controller import Controller, ControllerType
@@ -29,6 +36,7 @@ from dash.services.common.errors.encashment import (
     EncashmentNotFoundError,
 )
 from dash.services.common.errors.location import LocationNotFoundError
+from dash.services.common.pagination import get_next_cursor
 from dash.services.controller.dto import (
     AddCheckboxCredentialsRequest,
     AddControllerLocationRequest,
@@ -53,12 +61,17 @@ from dash.services.controller.dto import (
     ReadControllerResponse,
     ReadEncashmentListRequest,
     ReadEncashmentListResponse,
+    ReadEnergySamplesRequest,
+    ReadEnergySamplesResponse,
     ReadPublicControllerListRequest,
     ReadPublicControllerListResponse,
     ReadPublicControllerRequest,
     ReadPublicControllerResponse,
+    ReadStateHistoryRequest,
+    ReadStateHistoryResponse,
     SetMinDepositAmountRequest,
     SetupTasmotaRequest,
+    StateHistoryItem,
     PublicVacuumScheme,
     CONTROLLER_PUBLIC_SCHEME_TYPE,
 )
@@ -76,6 +89,10 @@ class ControllerService:
         encashment_repository: EncashmentRepository,
         factory: IoTServiceFactory,
         check_online_interactor: CheckOnlineInteractor,
+        controller_cache: ControllerCache,
+        iot_storage: IoTStorage,
+        state_sample_repository: ControllerStateSampleRepository,
+        state_history_config: StateHistoryConfig,
     ):
         self.identity_provider = identity_provider
         self.controller_repository = controller_repository
@@ -84,6 +101,10 @@ class ControllerService:
         self.encashment_repository = encashment_repository
         self.factory = factory
         self.check_online = check_online_interactor
+        self.controller_cache = controller_cache
+        self.iot_storage = iot_storage
+        self.state_sample_repository = state_sample_repository
+        self.state_history_config = state_history_config
 
     async def _get_controller(self, controller_id: UUID) -> Controller:
         controller = await self.controller_repository.get(controller_id)
@@ -92,8 +113,8 @@ class ControllerService:
         return controller
 
     async def _get_controllers_by_role(
-        self, data: ReadControllerListRequest, user: AdminUser
-    ) -> tuple[Sequence[Controller], int]:
+        self, data: ReadControllerListRequest, user: Principal
+    ) -> tuple[Sequence[Controller], int | None]:
         match user.role:
             case AdminRole.SUPERADMIN:
                 return await self.controller_repository.get_list_all(data)
@@ -123,12 +144,15 @@ class ControllerService:
         else:
             controllers, total = await self._get_controllers_by_role(data, user)
 
+        online = await self.check_online.check_many(controllers)
+
         return ReadControllerResponse(
             controllers=[
-                ControllerScheme.make(controller, await self.check_online(controller))
+                ControllerScheme.make(controller, online[controller.id])
                 for controller in controllers
             ],
             total=total,
+            next_cursor=get_next_cursor(controllers, data),
         )
 
     async def add_controller(self, data: AddControllerRequest) -> AddControllerResponse:
@@ -171,6 +195,7 @@ class ControllerService:
 
         self.controller_repository.add(controller)
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
         return AddControllerResponse(id=controller.id)
 
@@ -191,6 +216,7 @@ class ControllerService:
         controller.monopay_active = data.monopay.is_active
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def add_liqpay_credentials(self, data: AddLiqpayCredentialsRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -203,6 +229,7 @@ class ControllerService:
         controller.liqpay_active = data.liqpay.is_active
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def add_checkbox_credentials(
         self, data: AddCheckboxCredentialsRequest
@@ -219,6 +246,7 @@ class ControllerService:
         controller.fiscalize_cash = data.checkbox.fiscalize_cash
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def add_location(self, data: AddControllerLocationRequest) -> None:
         await self.identity_provider.ensure_superadmin()
@@ -230,6 +258,7 @@ class ControllerService:
 
         controller.location_id = data.location_id
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def read_encashments(
         self, data: ReadEncashmentListRequest
@@ -246,6 +275,7 @@ class ControllerService:
                 for encashment in encashments
             ],
             total=total,
+            next_cursor=get_next_cursor(encashments, data),
         )
 
     async def close_encashment(self, data: CloseEncashmentRequest) -> None:
@@ -337,6 +367,7 @@ class ControllerService:
 
         controller.tasmota_id = data.tasmota_id
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def set_min_deposit_amount(self, data: SetMinDepositAmountRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -344,11 +375,13 @@ class ControllerService:
 
         controller.min_deposit_amount = data.min_deposit_amount
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def edit_controller(self, data: EditControllerRequest) -> None:
         controller = await self._get_controller(data.controller_id)
 
         await self.identity_provider.ensure_company_owner(controller.company_id)
+        device_id = controller.device_id
 
         dict_data = data.data.model_dump(exclude_unset=True)
         for key, value in dict_data.items():
@@ -356,6 +389,7 @@ class ControllerService:
                 setattr(controller, key, value)
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(device_id, controller.device_id)
 
     async def read_energy_stats(
         self, data: GetEnergyStatsRequest
@@ -365,9 +399,55 @@ class ControllerService:
 
         return await self.energy_repository.get_stats(data)
 
+    async def read_energy_samples(
+        self, data: ReadEnergySamplesRequest
+    ) -> ReadEnergySamplesResponse:
+        controller = await self._get_controller(data.controller_id)
+        await self.identity_provider.ensure_location_admin(controller.location_id)
+
+        return await self.energy_repository.get_samples(data)
+
+    async def read_state_history(
+        self, data: ReadStateHistoryRequest
+    ) -> ReadStateHistoryResponse:
+        controller = await self._get_controller(data.controller_id)
+        await self.identity_provider.ensure_location_admin(controller.location_id)
+
+        history = await self.iot_storage.get_state_history(
+            controller.id, data.date_from, data.date_to, data.limit
+        )
+
+        # Redis keeps only the recent states, older ones come from the samples
+        if data.date_from is None:
+            missing = data.limit - len(history)
+        elif not history or data.date_from < history[0][0]:
+            missing = data.limit
+        else:
+            missing = 0
+
+        if self.state_history_config.persist and missing > 0:
+            samples = await self.state_sample_repository.get_range(
+                controller.id,
+                data.date_from,
+                history[0][0] if history else data.date_to,
+                missing,
+            )
+            history = [
+                *((sample.created_at, sample.state) for sample in samples),
+                *history,
+            ][: data.limit]
+
+        return ReadStateHistoryResponse(
+            items=[
+                StateHistoryItem(created_at=created_at, state=state)
+                for created_at, state in history
+            ]
+        )
+
     async def delete(self, data: DeleteControllerRequest) -> None:
         await self.identity_provider.ensure_superadmin()
 
         controller = await self._get_controller(data.controller_id)
         await self.controller_repository.delete(controller)
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
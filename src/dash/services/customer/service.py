@@ -1,10 +1,11 @@
 from datetime import UTC, datetime
 from typing import Sequence
 
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.auth.password_processor import PasswordProcessor
 from dash.infrastructure.repositories.customer import CustomerRepository
-from dash.models.admin_user import AdminRole, AdminUser
+from dash.models.admin_user import AdminRole
 from dash.models.customer import Customer
 from dash.services.common.errors.base import AccessForbiddenError
 from dash.services.common.errors.user import (
@@ -39,7 +40,7 @@ class CustomerService:
         self.password_processor = password_processor
 
     async def _get_customers_by_role(
-        self, data: ReadCustomerListRequest, user: AdminUser
+        self, data: ReadCustomerListRequest, user: Principal
     ) -> tuple[Sequence[Customer], int]:
         match user.role:
             case AdminRole.SUPERADMIN:
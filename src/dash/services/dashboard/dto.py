@@ -53,7 +53,8 @@ class PaymentStatsDTO(BaseModel):
 
 
 class GetRevenueRequest(BaseFilters):
-    pass
+    today_start: datetime | None = None
+    exclude_today: bool = False
 
 
 class GetPaymentAnalyticsRequest(BaseFilters):
@@ -65,6 +66,10 @@ class GetControllersRequest(BaseFilters):
     pass
 
 
+class ReadLiveEventsRequest(BaseFilters):
+    pass
+
+
 class ReadDashboardStatsRequest(BaseFilters):
     date_from: datetime
     date_to: datetime
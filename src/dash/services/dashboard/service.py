@@ -1,47 +1,127 @@
 import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.live_events import LiveEvents
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.payment import PaymentRepository
 from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.storages.today_counters import TodayCountersStorage
 from dash.models import Controller
-from dash.models.admin_user import AdminRole, AdminUser
+from dash.models.admin_user import AdminRole
 from dash.services.common.check_online_interactor import CheckOnlineInteractor
+from dash.services.common.dto import BaseFilters
 from dash.services.common.errors.base import AccessForbiddenError
 from dash.services.common.errors.controller import ControllerNotFoundError
+from dash.services.common.pagination import CountMode
 from dash.services.controller.dto import ReadControllerListRequest
 from dash.services.dashboard.dto import (
     ReadDashboardStatsRequest,
     ReadDashboardStatsResponse,
+    ReadLiveEventsRequest,
     GetPaymentAnalyticsRequest,
     GetRevenueRequest,
     ReadPaymentStatsRequest,
     ReadTransactionStatsRequest,
     ActiveControllersDTO,
+    RevenueDTO,
     TodayClientsDTO,
 )
 
+T = TypeVar("T")
+
 
 class DashboardService:
     def __init__(
         self,
         identity_provider: IdProvider,
-        transaction_repository: TransactionRepository,
-        payment_repository: PaymentRepository,
         controller_repository: ControllerRepository,
         check_online: CheckOnlineInteractor,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        today_counters: TodayCountersStorage,
+        live_events: LiveEvents,
     ):
         self.identity_provider = identity_provider
-        self.transaction_repository = transaction_repository
-        self.payment_repository = payment_repository
         self.controller_repository = controller_repository
         self.check_online = check_online
+        self.sessionmaker = sessionmaker
+        self.today_counters = today_counters
+        self.live_events = live_events
 
     async def read_dashboard_stats(
         self, data: ReadDashboardStatsRequest
     ) -> ReadDashboardStatsResponse:
         user = await self.identity_provider.authorize()
+        await self._ensure_filters_access(data)
+
+        controllers, _ = await self._get_all_controllers_by_role(data, user)
+
+        today_start = self.today_counters.get_day_start(self.today_counters.get_day())
+        counters = await self.today_counters.get(
+            await self._get_today_counter_scopes(data, user)
+        )
 
+        (
+            revenue,
+            payment_analytics,
+            today_clients,
+            transaction_stats,
+            payment_stats,
+            active_controllers,
+        ) = await asyncio.gather(
+            self._get_revenue(data, user, today_start, counters),
+            self._in_own_session(
+                lambda session: self._get_payment_analytics_by_role(
+                    PaymentRepository(session), data, user
+                )
+            ),
+            self._get_today_clients(data, user, today_start, counters),
+            self._in_own_session(
+                lambda session: self._get_transaction_stats_by_role(
+                    TransactionRepository(session), data, user
+                )
+            ),
+            self._in_own_session(
+                lambda session: self._get_payment_stats_by_role(
+                    PaymentRepository(session), data, user
+                )
+            ),
+            self._count_active_controllers(controllers, len(controllers)),  # type: ignore
+        )
+
+        return ReadDashboardStatsResponse(
+            revenue=revenue,
+            payment_analytics=payment_analytics,
+            active_controllers=active_controllers,
+            today_clients=today_clients,
+            transaction_stats=transaction_stats,
+            payment_stats=payment_stats,
+        )
+
+    async def subscribe_live_events(
+        self, data: ReadLiveEventsRequest
+    ) -> AsyncIterator[bytes | None]:
+        user = await self.identity_provider.authorize()
+        await self._ensure_filters_access(data)
+
+        controller_ids = None
+        if user.role is not AdminRole.SUPERADMIN or any(
+            (data.company_id, data.location_id, data.controller_id)
+        ):
+            controllers, _ = await self._get_all_controllers_by_role(data, user)
+            controller_ids = {controller.id for controller in controllers}
+
+        # the stream outlives the request, don't hold a connection for it
+        await self.controller_repository.commit()
+
+        return self.live_events.subscribe(controller_ids)
+
+    async def _ensure_filters_access(self, data: BaseFilters) -> None:
         if data.company_id:
             await self.identity_provider.ensure_company_owner(data.company_id)
 
@@ -54,18 +134,13 @@ class DashboardService:
                 raise ControllerNotFoundError
             await self.identity_provider.ensure_location_admin(controller.location_id)
 
-        controllers, total = await self._get_all_controllers_by_role(data, user)
+    async def _in_own_session(self, fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        # an AsyncSession can't run queries concurrently, so every aggregate
+        # gets its own pooled connection
+        async with self.sessionmaker() as session:
+            return await fn(session)
 
-        return ReadDashboardStatsResponse(
-            revenue=await self._get_revenue_by_role(data, user),
-            payment_analytics=await self._get_payment_analytics_by_role(data, user),
-            active_controllers=await self._count_active_controllers(controllers, total),  # type: ignore
-            today_clients=await self._get_today_clients_by_role(data, user),
-            transaction_stats=await self._get_transaction_stats_by_role(data, user),
-            payment_stats=await self._get_payment_stats_by_role(data, user),
-        )
-
-    async def _call_by_role(self, user: AdminUser, superadmin_fn, owner_fn, admin_fn):
+    async def _call_by_role(self, user: Principal, superadmin_fn, owner_fn, admin_fn):
         """Generic method to call appropriate function based on user role"""
         match user.role:
             case AdminRole.SUPERADMIN:
@@ -77,27 +152,98 @@ class DashboardService:
             case _:
                 raise AccessForbiddenError
 
+    async def _get_today_counter_scopes(
+        self, data: ReadDashboardStatsRequest, user: Principal
+    ) -> list[tuple[str, UUID | str]]:
+        if data.controller_id:
+            return [(TodayCountersStorage.CONTROLLER, data.controller_id)]
+        if data.location_id:
+            return [(TodayCountersStorage.LOCATION, data.location_id)]
+        if data.company_id:
+            return [(TodayCountersStorage.COMPANY, data.company_id)]
+
+        match user.role:
+            case AdminRole.SUPERADMIN:
+                return [(TodayCountersStorage.ALL, TodayCountersStorage.ALL)]
+            case AdminRole.COMPANY_OWNER:
+                return [(TodayCountersStorage.COMPANY, id_) for id_ in user.company_ids]
+            case AdminRole.LOCATION_ADMIN:
+                return [
+                    (TodayCountersStorage.LOCATION, id_)
+                    for id_ in user.admin_location_ids
+                ]
+            case _:
+                raise AccessForbiddenError
+
+    async def _get_revenue(
+        self,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
+        today_start: datetime,
+        counters: dict[str, int] | None,
+    ) -> RevenueDTO:
+        revenue = await self._in_own_session(
+            lambda session: self._get_revenue_by_role(
+                TransactionRepository(session),
+                data,
+                user,
+                today_start,
+                exclude_today=counters is not None,
+            )
+        )
+        if counters is None:
+            return revenue
+
+        today = sum(counters[channel] for channel in TodayCountersStorage.CHANNELS)
+        return RevenueDTO(total=revenue.total + today, today=today)
+
+    async def _get_today_clients(
+        self,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
+        today_start: datetime,
+        counters: dict[str, int] | None,
+    ) -> TodayClientsDTO:
+        if counters is not None:
+            return TodayClientsDTO(count=counters[TodayCountersStorage.CLIENTS])
+
+        return await self._in_own_session(
+            lambda session: self._get_today_clients_by_role(
+                TransactionRepository(session), data, user, today_start
+            )
+        )
+
     async def _get_revenue_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
+        self,
+        transaction_repository: TransactionRepository,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
+        today_start: datetime,
+        exclude_today: bool,
     ):
         revenue_data = GetRevenueRequest(
             company_id=data.company_id,
             location_id=data.location_id,
             controller_id=data.controller_id,
+            today_start=today_start,
+            exclude_today=exclude_today,
         )
         return await self._call_by_role(
             user,
-            lambda: self.transaction_repository.get_revenue_all(revenue_data),
-            lambda user_id: self.transaction_repository.get_revenue_by_owner(
+            lambda: transaction_repository.get_revenue_all(revenue_data),
+            lambda user_id: transaction_repository.get_revenue_by_owner(
                 revenue_data, user_id
             ),
-            lambda user_id: self.transaction_repository.get_revenue_by_admin(
+            lambda user_id: transaction_repository.get_revenue_by_admin(
                 revenue_data, user_id
             ),
         )
 
     async def _get_payment_analytics_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
+        self,
+        payment_repository: PaymentRepository,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
     ):
         analytics_data = GetPaymentAnalyticsRequest(
             company_id=data.company_id,
@@ -108,37 +254,40 @@ class DashboardService:
         )
         return await self._call_by_role(
             user,
-            lambda: self.payment_repository.get_payment_analytics_all(analytics_data),
-            lambda user_id: self.payment_repository.get_payment_analytics_by_owner(
+            lambda: payment_repository.get_payment_analytics_all(analytics_data),
+            lambda user_id: payment_repository.get_payment_analytics_by_owner(
                 analytics_data, user_id
             ),
-            lambda user_id: self.payment_repository.get_payment_analytics_by_admin(
+            lambda user_id: payment_repository.get_payment_analytics_by_admin(
                 analytics_data, user_id
             ),
         )
 
     async def _get_today_clients_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
+        self,
+        transaction_repository: TransactionRepository,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
+        today_start: datetime,
     ) -> TodayClientsDTO:
         clients_data = GetRevenueRequest(
             company_id=data.company_id,
             location_id=data.location_id,
             controller_id=data.controller_id,
+            today_start=today_start,
         )
         return await self._call_by_role(
             user,
-            lambda: self.transaction_repository.get_today_clients_all(clients_data),
-            lambda user_id: self.transaction_repository.get_today_clients_by_owner(
+            lambda: transaction_repository.get_today_clients_all(clients_data),
+            lambda user_id: transaction_repository.get_today_clients_by_owner(
                 clients_data, user_id
             ),
-            lambda user_id: self.transaction_repository.get_today_clients_by_admin(
+            lambda user_id: transaction_repository.get_today_clients_by_admin(
                 clients_data, user_id
             ),
         )
 
-    async def _get_all_controllers_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
-    ):
+    async def _get_all_controllers_by_role(self, data: BaseFilters, user: Principal):
         if data.controller_id:
             return [await self.controller_repository.get(data.controller_id)], 1
 
@@ -146,6 +295,7 @@ class DashboardService:
             company_id=data.company_id,
             location_id=data.location_id,
             limit=None,
+            count=CountMode.NONE,
         )
         return await self._call_by_role(
             user,
@@ -159,31 +309,37 @@ class DashboardService:
         )
 
     async def _get_transaction_stats_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
+        self,
+        transaction_repository: TransactionRepository,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
     ):
         stats_request = ReadTransactionStatsRequest(**data.model_dump())
         return await self._call_by_role(
             user,
-            lambda: self.transaction_repository.get_stats_all(stats_request),
-            lambda user_id: self.transaction_repository.get_stats_by_owner(
+            lambda: transaction_repository.get_stats_all(stats_request),
+            lambda user_id: transaction_repository.get_stats_by_owner(
                 stats_request, user_id
             ),
-            lambda user_id: self.transaction_repository.get_stats_by_admin(
+            lambda user_id: transaction_repository.get_stats_by_admin(
                 stats_request, user_id
             ),
         )
 
     async def _get_payment_stats_by_role(
-        self, data: ReadDashboardStatsRequest, user: AdminUser
+        self,
+        payment_repository: PaymentRepository,
+        data: ReadDashboardStatsRequest,
+        user: Principal,
     ):
         stats_request = ReadPaymentStatsRequest(**data.model_dump())
         return await self._call_by_role(
             user,
-            lambda: self.payment_repository.get_stats_all(stats_request),
-            lambda user_id: self.payment_repository.get_stats_by_owner(
+            lambda: payment_repository.get_stats_all(stats_request),
+            lambda user_id: payment_repository.get_stats_by_owner(
                 stats_request, user_id
             ),
-            lambda user_id: self.payment_repository.get_stats_by_admin(
+            lambda user_id: payment_repository.get_stats_by_admin(
                 stats_request, user_id
             ),
         )
@@ -191,5 +347,5 @@ class DashboardService:
     async def _count_active_controllers(
         self, controller_list: list[Controller], total: int
     ) -> ActiveControllersDTO:
-        results = await asyncio.gather(*[self.check_online(c) for c in controller_list])
-        return ActiveControllersDTO(total=total, active=sum(results))
+        online = await self.check_online.check_many(controller_list)
+        return ActiveControllersDTO(total=total, active=sum(online.values()))
@@ -1,9 +1,12 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Any
 from uuid import UUID
 
 from structlog import get_logger
 
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.common.base_client import BaseIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.models import Controller
@@ -34,6 +37,15 @@ from dash.services.iot.dto import (
 
 logger = get_logger()
 
+# reached only once the hold was handled, a redelivered hold webhook is ignored
+HELD_PAYMENT_STATUSES = {
+    PaymentStatus.HOLD,
+    PaymentStatus.COMPLETED,
+    PaymentStatus.REVERSED,
+    PaymentStatus.EXPIRED,
+    PaymentStatus.FAILED,
+}
+
 
 class BaseIoTService(ABC):
     def __init__(
@@ -41,11 +53,13 @@ class BaseIoTService(ABC):
         iot_client: BaseIoTClient,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
     ) -> None:
         self.iot_client = iot_client
         self.identity_provider = identity_provider
         self.controller_repository = controller_repository
+        self.controller_cache = controller_cache
         self.payment_helper = payment_helper
 
     @abstractmethod
@@ -57,10 +71,11 @@ class BaseIoTService(ABC):
         return True
 
     async def sync_settings_infra(self, controller: Controller) -> None:
-        config = await self.iot_client.get_config(controller.device_id)
+        config, settings = await asyncio.gather(
+            self.iot_client.get_config(controller.device_id),
+            self.iot_client.get_settings(controller.device_id),
+        )
         config.pop("request_id")
-
-        settings = await self.iot_client.get_settings(controller.device_id)
         settings.pop("request_id")
 
         controller.config = config
@@ -72,6 +87,7 @@ class BaseIoTService(ABC):
 
         await self.sync_settings_infra(controller)
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
         return SyncSettingsResponse(
             config=controller.config,
@@ -85,13 +101,17 @@ class BaseIoTService(ABC):
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_company_owner(controller.company_id)
 
-        config_dict = data.config.model_dump(exclude_unset=True)
-        await self.iot_client.set_config(
-            device_id=controller.device_id, payload=config_dict
+        await self.update_config_infra(
+            controller, data.config.model_dump(exclude_unset=True)
         )
-
-        controller.config = {**controller.config, **config_dict}
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
+
+    async def update_config_infra(
+        self, controller: Controller, config: dict[str, Any]
+    ) -> None:
+        await self.iot_client.set_config(device_id=controller.device_id, payload=config)
+        controller.config = {**controller.config, **config}
 
     async def update_settings(self, data: SetSettingsRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -100,13 +120,19 @@ class BaseIoTService(ABC):
             location_id=controller.location_id
         )
 
-        settings_dict = data.settings.model_dump(exclude_unset=True)
-        await self.iot_client.set_settings(
-            device_id=controller.device_id, payload=settings_dict
+        await self.update_settings_infra(
+            controller, data.settings.model_dump(exclude_unset=True)
         )
-
-        controller.settings = {**controller.settings, **settings_dict}
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
+
+    async def update_settings_infra(
+        self, controller: Controller, settings: dict[str, Any]
+    ) -> None:
+        await self.iot_client.set_settings(
+            device_id=controller.device_id, payload=settings
+        )
+        controller.settings = {**controller.settings, **settings}
 
     async def get_display(self, data: GetDisplayInfoRequest) -> dict[str, str]:
         controller = await self._get_controller(data.controller_id)
@@ -120,8 +146,11 @@ class BaseIoTService(ABC):
     async def reboot_controller(self, data: RebootControllerRequest) -> None:
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
+        await self.reboot_infra(controller, data.delay)
+
+    async def reboot_infra(self, controller: Controller, delay: int) -> None:
         await self.iot_client.reboot(
-            device_id=controller.device_id, payload={"delay": data.delay}
+            device_id=controller.device_id, payload={"delay": delay}
         )
 
     async def send_qr_payment(self, data: SendQRPaymentRequest) -> None:
@@ -244,7 +273,7 @@ class BaseIoTService(ABC):
         return invoice_result
 
     async def process_hold_status(self, payment: Payment) -> None:
-        if not payment.controller_id:
+        if not payment.controller_id or payment.status in HELD_PAYMENT_STATUSES:
             return
 
         payment.status = PaymentStatus.HOLD
@@ -273,7 +302,19 @@ class BaseIoTService(ABC):
             await self.payment_helper.refund(controller, payment)
             payment.failure_reason = "Невідома помилка"
         else:
-            await self.payment_helper.finalize_hold(controller, payment, payment.amount)
+            # the device credited the amount, a retry must never send it again
+            await self.payment_helper.commit()
+            try:
+                await self.payment_helper.finalize_hold(
+                    controller, payment, payment.amount
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to finalize hold payment",
+                    exc_info=e,
+                    payment_id=payment.id,
+                    controller=controller.id,
+                )
 
         await self.payment_helper.commit()
 
@@ -282,6 +323,9 @@ class BaseIoTService(ABC):
         await self.payment_helper.commit()
 
     async def process_success_status(self, payment: Payment) -> None:
+        if payment.status is PaymentStatus.COMPLETED:
+            return
+
         payment.status = PaymentStatus.COMPLETED
         controller = await self._get_controller(payment.controller_id)
 
@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any
 from uuid import UUID
 
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.iot.car_cleaner.client import CarCleanerIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
@@ -44,13 +46,18 @@ class CarCleanerService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         iot_client: CarCleanerIoTClient,
         iot_storage: IoTStorage,
         payment_helper: PaymentHelper,
         check_online: CheckOnlineInteractor,
     ):
         super().__init__(
-            iot_client, identity_provider, controller_repository, payment_helper
+            iot_client,
+            identity_provider,
+            controller_repository,
+            controller_cache,
+            payment_helper,
         )
         self.iot_client = iot_client
         self.iot_storage = iot_storage
@@ -66,10 +73,11 @@ class CarCleanerService(BaseIoTService):
         return controller
 
     async def sync_settings_infra(self, controller: Controller) -> None:
-        config = await self.iot_client.get_config(controller.device_id)
+        config, settings = await asyncio.gather(
+            self.iot_client.get_config(controller.device_id),
+            self.iot_client.get_settings(controller.device_id),
+        )
         config.pop("request_id")
-
-        settings = await self.iot_client.get_settings(controller.device_id)
         codec = ServiceBitMaskCodec(CarCleanerServiceEnum, CarCleanerRelayBit)
 
         settings["servicesRelay"] = codec.decode_bit_mask(settings["servicesRelay"])
@@ -87,14 +95,21 @@ class CarCleanerService(BaseIoTService):
             location_id=controller.location_id
         )
 
-        incoming_settings = data.settings.model_dump(exclude_unset=True)
-        controller.settings = {**controller.settings, **incoming_settings}
+        await self.update_settings_infra(
+            controller, data.settings.model_dump(exclude_unset=True)
+        )
+        await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
+    async def update_settings_infra(
+        self, controller: Controller, settings: dict[str, Any]
+    ) -> None:
+        merged = {**controller.settings, **settings}
         await self.iot_client.set_settings(
             device_id=controller.device_id,
-            payload=self._prepare_settings_payload(controller.settings),
+            payload=self._prepare_settings_payload(merged),
         )
-        await self.controller_repository.commit()
+        controller.settings = merged
 
     async def read_controller(
         self, data: ControllerID
@@ -102,10 +117,12 @@ class CarCleanerService(BaseIoTService):
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
 
+        state, energy_state = await self.iot_storage.get_state_and_energy(controller.id)
+
         return CarCleanerIoTControllerScheme.make(
             controller,
-            state=await self.iot_storage.get_state(controller.id),
-            energy_state=await self.iot_storage.get_energy_state(controller.id),
+            state=state,
+            energy_state=energy_state,
             is_online=await self.check_online(controller),
         )
 
@@ -1,7 +1,10 @@
+from typing import Any
 from uuid import UUID
 
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.models import Controller
 from dash.models.controllers.dummy import DummyController
 from dash.models.payment import PaymentStatus, PaymentType
 from dash.services.common.dto import ControllerID
@@ -34,10 +37,12 @@ class DummyService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
     ):
         self.identity_provider = identity_provider
         self.controller_repository = controller_repository
+        self.controller_cache = controller_cache
         self.payment_helper = payment_helper
 
     async def _get_controller(self, controller_id: UUID) -> DummyController:
@@ -59,6 +64,7 @@ class DummyService(BaseIoTService):
 
         controller.description = data.description
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def sync_settings_infra(self, controller: DummyController) -> None:
         controller.config = {}
@@ -73,15 +79,28 @@ class DummyService(BaseIoTService):
     async def update_config(self, data: SetConfigRequest) -> None:
         pass
 
+    async def update_config_infra(
+        self, controller: Controller, config: dict[str, Any]
+    ) -> None:
+        pass
+
     async def update_settings(self, data: SetSettingsRequest) -> None:
         pass
 
+    async def update_settings_infra(
+        self, controller: Controller, settings: dict[str, Any]
+    ) -> None:
+        pass
+
     async def get_display(self, data: GetDisplayInfoRequest) -> dict[str, str]:
         return {}
 
     async def reboot_controller(self, data: RebootControllerRequest) -> None:
         pass
 
+    async def reboot_infra(self, controller: Controller, delay: int) -> None:
+        pass
+
     async def send_qr_payment(self, data: SendQRPaymentRequest) -> None:
         pass
 
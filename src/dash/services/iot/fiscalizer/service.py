@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.fiscalizer.client import FiscalizerIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.storages.iot import IoTStorage
@@ -25,6 +26,7 @@ class FiscalizerService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
         iot_storage: IoTStorage,
         fiscalizer_client: FiscalizerIoTClient,
@@ -34,6 +36,7 @@ class FiscalizerService(BaseIoTService):
             fiscalizer_client,
             identity_provider,
             controller_repository,
+            controller_cache,
             payment_helper,
         )
         self.iot_storage = iot_storage
@@ -53,10 +56,12 @@ class FiscalizerService(BaseIoTService):
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
 
+        state, energy_state = await self.iot_storage.get_state_and_energy(controller.id)
+
         return FiscalizerIoTControllerScheme.make(
             model=controller,
-            state=await self.iot_storage.get_state(controller.id),
-            energy_state=await self.iot_storage.get_energy_state(controller.id),
+            state=state,
+            energy_state=energy_state,
             is_online=await self.check_online(controller),
         )
 
@@ -72,6 +77,7 @@ class FiscalizerService(BaseIoTService):
                 setattr(controller, key, value)
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def setup_sim(self, data: SetupSIMRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -83,6 +89,7 @@ class FiscalizerService(BaseIoTService):
                 setattr(controller, key, value)
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def set_description(self, data: SetDescriptionRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -90,6 +97,7 @@ class FiscalizerService(BaseIoTService):
 
         controller.description = data.description
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def send_qr_payment(self, data: SendQRPaymentRequest) -> None:
         controller = await self._get_controller(data.controller_id)
@@ -3,11 +3,16 @@ from uuid import UUID
 
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.iot.laundry.client import LaundryIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.transaction import TransactionRepository
 from dash.infrastructure.storages.iot import IoTStorage
+from dash.infrastructure.storages.today_counters import (
+    TodayCountersStorage,
+    TodayIncrement,
+)
 from dash.models import Payment
 from dash.models.controllers.laundry import (
     LaundryController,
@@ -42,22 +47,26 @@ class LaundryService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
         transaction_repository: TransactionRepository,
         iot_storage: IoTStorage,
         laundry_client: LaundryIoTClient,
         check_online_interactor: CheckOnlineInteractor,
+        today_counters: TodayCountersStorage,
     ):
         super().__init__(
             laundry_client,
             identity_provider,
             controller_repository,
+            controller_cache,
             payment_helper,
         )
         self.iot_client: LaundryIoTClient = laundry_client
         self.transaction_repository = transaction_repository
         self.iot_storage = iot_storage
         self.check_online = check_online_interactor
+        self.today_counters = today_counters
 
     async def _get_controller(self, controller_id: UUID | None) -> LaundryController:
         if not controller_id:
@@ -74,10 +83,12 @@ class LaundryService(BaseIoTService):
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
 
+        state, energy_state = await self.iot_storage.get_state_and_energy(controller.id)
+
         return LaundryIoTControllerScheme.make(
             model=controller,
-            state=await self.iot_storage.get_state(controller.id),
-            energy_state=await self.iot_storage.get_energy_state(controller.id),
+            state=state,
+            energy_state=energy_state,
             is_online=await self.check_online(controller),
         )
 
@@ -90,6 +101,7 @@ class LaundryService(BaseIoTService):
                 setattr(controller, key, value)
 
         await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
     async def create_invoice(
         self, data: CreateLaundryInvoiceRequest
@@ -183,6 +195,7 @@ class LaundryService(BaseIoTService):
             else:
                 transaction.session_status = LaundrySessionStatus.COMPLETED
 
+            held_amount = transaction.qr_amount
             if transaction.tariff_type is LaundryTariffType.PER_MINUTE:
                 if transaction.session_status is LaundrySessionStatus.COMPLETED:
                     self._calculate_per_minute_tariff(transaction, controller)
@@ -195,6 +208,20 @@ class LaundryService(BaseIoTService):
 
         await self.controller_repository.commit()
 
+        if transaction and transaction.qr_amount != held_amount:
+            await self.today_counters.increment(
+                [
+                    TodayIncrement(
+                        controller_id=controller.id,
+                        location_id=controller.location_id,
+                        company_id=controller.company_id,
+                        amounts={"qr": transaction.qr_amount - held_amount},
+                        clients=0,
+                        at=transaction.created_at,
+                    )
+                ]
+            )
+
     async def process_hold_status(self, payment: Payment) -> None:
         await self._start_laundry_session(payment)
 
@@ -255,6 +282,9 @@ class LaundryService(BaseIoTService):
                 payment.status = PaymentStatus.COMPLETED
 
             await self.transaction_repository.commit()
+            await self.today_counters.increment(
+                [TodayIncrement.from_transaction(transaction, controller.company_id)]
+            )
 
     def _calculate_per_minute_tariff(
         self, transaction: LaundryTransaction, controller: LaundryController
@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any
 from uuid import UUID
 
 from structlog import get_logger
 
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.iot.vacuum.client import VacuumIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
@@ -43,6 +45,7 @@ class VacuumService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
         vacuum_client: VacuumIoTClient,
         check_online_interactor: CheckOnlineInteractor,
@@ -52,6 +55,7 @@ class VacuumService(BaseIoTService):
             vacuum_client,
             identity_provider,
             controller_repository,
+            controller_cache,
             payment_helper,
         )
         self.iot_client: VacuumIoTClient
@@ -67,10 +71,11 @@ class VacuumService(BaseIoTService):
         return controller
 
     async def sync_settings_infra(self, controller: Controller) -> None:
-        config = await self.iot_client.get_config(controller.device_id)
+        config, settings = await asyncio.gather(
+            self.iot_client.get_config(controller.device_id),
+            self.iot_client.get_settings(controller.device_id),
+        )
         config.pop("request_id")
-
-        settings = await self.iot_client.get_settings(controller.device_id)
         codec = ServiceBitMaskCodec(VacuumServiceEnum, VacuumRelayBit)
 
         settings["servicesRelay"] = codec.decode_bit_mask(settings["servicesRelay"])
@@ -88,23 +93,32 @@ class VacuumService(BaseIoTService):
             location_id=controller.location_id
         )
 
-        incoming_settings = data.settings.model_dump(exclude_unset=True)
-        controller.settings = {**controller.settings, **incoming_settings}
+        await self.update_settings_infra(
+            controller, data.settings.model_dump(exclude_unset=True)
+        )
+        await self.controller_repository.commit()
+        await self.controller_cache.invalidate(controller.device_id)
 
+    async def update_settings_infra(
+        self, controller: Controller, settings: dict[str, Any]
+    ) -> None:
+        merged = {**controller.settings, **settings}
         await self.iot_client.set_settings(
             device_id=controller.device_id,
-            payload=self._prepare_settings_payload(controller.settings),
+            payload=self._prepare_settings_payload(merged),
         )
-        await self.controller_repository.commit()
+        controller.settings = merged
 
     async def read_controller(self, data: ControllerID) -> VacuumIoTControllerScheme:
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
 
+        state, energy_state = await self.iot_storage.get_state_and_energy(controller.id)
+
         return VacuumIoTControllerScheme.make(
             model=controller,
-            state=await self.iot_storage.get_state(controller.id),
-            energy_state=await self.iot_storage.get_energy_state(controller.id),
+            state=state,
+            energy_state=energy_state,
             is_online=await self.check_online(controller),
         )
 
@@ -3,6 +3,7 @@ from uuid import UUID
 from structlog import get_logger
 
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.iot.wsm.client import WsmIoTClient
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.storages.iot import IoTStorage
@@ -22,6 +23,7 @@ class WsmService(BaseIoTService):
         self,
         identity_provider: IdProvider,
         controller_repository: ControllerRepository,
+        controller_cache: ControllerCache,
         payment_helper: PaymentHelper,
         iot_storage: IoTStorage,
         wsm_client: WsmIoTClient,
@@ -31,6 +33,7 @@ class WsmService(BaseIoTService):
             wsm_client,
             identity_provider,
             controller_repository,
+            controller_cache,
             payment_helper,
         )
         self.iot_storage = iot_storage
@@ -48,10 +51,12 @@ class WsmService(BaseIoTService):
         controller = await self._get_controller(data.controller_id)
         await self.identity_provider.ensure_location_admin(controller.location_id)
 
+        state, energy_state = await self.iot_storage.get_state_and_energy(controller.id)
+
         return WsmIoTControllerScheme.make(
             model=controller,
-            state=await self.iot_storage.get_state(controller.id),
-            energy_state=await self.iot_storage.get_energy_state(controller.id),
+            state=state,
+            energy_state=energy_state,
             is_online=await self.check_online(controller),
         )
 
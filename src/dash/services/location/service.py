@@ -1,8 +1,10 @@
 from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.controller_cache import ControllerCache
 from dash.infrastructure.repositories.company import CompanyRepository
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.location import LocationRepository
 from dash.infrastructure.repositories.user import UserRepository
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.models.admin_user import AdminRole
 from dash.models.location import Location
 from dash.services.common.errors.base import AccessForbiddenError
@@ -28,12 +30,16 @@ class LocationService:
         user_repository: UserRepository,
         identity_provider: IdProvider,
         company_repository: CompanyRepository,
+        controller_cache: ControllerCache,
+        principal_storage: PrincipalStorage,
     ) -> None:
         self.location_repository = location_repository
         self.controller_repository = controller_repository
         self.user_repository = user_repository
         self.identity_provider = identity_provider
         self.company_repository = company_repository
+        self.controller_cache = controller_cache
+        self.principal_storage = principal_storage
 
     async def create_location(
         self, data: CreateLocationRequest
@@ -50,6 +56,8 @@ class LocationService:
         )
         self.location_repository.add(location)
         await self.location_repository.commit()
+        # the owner's principal lists the locations of their companies
+        await self.principal_storage.invalidate_all()
 
         return CreateLocationResponse(location_id=location.id)
 
@@ -98,6 +106,7 @@ class LocationService:
                 setattr(location, key, value)
 
         await self.location_repository.commit()
+        await self.controller_cache.invalidate_all()
 
     async def attach_location_to_company(
         self, data: AttachLocationToCompanyRequest
@@ -113,6 +122,8 @@ class LocationService:
 
         location.company_id = data.company_id
         await self.location_repository.commit()
+        await self.controller_cache.invalidate_all()
+        await self.principal_storage.invalidate_all()
 
     async def delete(self, data: DeleteLocationRequest) -> None:
         await self.identity_provider.ensure_superadmin()
@@ -123,3 +134,5 @@ class LocationService:
 
         await self.location_repository.delete(location)
         await self.location_repository.commit()
+        await self.controller_cache.invalidate_all()
+        await self.principal_storage.invalidate_all()
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class HistogramDTO(BaseModel):
+    count: int
+    avg: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class ReadMetricsResponse(BaseModel):
+    counters: dict[str, int]
+    gauges: dict[str, float]
+    histograms: dict[str, HistogramDTO]
@@ -0,0 +1,12 @@
+from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.metrics import metrics
+from dash.services.metrics.dto import ReadMetricsResponse
+
+
+class MetricsService:
+    def __init__(self, identity_provider: IdProvider) -> None:
+        self.identity_provider = identity_provider
+
+    async def read_metrics(self) -> ReadMetricsResponse:
+        await self.identity_provider.ensure_superadmin()
+        return ReadMetricsResponse.model_validate(metrics.snapshot())
@@ -6,7 +6,8 @@ from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from dash.models.payment import PaymentStatus, PaymentType, PaymentGatewayType
 from dash.services.common.errors.base import ValidationError
-from dash.services.common.pagination import Pagination
+from dash.services.common.export import ExportFormat
+from dash.services.common.pagination import CursorPagination
 
 
 class BasePaymentFilters(BaseModel):
@@ -58,7 +59,7 @@ class PublicPaymentScheme(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class ReadPaymentListRequest(Pagination, BasePaymentFilters):
+class ReadPaymentListRequest(CursorPagination, BasePaymentFilters):
     date_from: datetime | None = None
     date_to: datetime | None = None
     masked_pan: str | None = Field(default=None, min_length=16, max_length=16)
@@ -76,9 +77,29 @@ class ReadPaymentListRequest(Pagination, BasePaymentFilters):
         return values
 
 
+class ExportPaymentListRequest(BasePaymentFilters):
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    masked_pan: str | None = Field(default=None, min_length=16, max_length=16)
+    format: ExportFormat = ExportFormat.CSV
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if (
+            values.get("date_from")
+            and values.get("date_to")
+            and values["date_from"] > values["date_to"]
+        ):
+            raise ValidationError("date_from should be less than date_to")
+
+        return values
+
+
 class ReadPaymentListResponse(BaseModel):
     payments: list[PaymentScheme]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
 
 
 class ReadPublicPaymentListRequest(BaseModel):
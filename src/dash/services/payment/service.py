@@ -1,14 +1,20 @@
-from typing import Sequence
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncResult
 
 from dash.infrastructure.acquiring.checkbox import CheckboxService
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.location import LocationRepository
 from dash.infrastructure.repositories.payment import PaymentRepository
-from dash.models.admin_user import AdminRole, AdminUser
+from dash.models.admin_user import AdminRole
 from dash.models.payment import Payment
 from dash.services.common.errors.base import AccessForbiddenError
+from dash.services.common.export import iter_export
+from dash.services.common.pagination import get_next_cursor
 from dash.services.payment.dto import (
+    ExportPaymentListRequest,
     PaymentScheme,
     PublicPaymentScheme,
     ReadPaymentListRequest,
@@ -34,8 +40,8 @@ class PaymentService:
         self.checkbox_service = checkbox_service
 
     async def _get_payments_by_role(
-        self, data: ReadPaymentListRequest, user: AdminUser
-    ) -> tuple[Sequence[Payment], int]:
+        self, data: ReadPaymentListRequest, user: Principal
+    ) -> tuple[Sequence[Payment], int | None]:
         match user.role:
             case AdminRole.SUPERADMIN:
                 return await self.payment_repository.get_list_all(data)
@@ -46,6 +52,43 @@ class PaymentService:
             case _:
                 raise AccessForbiddenError
 
+    async def _stream_export_by_role(
+        self, data: ExportPaymentListRequest, user: Principal
+    ) -> AsyncResult:
+        match user.role:
+            case AdminRole.SUPERADMIN:
+                return await self.payment_repository.stream_export_all(data)
+            case AdminRole.COMPANY_OWNER:
+                return await self.payment_repository.stream_export_by_owner(
+                    data, user.id
+                )
+            case AdminRole.LOCATION_ADMIN:
+                return await self.payment_repository.stream_export_by_admin(
+                    data, user.id
+                )
+            case _:
+                raise AccessForbiddenError
+
+    async def export_payments(
+        self, data: ExportPaymentListRequest
+    ) -> AsyncIterator[bytes]:
+        user = await self.identity_provider.authorize()
+
+        if data.controller_id:
+            controller = await self.controller_repository.get(data.controller_id)
+            await self.identity_provider.ensure_location_admin(
+                controller and controller.location_id
+            )
+            result = await self.payment_repository.stream_export_all(data)
+
+        elif data.location_id:
+            await self.identity_provider.ensure_location_admin(data.location_id)
+            result = await self.payment_repository.stream_export_all(data)
+        else:
+            result = await self._stream_export_by_role(data, user)
+
+        return iter_export(data.format, list(result.keys()), result)
+
     async def read_payments(
         self, data: ReadPaymentListRequest
     ) -> ReadPaymentListResponse:
@@ -67,6 +110,7 @@ class PaymentService:
         return ReadPaymentListResponse(
             payments=[PaymentScheme.model_validate(payment) for payment in payments],
             total=total,
+            next_cursor=get_next_cursor(payments, data),
         )
 
     async def read_payments_public(
@@ -0,0 +1,265 @@
+import asyncio
+import contextlib
+import time
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator
+
+from dishka import AsyncContainer, Scope
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from structlog import get_logger
+
+from dash.infrastructure.acquiring.monopay import MonopayGateway
+from dash.infrastructure.auth.background_request import background_request
+from dash.infrastructure.live_events import LiveEvents, LiveEventType
+from dash.infrastructure.metrics import metrics
+from dash.infrastructure.repositories.acquiring_webhook import (
+    AcquiringWebhookRepository,
+)
+from dash.infrastructure.repositories.controller import ControllerRepository
+from dash.infrastructure.repositories.payment import PaymentRepository
+from dash.main.config import AppConfig
+from dash.models.acquiring_webhook import AcquiringWebhook, AcquiringWebhookStatus
+from dash.models.controllers.controller import Controller
+from dash.models.payment import Payment, PaymentGatewayType
+from dash.services.common.utils import unify_pan_mask
+from dash.services.iot.base import BaseIoTService
+from dash.services.iot.factory import IoTServiceFactory
+
+logger = get_logger()
+
+
+class AcquiringWebhookWorker:
+    WORKERS = 8
+    POLL_INTERVAL = 1
+    DEPTH_REPORT_INTERVAL = 30
+    # a hold waits for the device reply and possibly a refund
+    LEASE = timedelta(minutes=2)
+    MAX_ATTEMPTS = 8
+    BASE_BACKOFF = timedelta(seconds=5)
+    MAX_BACKOFF = timedelta(minutes=10)
+
+    def __init__(
+        self,
+        di_container: AsyncContainer,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        config: AppConfig,
+    ) -> None:
+        self.di_container = di_container
+        self.sessionmaker = sessionmaker
+        self.config = config
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run_worker()) for _ in range(self.WORKERS)
+        ]
+        self._tasks.append(asyncio.create_task(self._report_depth()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def notify(self) -> None:
+        # webhooks accepted by this replica are picked up without waiting
+        # for the poll, the others find them on their next poll
+        self._wakeup.set()
+
+    async def _run_worker(self) -> None:
+        while True:
+            try:
+                processed = await self.process_next()
+            except Exception:
+                logger.exception("Acquiring webhook worker failed")
+                processed = False
+
+            if not processed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.POLL_INTERVAL)
+                self._wakeup.clear()
+
+    async def _report_depth(self) -> None:
+        while True:
+            try:
+                async with self.sessionmaker() as session:
+                    depth = await AcquiringWebhookRepository(session).count_pending()
+                metrics.gauge("acquiring_webhook.queue_depth", depth)
+            except Exception:
+                logger.exception("Failed to report acquiring webhook queue depth")
+
+            await asyncio.sleep(self.DEPTH_REPORT_INTERVAL)
+
+    async def process_next(self) -> bool:
+        async with self.sessionmaker() as session:
+            repository = AcquiringWebhookRepository(session)
+            webhook = await repository.claim(self.LEASE)
+            await session.commit()
+            if webhook is None:
+                return False
+
+            superseded = await repository.is_superseded(webhook)
+            # release the connection while the gateway and the device are called
+            await session.commit()
+
+            started = time.perf_counter()
+            try:
+                if superseded:
+                    result = "stale"
+                else:
+                    await self._process(webhook)
+                    result = "done"
+            except Exception as e:
+                result = self._retry(webhook, e)
+            else:
+                webhook.status = AcquiringWebhookStatus.DONE
+                webhook.last_error = None
+
+            await session.commit()
+
+        metrics.incr(
+            "acquiring_webhook.processed", result=result, gateway=webhook.gateway_type
+        )
+        metrics.observe(
+            "acquiring_webhook.duration",
+            time.perf_counter() - started,
+            result=result,
+            gateway=webhook.gateway_type,
+        )
+        metrics.observe(
+            "acquiring_webhook.lag",
+            (datetime.now(self.config.timezone) - webhook.created_at).total_seconds(),
+            gateway=webhook.gateway_type,
+        )
+        return True
+
+    def _retry(self, webhook: AcquiringWebhook, error: Exception) -> str:
+        webhook.last_error = str(error)
+
+        if webhook.attempts >= self.MAX_ATTEMPTS:
+            webhook.status = AcquiringWebhookStatus.DEAD
+            logger.error(
+                "Acquiring webhook dead-lettered",
+                webhook_id=webhook.id,
+                invoice_id=webhook.invoice_id,
+                attempts=webhook.attempts,
+                error=str(error),
+            )
+            return "dead"
+
+        backoff = min(self.BASE_BACKOFF * 2 ** (webhook.attempts - 1), self.MAX_BACKOFF)
+        webhook.run_at = datetime.now(self.config.timezone) + backoff
+
+        logger.warning(
+            "Acquiring webhook failed, retrying",
+            webhook_id=webhook.id,
+            invoice_id=webhook.invoice_id,
+            attempts=webhook.attempts,
+            retry_in=backoff.total_seconds(),
+            exc_info=error,
+        )
+        return "retry"
+
+    async def _process(self, webhook: AcquiringWebhook) -> None:
+        async with self.di_container(
+            scope=Scope.REQUEST, context={Request: background_request}
+        ) as container:
+            payment_repository = await container.get(PaymentRepository)
+            controller_repository = await container.get(ControllerRepository)
+
+            payment = await payment_repository.get_by_invoice_id(webhook.invoice_id)
+            if not payment or not payment.controller_id:
+                return
+
+            controller = await controller_repository.get(payment.controller_id)
+            if not controller:
+                return
+
+            factory = await container.get(IoTServiceFactory)
+            service = factory.get(controller.type)
+
+            match webhook.gateway_type:
+                case PaymentGatewayType.MONOPAY:
+                    monopay_service = await container.get(MonopayGateway)
+                    await self._process_monopay(
+                        webhook.payload, payment, controller, service, monopay_service
+                    )
+                case PaymentGatewayType.LIQPAY:
+                    await self._process_liqpay(webhook.payload, payment, service)
+
+            await publish_payment(await container.get(LiveEvents), payment)
+
+    async def _process_monopay(
+        self,
+        data: dict[str, Any],
+        payment: Payment,
+        controller: Controller,
+        service: BaseIoTService,
+        monopay_service: MonopayGateway,
+    ) -> None:
+        status = data["status"]
+
+        if pan := await monopay_service.request_pan(data["invoiceId"], controller):
+            payment.masked_pan = unify_pan_mask(pan)
+
+        if status == "hold":
+            await service.process_hold_status(payment)
+        elif status == "processing":
+            await service.process_processing_status(payment)
+        elif status == "success":
+            await service.process_success_status(payment)
+        elif status == "reversed":
+            await service.process_reversed_status(payment)
+        elif status == "failure":
+            await service.process_failed_status(payment, data["failureReason"])
+
+    async def _process_liqpay(
+        self, data: dict[str, Any], payment: Payment, service: BaseIoTService
+    ) -> None:
+        status = data["status"]
+
+        if pan := data.get("sender_card_mask2"):
+            payment.masked_pan = unify_pan_mask(pan)
+
+        if status == "hold_wait":
+            await service.process_hold_status(payment)
+        elif status == "processing":
+            await service.process_processing_status(payment)
+        elif status in ("success", "wait_compensation"):
+            await service.process_success_status(payment)
+        elif status == "reversed":
+            await service.process_reversed_status(payment)
+        elif status in ("failed", "error"):
+            await service.process_failed_status(payment, data["err_description"])
+
+
+async def publish_payment(live_events: LiveEvents, payment: Payment) -> None:
+    # the payment is committed, a dashboard missing the update only reloads later
+    if payment.controller_id is None:
+        return
+
+    try:
+        await live_events.publish(
+            LiveEventType.PAYMENT,
+            payment.controller_id,
+            {
+                "id": payment.id,
+                "status": payment.status,
+                "amount": payment.amount,
+                "gateway_type": payment.gateway_type,
+            },
+        )
+    except Exception:
+        logger.exception("Failed to publish payment", payment_id=payment.id)
+
+
+async def get_acquiring_webhook_worker(
+    di_container: AsyncContainer,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    config: AppConfig,
+) -> AsyncIterator[AcquiringWebhookWorker]:
+    worker = AcquiringWebhookWorker(di_container, sessionmaker, config)
+    worker.start()
+    yield worker
+    await worker.close()
@@ -9,7 +9,8 @@ from dash.models.transactions.laundry import LaundrySessionStatus
 from dash.models.transactions.transaction import TransactionType
 from dash.services.common.dto import BaseFilters
 from dash.services.common.errors.base import ValidationError
-from dash.services.common.pagination import Pagination
+from dash.services.common.export import ExportFormat
+from dash.services.common.pagination import CursorPagination
 from dash.services.iot.car_cleaner.dto import (
     CarCleanerTariffDTO,
     CarCleanerServicesIntListDTO,
@@ -112,7 +113,7 @@ TRANSACTION_SCHEME_TYPE = (
 )
 
 
-class ReadTransactionListRequest(Pagination, BaseFilters):
+class ReadTransactionListRequest(CursorPagination, BaseFilters):
     date_from: datetime | None = None
     date_to: datetime | None = None
 
@@ -129,6 +130,25 @@ class ReadTransactionListRequest(Pagination, BaseFilters):
         return values
 
 
+class ExportTransactionListRequest(BaseFilters):
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    format: ExportFormat = ExportFormat.CSV
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if (
+            values.get("date_from")
+            and values.get("date_to")
+            and values["date_from"] > values["date_to"]
+        ):
+            raise ValidationError("date_from should be less than date_to")
+
+        return values
+
+
 class ReadTransactionListResponse(BaseModel):
     transactions: list[TRANSACTION_SCHEME_TYPE]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
@@ -1,15 +1,21 @@
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 
+from sqlalchemy.ext.asyncio import AsyncResult
+
+from dash.infrastructure.auth.dto import Principal
 from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.repositories.controller import ControllerRepository
 from dash.infrastructure.repositories.location import LocationRepository
 from dash.infrastructure.repositories.transaction import TransactionRepository
-from dash.models.admin_user import AdminRole, AdminUser
+from dash.models.admin_user import AdminRole
 from dash.models.transactions.transaction import Transaction, TransactionType
 from dash.services.common.errors.base import AccessForbiddenError
+from dash.services.common.export import iter_export
+from dash.services.common.pagination import get_next_cursor
 from dash.services.transaction.dto import (
     CarCleanerTransactionScheme,
     CarwashTransactionScheme,
+    ExportTransactionListRequest,
     FiscalizerTransactionScheme,
     LaundryTransactionScheme,
     ReadTransactionListRequest,
@@ -33,8 +39,8 @@ class TransactionService:
         self.controller_repository = controller_repository
 
     async def _get_transactions_by_role(
-        self, data: ReadTransactionListRequest, user: AdminUser
-    ) -> tuple[Sequence[Transaction], int]:
+        self, data: ReadTransactionListRequest, user: Principal
+    ) -> tuple[Sequence[Transaction], int | None]:
         match user.role:
             case AdminRole.SUPERADMIN:
                 return await self.transaction_repository.get_list_all(data)
@@ -49,6 +55,45 @@ class TransactionService:
             case _:
                 raise AccessForbiddenError
 
+    async def _stream_export_by_role(
+        self, data: ExportTransactionListRequest, user: Principal
+    ) -> AsyncResult:
+        match user.role:
+            case AdminRole.SUPERADMIN:
+                return await self.transaction_repository.stream_export_all(data)
+            case AdminRole.COMPANY_OWNER:
+                return await self.transaction_repository.stream_export_by_owner(
+                    data, user.id
+                )
+            case AdminRole.LOCATION_ADMIN:
+                return await self.transaction_repository.stream_export_by_admin(
+                    data, user.id
+                )
+            case _:
+                raise AccessForbiddenError
+
+    async def export_transactions(
+        self, data: ExportTransactionListRequest
+    ) -> AsyncIterator[bytes]:
+        user = await self.identity_provider.authorize()
+
+        if data.controller_id:
+            controller = await self.controller_repository.get(data.controller_id)
+            await self.identity_provider.ensure_location_admin(
+                controller and controller.location_id
+            )
+            result = await self.transaction_repository.stream_export_all(data)
+
+        elif data.location_id:
+            await self.identity_provider.ensure_location_admin(
+                location_id=data.location_id
+            )
+            result = await self.transaction_repository.stream_export_all(data)
+        else:
+            result = await self._stream_export_by_role(data, user)
+
+        return iter_export(data.format, list(result.keys()), result)
+
     async def read_transactions(
         self, data: ReadTransactionListRequest
     ) -> ReadTransactionListResponse:
@@ -98,4 +143,8 @@ class TransactionService:
             else:
                 raise ValueError("Unknown transaction type")
 
-        return ReadTransactionListResponse(transactions=transaction_list, total=total)
+        return ReadTransactionListResponse(
+            transactions=transaction_list,
+            total=total,
+            next_cursor=get_next_cursor(transactions, data),
+        )
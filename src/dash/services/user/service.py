@@ -4,6 +4,7 @@ from dash.infrastructure.auth.id_provider import IdProvider
 from dash.infrastructure.auth.password_processor import PasswordProcessor
 from dash.infrastructure.repositories.location import LocationRepository
 from dash.infrastructure.repositories.user import UserRepository
+from dash.infrastructure.storages.principal import PrincipalStorage
 from dash.models.admin_user import AdminRole, AdminUser
 from dash.models.location_admin import LocationAdmin
 from dash.services.common.errors.base import AccessForbiddenError, ValidationError
@@ -31,11 +32,13 @@ class UserService:
         location_repository: LocationRepository,
         identity_provider: IdProvider,
         password_processor: PasswordProcessor,
+        principal_storage: PrincipalStorage,
     ) -> None:
         self.user_repository = user_repository
         self.location_repository = location_repository
         self.identity_provider = identity_provider
         self.password_processor = password_processor
+        self.principal_storage = principal_storage
 
     async def _create_user(
         self, data: CreateUserRequest, role: AdminRole
@@ -96,6 +99,7 @@ class UserService:
 
         self.user_repository.add(admin)
         await self.user_repository.commit()
+        await self.principal_storage.invalidate(user.id)
 
         return AddLocationAdminResponse(user=new_user_dto)
 
@@ -111,6 +115,7 @@ class UserService:
 
         await self.user_repository.delete_location_admin(data.user_id, data.location_id)
         await self.user_repository.commit()
+        await self.principal_storage.invalidate(data.user_id)
 
     async def delete_user(self, data: DeleteUserRequest) -> None:
         user = await self.user_repository.get(data.id)
@@ -126,6 +131,7 @@ class UserService:
 
         await self.user_repository.delete_user(user)
         await self.user_repository.commit()
+        await self.principal_storage.invalidate(user.id)
 
     async def read_users(self) -> ReadUserListResponse:
         user = await self.identity_provider.authorize()
@@ -173,3 +179,4 @@ class UserService:
         user.is_blocked = data.is_blocked
 
         await self.user_repository.commit()
+        await self.principal_storage.invalidate(user.id)
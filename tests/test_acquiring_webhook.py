@@ -0,0 +1,165 @@
+from datetime import UTC, datetime
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.acquiring.liqpay import LiqpayGateway
+from dash.infrastructure.iot.wsm.client import WsmIoTClient
+from dash.infrastructure.repositories.acquiring_webhook import (
+    AcquiringWebhookRepository,
+)
+from dash.main.config import AppConfig
+from dash.models.acquiring_webhook import AcquiringWebhook, AcquiringWebhookStatus
+from dash.models.payment import (
+    Payment,
+    PaymentGatewayType,
+    PaymentStatus,
+    PaymentType,
+)
+from dash.services.common.payment_helper import PaymentHelper
+from dash.services.payment.webhook_worker import AcquiringWebhookWorker
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+INVOICE_ID = "test_invoice_id"
+
+
+@pytest.fixture
+async def payment(
+    request_di_container: AsyncContainer, test_env: TestEnvironment
+) -> Payment:
+    payment_helper = await request_di_container.get(PaymentHelper)
+
+    payment = payment_helper.create_payment(
+        controller_id=test_env.controller_1.id,
+        location_id=test_env.location_1.id,
+        amount=100,
+        payment_type=PaymentType.CASHLESS,
+        gateway_type=PaymentGatewayType.LIQPAY,
+        invoice_id=INVOICE_ID,
+    )
+    await payment_helper.save_and_commit(payment)
+    return payment
+
+
+async def enqueue(repository: AcquiringWebhookRepository, status: str, ts: int) -> bool:
+    return await repository.enqueue(
+        PaymentGatewayType.LIQPAY,
+        INVOICE_ID,
+        status,
+        datetime.fromtimestamp(ts, UTC),
+        {"status": status, "order_id": INVOICE_ID},
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_acquiring_webhooks_processed_in_order(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    payment: Payment,
+):
+    repository = await request_di_container.get(AcquiringWebhookRepository)
+    # delivered out of order and retried by the gateway
+    assert await enqueue(repository, "success", 2)
+    assert await enqueue(repository, "processing", 1)
+    assert not await enqueue(repository, "success", 2)
+    await repository.commit()
+
+    sessionmaker = await di_container.get(async_sessionmaker[AsyncSession])
+    worker = AcquiringWebhookWorker(
+        di_container, sessionmaker, await di_container.get(AppConfig)
+    )
+    assert await worker.process_next()
+    async with sessionmaker() as session:
+        assert (await session.get(Payment, payment.id)).status == (  # type: ignore
+            PaymentStatus.PROCESSING
+        )
+
+    assert await worker.process_next()
+    assert not await worker.process_next()
+
+    # a late delivery older than the processed one is not applied
+    assert await enqueue(repository, "processing", 0)
+    await repository.commit()
+    assert await worker.process_next()
+
+    async with sessionmaker() as session:
+        assert (await session.get(Payment, payment.id)).status == (  # type: ignore
+            PaymentStatus.COMPLETED
+        )
+        webhooks = (await session.scalars(select(AcquiringWebhook))).all()
+    assert len(webhooks) == 3
+    assert all(w.status == AcquiringWebhookStatus.DONE for w in webhooks)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hold_is_sent_to_device_once(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    payment: Payment,
+    mocker,
+):
+    client = await di_container.get(WsmIoTClient)
+    set_payment = mocker.patch.object(client, "set_payment")
+    mocker.patch.object(LiqpayGateway, "finalize", side_effect=Exception("down"))
+
+    repository = await request_di_container.get(AcquiringWebhookRepository)
+    sessionmaker = await di_container.get(async_sessionmaker[AsyncSession])
+    worker = AcquiringWebhookWorker(
+        di_container, sessionmaker, await di_container.get(AppConfig)
+    )
+
+    # the gateway repeats the hold, the device must not be credited twice
+    for ts in (1, 2):
+        assert await enqueue(repository, "hold_wait", ts)
+        await repository.commit()
+        assert await worker.process_next()
+
+    set_payment.assert_awaited_once()
+    async with sessionmaker() as session:
+        assert (await session.get(Payment, payment.id)).status == (  # type: ignore
+            PaymentStatus.HOLD
+        )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_late_webhook_waits_for_leased_one(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    payment: Payment,
+    mocker,
+):
+    repository = await request_di_container.get(AcquiringWebhookRepository)
+    sessionmaker = await di_container.get(async_sessionmaker[AsyncSession])
+    config = await di_container.get(AppConfig)
+    worker = AcquiringWebhookWorker(di_container, sessionmaker, config)
+    other_worker = AcquiringWebhookWorker(di_container, sessionmaker, config)
+    process = worker._process
+
+    async def late_delivery_while_processing(webhook: AcquiringWebhook) -> None:
+        async with sessionmaker() as session:
+            assert await enqueue(AcquiringWebhookRepository(session), "processing", 1)
+            await session.commit()
+        # an older delivery must not run next to the leased newer one
+        assert not await other_worker.process_next()
+        await process(webhook)
+
+    mocker.patch.object(worker, "_process", side_effect=late_delivery_while_processing)
+    assert await enqueue(repository, "success", 2)
+    await repository.commit()
+    assert await worker.process_next()
+
+    # once the newer one is done, the late one is dropped as stale
+    assert await other_worker.process_next()
+    assert not await other_worker.process_next()
+
+    async with sessionmaker() as session:
+        assert (await session.get(Payment, payment.id)).status == (  # type: ignore
+            PaymentStatus.COMPLETED
+        )
+        webhooks = (await session.scalars(select(AcquiringWebhook))).all()
+    assert len(webhooks) == 2
+    assert all(w.status == AcquiringWebhookStatus.DONE for w in webhooks)
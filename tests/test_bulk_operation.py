@@ -0,0 +1,232 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.iot.carwash.client import CarwashIoTClient
+from dash.infrastructure.iot.wsm.client import WsmIoTClient
+from dash.models.admin_user import AdminUser
+from dash.models.bulk_operation import (
+    BulkOperation,
+    BulkOperationItem,
+    BulkOperationItemStatus,
+    BulkOperationStatus,
+    BulkOperationType,
+)
+from dash.models.controllers.controller import Controller, ControllerType
+from dash.services.bulk_operation.dto import (
+    BulkOperationTarget,
+    CreateBulkOperationRequest,
+)
+from dash.services.bulk_operation.runner import BulkOperationRunner
+from dash.services.bulk_operation.service import BulkOperationService
+from dash.services.common.errors.base import ValidationError
+from dash.services.common.errors.controller import ControllerTimeoutError
+from tests.context.settings import carwash_settings
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+async def create_operation(
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    mocker: Mock,
+    target: BulkOperationTarget | None = None,
+    type_: BulkOperationType = BulkOperationType.SET_SETTINGS,
+) -> BulkOperation:
+    service = await request_di_container.get(BulkOperationService)
+    mocker.patch.object(service.bulk_operation_runner, "submit")
+
+    if target is None:
+        target = BulkOperationTarget(
+            location_id=test_env.location_1.id,
+            type=ControllerType.WATER_VENDING,
+        )
+    response = await service.create_bulk_operation(
+        CreateBulkOperationRequest(
+            type=type_,
+            target=target,
+            payload={"maxPayment": 30000}
+            if type_ is BulkOperationType.SET_SETTINGS
+            else {},
+        )
+    )
+    service.bulk_operation_runner.submit.assert_called_once_with(  # type: ignore
+        response.operation_id
+    )
+    return await service.bulk_operation_repository.get(response.operation_id)  # type: ignore
+
+
+async def run_operation(di_container: AsyncContainer, operation: BulkOperation):
+    sessionmaker = await di_container.get(async_sessionmaker[AsyncSession])
+    runner = BulkOperationRunner(di_container, sessionmaker)
+    await runner.run(operation.id)
+
+    async with sessionmaker() as session:
+        operation = await session.get(BulkOperation, operation.id)
+        items = (await session.scalars(select(BulkOperationItem))).all()
+        controllers = (await session.scalars(select(Controller))).unique().all()
+    return operation, items, controllers
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_set_settings(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user: AdminUser,
+    mocker: Mock,
+):
+    operation = await create_operation(request_di_container, test_env, mocker)
+    client = await di_container.get(WsmIoTClient)
+    mocker.patch.object(client, "set_settings")
+
+    operation, items, controllers = await run_operation(di_container, operation)
+
+    assert operation.status == BulkOperationStatus.COMPLETED
+    assert [item.controller_id for item in items] == [test_env.controller_1.id]
+    assert items[0].status == BulkOperationItemStatus.SUCCEEDED
+    assert items[0].attempts == 1
+
+    controller = next(c for c in controllers if c.id == test_env.controller_1.id)
+    assert controller.settings["maxPayment"] == 30000
+    assert controller.settings["minPayPass"] == 100
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_set_settings_failed(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user: AdminUser,
+    mocker: Mock,
+):
+    operation = await create_operation(request_di_container, test_env, mocker)
+    client = await di_container.get(WsmIoTClient)
+    mocker.patch.object(client, "set_settings", side_effect=ControllerTimeoutError)
+    mocker.patch.object(BulkOperationRunner, "BASE_BACKOFF", 0)
+
+    operation, items, _ = await run_operation(di_container, operation)
+
+    assert operation.status == BulkOperationStatus.COMPLETED
+    assert items[0].status == BulkOperationItemStatus.FAILED
+    assert items[0].attempts == BulkOperationRunner.MAX_ATTEMPTS
+    assert items[0].error == ControllerTimeoutError.message
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_set_settings_failed_keeps_settings(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user: AdminUser,
+    mocker: Mock,
+):
+    operation = await create_operation(
+        request_di_container,
+        test_env,
+        mocker,
+        target=BulkOperationTarget(
+            controller_ids=[test_env.controller_2.id], type=ControllerType.CARWASH
+        ),
+    )
+    client = await di_container.get(CarwashIoTClient)
+    mocker.patch.object(client, "set_settings", side_effect=ControllerTimeoutError)
+    mocker.patch.object(BulkOperationRunner, "BASE_BACKOFF", 0)
+
+    operation, items, controllers = await run_operation(di_container, operation)
+
+    assert items[0].status == BulkOperationItemStatus.FAILED
+    controller = next(c for c in controllers if c.id == test_env.controller_2.id)
+    assert controller.settings == carwash_settings
+
+
+@pytest.mark.parametrize(
+    "target, payload",
+    [
+        (BulkOperationTarget(location_id=uuid4()), {"maxPayment": 30000}),
+        (
+            BulkOperationTarget(location_id=uuid4(), type=ControllerType.CARWASH),
+            {"maxPayment": "unlimited"},
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_set_settings_payload_validated(
+    target: BulkOperationTarget, payload: dict
+):
+    with pytest.raises(ValidationError):
+        CreateBulkOperationRequest(
+            type=BulkOperationType.SET_SETTINGS, target=target, payload=payload
+        )
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_operation_runs_once(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user: AdminUser,
+    mocker: Mock,
+):
+    operation = await create_operation(request_di_container, test_env, mocker)
+    runner = BulkOperationRunner(
+        di_container, await di_container.get(async_sessionmaker[AsyncSession])
+    )
+    run_claimed = mocker.patch.object(runner, "_run_claimed")
+
+    await runner.run(operation.id)
+    await runner.run(operation.id)
+
+    run_claimed.assert_awaited_once_with(operation.id)
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_interrupted_reboot_is_not_resumed(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user: AdminUser,
+    mocker: Mock,
+):
+    settings = await create_operation(request_di_container, test_env, mocker)
+    reboot = await create_operation(
+        request_di_container, test_env, mocker, type_=BulkOperationType.REBOOT
+    )
+    sessionmaker = await di_container.get(async_sessionmaker[AsyncSession])
+    async with sessionmaker() as session:
+        # both were running on a replica that died a while ago
+        await session.execute(
+            update(BulkOperation).values(
+                status=BulkOperationStatus.RUNNING,
+                lease_until=datetime.now(UTC) - timedelta(minutes=1),
+            )
+        )
+        await session.commit()
+
+    runner = BulkOperationRunner(di_container, sessionmaker)
+    submit = mocker.patch.object(runner, "submit")
+    await runner.resume()
+
+    submit.assert_called_once_with(settings.id, claimed=True)
+    async with sessionmaker() as session:
+        reboot = await session.get(BulkOperation, reboot.id)  # type: ignore
+        items = (
+            await session.scalars(
+                select(BulkOperationItem).where(
+                    BulkOperationItem.operation_id == reboot.id  # type: ignore
+                )
+            )
+        ).all()
+    assert reboot.status == BulkOperationStatus.COMPLETED  # type: ignore
+    assert {item.status for item in items} == {BulkOperationItemStatus.FAILED}
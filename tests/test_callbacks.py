@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from unittest.mock import Mock
 
@@ -7,6 +7,7 @@ import pytest
 from dishka import AsyncContainer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dash.infrastructure.energy_recorder import EnergyRecorder
 from dash.infrastructure.iot.car_cleaner.client import CarCleanerIoTClient
 from dash.infrastructure.iot.carwash.client import CarwashIoTClient
 from dash.infrastructure.iot.fiscalizer.client import FiscalizerIoTClient
@@ -133,6 +134,11 @@ async def test_state_info_callback(
     state = await deps.iot_storage.get_state(test_env.controller_1.id)
     assert state == state
 
+    history = await deps.iot_storage.get_state_history(
+        test_env.controller_1.id, None, None, 2000
+    )
+    assert history[-1][1]["summaInBox"] == 500
+
 
 @pytest.mark.parametrize("user", ("location_admin_1",), indirect=["user"])
 @pytest.mark.asyncio(loop_scope="session")
@@ -260,7 +266,7 @@ async def test_sys_callbacks(
         di_container=di_container,  # type: ignore
     )
 
-    state = await deps.iot_storage.get_broker_online_status(device_id)
+    state = await deps.iot_storage.get_broker_online_status(test_env.controller_1.id)
     assert state is True
 
     await deps.mqtt_client.dispatcher.sys_disconnect._process_callbacks(  # type: ignore
@@ -271,7 +277,7 @@ async def test_sys_callbacks(
         di_container=di_container,  # type: ignore
     )
 
-    state = await deps.iot_storage.get_broker_online_status(device_id)
+    state = await deps.iot_storage.get_broker_online_status(test_env.controller_1.id)
     assert state is False
 
 
@@ -307,6 +313,10 @@ async def test_tasmota_callback(
         tasmota_callback_retort.load(payload, EnergyStateDTO)
     )
 
+    # the next reports of the day skip the daily row lookup
+    energy_recorder = await di_container.get(EnergyRecorder)
+    assert energy_recorder.is_day_recorded(test_env.controller_1.id, date(2023, 12, 31))
+
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_fiscalizer_sale_callback(
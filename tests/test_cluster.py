@@ -0,0 +1,82 @@
+import pytest
+from dishka import AsyncContainer
+
+from dash.infrastructure.cluster import ClusterMembership
+from dash.main.config import ClusterConfig
+from dash.presentation.iot_callbacks.common.di_injector import (
+    claimed_request_scope,
+    idempotent_request_scope,
+    request_scope,
+)
+
+MEMBERS = ["replica-1", "replica-2", "replica-3"]
+DEVICES = [f"device-{i}" for i in range(300)]
+
+
+def get_owners(members: list[str]) -> dict[str, str]:
+    replicas = {}
+    for member in members:
+        replica = ClusterMembership(None, ClusterConfig(enabled=True))  # type: ignore
+        replica.replica_id = member
+        replica.members = members
+        replicas[member] = replica
+
+    owners = {}
+    for device_id in DEVICES:
+        [owner] = [m for m, replica in replicas.items() if replica.owns(device_id)]
+        owners[device_id] = owner
+    return owners
+
+
+def test_every_device_has_single_owner():
+    owners = get_owners(MEMBERS)
+
+    assert set(owners.values()) == set(MEMBERS)
+
+
+def test_replica_leaving_moves_only_its_devices():
+    before = get_owners(MEMBERS)
+    after = get_owners(MEMBERS[:2])
+
+    for device_id, owner in before.items():
+        if owner != "replica-3":
+            assert after[device_id] == owner
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_idempotent_callbacks_run_on_every_replica(
+    di_container: AsyncContainer, mocker
+):
+    membership = await di_container.get(ClusterMembership)
+    mocker.patch.object(membership, "owns", return_value=False)
+    handled = []
+
+    async def callback(device_id: str, data: dict, di_container: AsyncContainer):
+        handled.append(device_id)
+
+    await request_scope(callback)("device-1", {}, di_container=di_container)
+    await idempotent_request_scope(callback)("device-2", {}, di_container=di_container)
+
+    assert handled == ["device-2"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_claimed_callbacks_run_once_on_any_replica(
+    di_container: AsyncContainer, mocker
+):
+    membership = await di_container.get(ClusterMembership)
+    # no replica thinks it owns the device, as while the members are changing
+    mocker.patch.object(membership, "owns", return_value=False)
+    mocker.patch.object(membership.config, "enabled", True)
+    handled = []
+
+    async def callback(device_id: str, data: dict, di_container: AsyncContainer):
+        handled.append(data["request_id"])
+
+    # the same broadcast as seen by two replicas, then the next request
+    claimed = claimed_request_scope(callback)
+    await claimed("device-1", {"request_id": 1}, di_container=di_container)
+    await claimed("device-1", {"request_id": 1}, di_container=di_container)
+    await claimed("device-1", {"request_id": 2}, di_container=di_container)
+
+    assert handled == [1, 2]
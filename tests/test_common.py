@@ -1,9 +1,14 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from dishka import AsyncContainer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dash.infrastructure.controllers_online_monitor import ControllersOnlineMonitor
+from dash.infrastructure.storages.iot import IoTStorage
 from dash.models.controllers.controller import Controller
+from dash.services.common.check_online_interactor import CheckOnlineInteractor
 from tests.environment import TestEnvironment
 
 
@@ -18,3 +23,78 @@ async def test_hybrid_property(
     stmt = select(Controller).where(Controller.company_id == test_env.company_1.id)
     result = await db_session.scalar(stmt)
     assert result == test_env.controller_1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_check_many_online(
+    create_tables, request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    iot_storage = await request_di_container.get(IoTStorage)
+    check_online = await request_di_container.get(CheckOnlineInteractor)
+
+    now = datetime.now(UTC)
+    online, stale, offline = (
+        test_env.controller_1,
+        test_env.controller_2,
+        test_env.controller_3,
+    )
+
+    await iot_storage.set_state({"billState": 1, "created": now.isoformat()}, online.id)
+    await iot_storage.set_broker_online_status(True, online.id)
+
+    await iot_storage.set_state(
+        {"created": (now - timedelta(minutes=10)).isoformat()}, stale.id
+    )
+    await iot_storage.set_broker_online_status(True, stale.id)
+
+    await iot_storage.set_broker_online_status(False, offline.id)
+
+    result = await check_online.check_many([online, stale, offline])
+
+    assert result == {online.id: True, stale.id: False, offline.id: False}
+    assert await check_online(online) is True
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_state_without_created(
+    create_tables, request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    iot_storage = await request_di_container.get(IoTStorage)
+    controller_id = test_env.controller_1.id
+
+    await iot_storage.set_state(
+        {"created": datetime.now(UTC).isoformat()}, controller_id
+    )
+    await iot_storage.set_state({"billState": 1, "created": None}, controller_id)
+
+    assert await iot_storage.get_state(controller_id) == {
+        "billState": 1,
+        "created": None,
+    }
+    [(created, _)] = await iot_storage.get_online_markers([controller_id])
+    assert created is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_online_monitor_sweep(
+    create_tables, request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    iot_storage = await request_di_container.get(IoTStorage)
+    monitor = await request_di_container.get(ControllersOnlineMonitor)
+    controller = test_env.controller_1
+
+    now = datetime.now(UTC)
+    await iot_storage.set_broker_online_status(True, controller.id)
+    await iot_storage.set_state({"created": now.isoformat()}, controller.id)
+    await monitor.on_state(controller, now)
+    assert await iot_storage.get_last_online_status(controller.id) is True
+
+    await monitor.sweep()
+    assert await iot_storage.get_last_online_status(controller.id) is True
+
+    created = now - timedelta(minutes=5)
+    await iot_storage.set_state({"created": created.isoformat()}, controller.id)
+    await iot_storage.touch_last_seen({controller.device_id: created})
+
+    await monitor.sweep()
+    assert await iot_storage.get_last_online_status(controller.id) is False
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.controller_cache import ControllerCache
+from dash.models.controllers.controller import Controller
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+@pytest.fixture
+async def cache(di_container: AsyncContainer) -> ControllerCache:
+    # a private instance, the shared one is warmed by other tests
+    return ControllerCache(
+        await di_container.get(Redis),
+        await di_container.get(async_sessionmaker[AsyncSession]),
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cache_hit(cache: ControllerCache, test_env: TestEnvironment, mocker):
+    load = mocker.spy(cache, "_load")
+
+    first = await cache.get_by_device_id(test_env.controller_1.device_id)
+    second = await cache.get_by_device_id(test_env.controller_1.device_id)
+
+    assert first is not None
+    assert first.id == test_env.controller_1.id
+    assert second is first
+    assert load.call_count == 1
+
+    assert await cache.get_by_device_id("unknown") is None
+    assert await cache.get_by_device_id("unknown") is None
+    assert load.call_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_invalidate_after_commit(
+    cache: ControllerCache,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+):
+    device_id = test_env.controller_1.device_id
+    assert (await cache.get_by_device_id(device_id)).name != "renamed"  # type: ignore
+
+    session = await request_di_container.get(AsyncSession)
+    await session.execute(
+        update(Controller)
+        .where(Controller.id == test_env.controller_1.id)
+        .values(name="renamed")
+    )
+    await session.commit()
+
+    # still served from memory until invalidated
+    assert (await cache.get_by_device_id(device_id)).name != "renamed"  # type: ignore
+
+    await cache.invalidate(device_id)
+    assert (await cache.get_by_device_id(device_id)).name == "renamed"  # type: ignore
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_loads_are_coalesced(
+    cache: ControllerCache, test_env: TestEnvironment, mocker
+):
+    load = mocker.spy(cache, "_load")
+
+    controllers = await asyncio.gather(
+        *(cache.get_by_device_id(test_env.controller_2.device_id) for _ in range(10))
+    )
+
+    assert load.call_count == 1
+    assert {controller.id for controller in controllers} == {  # type: ignore
+        test_env.controller_2.id
+    }
@@ -5,17 +5,27 @@ import pytest
 from dishka import AsyncContainer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dash.infrastructure.energy_recorder import EnergyRecorder
+from dash.infrastructure.repositories.controller_state_sample import (
+    ControllerStateSampleRepository,
+)
+from dash.infrastructure.state_history_sampler import persist_state_history
+from dash.infrastructure.storages.iot import IoTStorage
 from dash.models.energy_state import DailyEnergyState
 from dash.services.common.errors.controller import (
     ControllerNotFoundError,
     TasmotaIDAlreadyTakenError,
 )
 from dash.services.controller.dto import (
+    EnergyInterval,
     GetEnergyStatsRequest,
     ReadControllerListRequest,
+    ReadEnergySamplesRequest,
+    ReadStateHistoryRequest,
     SetupTasmotaRequest,
 )
 from dash.services.controller.service import ControllerService
+from dash.services.iot.dto import EnergyStateDTO
 from tests.environment import TestEnvironment
 
 pytestmark = pytest.mark.usefixtures("create_tables")
@@ -95,3 +105,106 @@ async def test_read_controllers(
 
     response = await controller_service.read_controllers(ReadControllerListRequest())
     assert len(response.controllers) == 7
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_read_state_history(
+    request_di_container: AsyncContainer,
+    di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user,
+):
+    controller_service = await request_di_container.get(ControllerService)
+    iot_storage = await request_di_container.get(IoTStorage)
+    controller_id = test_env.controller_2.id
+    started = datetime.now(UTC)
+
+    for i in range(3):
+        await iot_storage.set_state({"summaInBox": i}, controller_id)
+
+    response = await controller_service.read_state_history(
+        ReadStateHistoryRequest(controller_id=controller_id, date_from=started)
+    )
+    assert [item.state for item in response.items] == [
+        {"summaInBox": 0},
+        {"summaInBox": 1},
+        {"summaInBox": 2},
+    ]
+
+    response = await controller_service.read_state_history(
+        ReadStateHistoryRequest(controller_id=controller_id, date_from=started, limit=1)
+    )
+    assert [item.state for item in response.items] == [{"summaInBox": 0}]
+
+    # without a start the latest states are returned
+    response = await controller_service.read_state_history(
+        ReadStateHistoryRequest(controller_id=controller_id, limit=2)
+    )
+    assert [item.state for item in response.items] == [
+        {"summaInBox": 1},
+        {"summaInBox": 2},
+    ]
+
+    # all three land in one sample interval
+    await persist_state_history(di_container)
+    samples = await (
+        await request_di_container.get(ControllerStateSampleRepository)
+    ).get_range(controller_id, started, None, 10)
+    assert [sample.state for sample in samples] == [{"summaInBox": 0}]
+
+
+@pytest.mark.parametrize("user", ("superadmin",), indirect=["user"])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_read_energy_samples(
+    request_di_container: AsyncContainer,
+    di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    user,
+):
+    controller_service = await request_di_container.get(ControllerService)
+    energy_recorder = await di_container.get(EnergyRecorder)
+    now = datetime.now(UTC)
+    reading = EnergyStateDTO(
+        created=now,
+        energy_today=1.5,
+        energy_yesterday=2.5,
+        energy_total=100.0,
+        energy_total_since=now,
+        power=100.0,
+        apparent_power=120.0,
+        reactive_power=60.0,
+        power_factor=0.8,
+        voltage=220.0,
+        current=0.5,
+    )
+
+    energy_recorder.add(test_env.controller_1.id, reading)
+    energy_recorder.add(
+        test_env.controller_1.id, reading.model_copy(update={"power": 300.0})
+    )
+    await energy_recorder.flush(include_current=True)
+
+    response = await controller_service.read_energy_samples(
+        ReadEnergySamplesRequest(
+            controller_id=test_env.controller_1.id,
+            date_from=now - timedelta(days=1),
+            date_to=now + timedelta(days=1),
+            interval=EnergyInterval.DAY,
+        )
+    )
+    assert len(response.samples) == 1
+    assert response.samples[0].power_avg == 200
+    assert response.samples[0].power_max == 300
+    assert response.samples[0].voltage_avg == 220
+
+    response = await controller_service.read_energy_stats(
+        GetEnergyStatsRequest(
+            controller_id=test_env.controller_1.id,
+            period=1,
+            breakdown=EnergyInterval.HOUR,
+        )
+    )
+    assert sum(point.energy for point in response.breakdown or []) == pytest.approx(
+        200 / 60 / 1000
+    )
@@ -0,0 +1,88 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dash.infrastructure.repositories.daily_revenue import DailyRevenueRepository
+from dash.infrastructure.repositories.payment import PaymentRepository
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.models import TransactionType, WsmTransaction
+from dash.models.payment import Payment, PaymentGatewayType, PaymentStatus, PaymentType
+from dash.services.dashboard.dto import (
+    GetRevenueRequest,
+    ReadPaymentStatsRequest,
+    ReadTransactionStatsRequest,
+)
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_dashboard_stats_with_rollup(
+    request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    db_session = await request_di_container.get(AsyncSession)
+    transaction_repository = await request_di_container.get(TransactionRepository)
+    payment_repository = await request_di_container.get(PaymentRepository)
+    daily_revenue_repository = await request_di_container.get(DailyRevenueRepository)
+
+    now = datetime.now(UTC)
+    for i, days_ago in enumerate((20, 10, 10, 3, 0)):
+        created_at = now - timedelta(days=days_ago)
+        db_session.add(
+            WsmTransaction(
+                controller_transaction_id=i,
+                controller_id=test_env.controller_1.id,
+                location_id=test_env.location_1.id,
+                coin_amount=100,
+                bill_amount=200,
+                qr_amount=300,
+                paypass_amount=400,
+                card_amount=0,
+                type=TransactionType.WATER_VENDING,
+                out_liters_1=1000,
+                out_liters_2=0,
+                sale_type="test",
+                created_at=created_at,
+            )
+        )
+        db_session.add(
+            Payment(
+                controller_id=test_env.controller_1.id,
+                location_id=test_env.location_1.id,
+                amount=400,
+                status=PaymentStatus.COMPLETED,
+                type=PaymentType.CASHLESS,
+                gateway_type=PaymentGatewayType.PAYPASS,
+                created_at=created_at,
+            )
+        )
+    await db_session.flush()
+
+    stats_filters = {
+        "date_from": now - timedelta(days=15),
+        "date_to": now,
+        "location_id": test_env.location_1.id,
+    }
+    revenue_request = GetRevenueRequest(location_id=test_env.location_1.id)
+
+    today = await daily_revenue_repository.get_current_date()
+    await daily_revenue_repository.refresh(today - timedelta(days=30), today)
+
+    transaction_stats = await transaction_repository.get_stats_all(
+        ReadTransactionStatsRequest(**stats_filters)
+    )
+    assert [stat.total for stat in transaction_stats] == [2000, 1000, 1000]
+    assert sum(stat.qr for stat in transaction_stats) == 1200
+
+    payment_stats = await payment_repository.get_stats_all(
+        ReadPaymentStatsRequest(**stats_filters)
+    )
+    assert [stat.total for stat in payment_stats] == [800, 400, 400]
+    assert sum(stat.paypass for stat in payment_stats) == 1600
+
+    revenue = await transaction_repository.get_revenue_all(revenue_request)
+    assert revenue.total == 5000
+    assert revenue.today == 1000
@@ -1,6 +1,6 @@
 import uuid
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime
 
 import pytest
 from dishka import AsyncContainer
@@ -13,6 +13,7 @@ from dash.services.common.errors.encashment import (
     EncashmentAlreadyClosedError,
     EncashmentNotFoundError,
 )
+from dash.services.common.pagination import CountMode
 from dash.services.controller.dto import (
     CloseEncashmentRequest,
     ReadEncashmentListRequest,
@@ -130,3 +131,53 @@ async def test_close_encashment(
         await deps.db_session.refresh(encashment)
         assert encashment.is_closed
         assert encashment.received_amount == 90
+
+
+@pytest.mark.parametrize("user", ["superadmin"], indirect=True)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_read_encashments_by_cursor(
+    deps: EncashmentDependencies, test_env: TestEnvironment, user: AdminUser
+):
+    for i in range(3):
+        deps.db_session.add(
+            Encashment(
+                controller_id=test_env.controller_1.id,
+                coin_1=0,
+                coin_2=0,
+                coin_3=0,
+                coin_4=0,
+                coin_5=0,
+                coin_6=0,
+                bill_1=0,
+                bill_2=0,
+                bill_3=0,
+                bill_4=0,
+                bill_5=0,
+                bill_6=0,
+                bill_7=0,
+                bill_8=0,
+                encashed_amount=i,
+                created_at_controller=datetime(2000, 1, 1 + i, tzinfo=UTC),
+                created_at=datetime(2000, 1, 1 + i, tzinfo=UTC),
+            )
+        )
+    await deps.db_session.commit()
+
+    first_page = await deps.controller_service.read_encashments(
+        ReadEncashmentListRequest(controller_id=test_env.controller_1.id, limit=2)
+    )
+    assert first_page.total == 3
+    assert [e.encashed_amount for e in first_page.encashments] == [2, 1]
+    assert first_page.next_cursor is not None
+
+    second_page = await deps.controller_service.read_encashments(
+        ReadEncashmentListRequest(
+            controller_id=test_env.controller_1.id,
+            limit=2,
+            cursor=first_page.next_cursor,
+            count=CountMode.NONE,
+        )
+    )
+    assert second_page.total is None
+    assert [e.encashed_amount for e in second_page.encashments] == [0]
+    assert second_page.next_cursor is None
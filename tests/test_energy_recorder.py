@@ -0,0 +1,78 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.energy_recorder import EnergyRecorder
+from dash.infrastructure.repositories.energy_state import EnergyStateRepository
+from dash.models.energy_state import EnergySample
+from dash.services.iot.dto import EnergyStateDTO
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+def make_reading(power: float) -> EnergyStateDTO:
+    now = datetime.now(UTC)
+    return EnergyStateDTO(
+        created=now,
+        energy_today=1.5,
+        energy_yesterday=2.5,
+        energy_total=100.0,
+        energy_total_since=now,
+        power=power,
+        apparent_power=120.0,
+        reactive_power=60.0,
+        power_factor=0.8,
+        voltage=220.0,
+        current=0.5,
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cancelled_flush_keeps_samples(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    mocker,
+):
+    energy_recorder = EnergyRecorder(
+        await di_container.get(async_sessionmaker[AsyncSession])
+    )
+    upsert_samples = EnergyStateRepository.upsert_samples
+    stalled = asyncio.Event()
+
+    async def stall_first_upsert(self, samples):
+        if not stalled.is_set():
+            stalled.set()
+            await asyncio.Event().wait()
+        await upsert_samples(self, samples)
+
+    mocker.patch.object(EnergyStateRepository, "upsert_samples", stall_first_upsert)
+    started_at = datetime.now(UTC) - timedelta(minutes=1)
+
+    energy_recorder.add(test_env.controller_2.id, make_reading(100.0))
+    flush = asyncio.create_task(energy_recorder.flush(include_current=True))
+    await stalled.wait()
+    flush.cancel()
+    await asyncio.gather(flush, return_exceptions=True)
+
+    energy_recorder.add(test_env.controller_2.id, make_reading(300.0))
+    await energy_recorder.close()
+
+    session = await request_di_container.get(AsyncSession)
+    samples, power_max = (
+        await session.execute(
+            select(
+                func.sum(EnergySample.samples), func.max(EnergySample.power_max)
+            ).where(
+                EnergySample.controller_id == test_env.controller_2.id,
+                EnergySample.bucket >= started_at,
+            )
+        )
+    ).one()
+    assert samples == 2
+    assert power_max == 300
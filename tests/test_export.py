@@ -0,0 +1,87 @@
+import csv
+import io
+import zipfile
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dash.models.admin_user import AdminUser
+from dash.models.payment import Payment, PaymentGatewayType, PaymentStatus, PaymentType
+from dash.services.common.export import ExportFormat
+from dash.services.payment.dto import ExportPaymentListRequest
+from dash.services.payment.service import PaymentService
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+@pytest.fixture
+async def payments(request_di_container: AsyncContainer, test_env: TestEnvironment):
+    db_session = await request_di_container.get(AsyncSession)
+
+    for i, (controller, location) in enumerate(
+        (
+            (test_env.controller_1, test_env.location_1),
+            (test_env.controller_1, test_env.location_1),
+            (test_env.controller_2, test_env.location_2),
+        )
+    ):
+        db_session.add(
+            Payment(
+                invoice_id=f"export-{i}",
+                controller_id=controller.id,
+                location_id=location.id,
+                amount=100 * (i + 1),
+                status=PaymentStatus.COMPLETED,
+                type=PaymentType.CASHLESS,
+                gateway_type=PaymentGatewayType.MONOPAY,
+            )
+        )
+    await db_session.commit()
+
+
+async def export(
+    request_di_container: AsyncContainer, export_format: ExportFormat
+) -> bytes:
+    payment_service = await request_di_container.get(PaymentService)
+    content = await payment_service.export_payments(
+        ExportPaymentListRequest(format=export_format)
+    )
+    return b"".join([chunk async for chunk in content])
+
+
+@pytest.mark.parametrize(
+    "user, result",
+    [
+        ("superadmin", 3),
+        ("company_owner_1", 2),
+        ("company_owner_2", 1),
+        ("location_admin_1", 2),
+    ],
+    indirect=["user"],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_payments_csv(
+    request_di_container: AsyncContainer, payments: None, user: AdminUser, result: int
+):
+    content = await export(request_di_container, ExportFormat.CSV)
+
+    rows = list(csv.DictReader(io.StringIO(content.decode("utf-8-sig"))))
+    assert len(rows) == result
+    assert all(row["invoice_id"].startswith("export-") for row in rows)
+
+
+@pytest.mark.parametrize("user", ["superadmin"], indirect=True)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_payments_xlsx(
+    request_di_container: AsyncContainer, payments: None, user: AdminUser
+):
+    content = await export(request_di_container, ExportFormat.XLSX)
+
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert archive.testzip() is None
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+    assert sheet.count("<row>") == 4
+    assert "export-2" in sheet
@@ -0,0 +1,114 @@
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.acquiring.checkbox import (
+    CheckboxAPIError,
+    CheckboxRejectedError,
+)
+from dash.infrastructure.fiscalization_worker import FiscalizationWorker
+from dash.main.config import AppConfig
+from dash.models.fiscalization_job import FiscalizationJob, FiscalizationJobStatus
+from dash.models.payment import Payment, PaymentStatus, PaymentType
+from dash.services.common.payment_helper import PaymentHelper
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+@pytest.fixture
+async def payment(
+    request_di_container: AsyncContainer, test_env: TestEnvironment
+) -> Payment:
+    payment_helper = await request_di_container.get(PaymentHelper)
+
+    payment = payment_helper.create_payment(
+        controller_id=test_env.controller_1.id,
+        location_id=test_env.location_1.id,
+        amount=100,
+        payment_type=PaymentType.CASH,
+        status=PaymentStatus.COMPLETED,
+    )
+    await payment_helper.fiscalize(test_env.controller_1, payment)
+    await payment_helper.save_and_commit(payment)
+    return payment
+
+
+async def process_job(
+    di_container: AsyncContainer, mocker, side_effect: Exception | None
+) -> tuple[FiscalizationJob, Payment]:
+    checkbox_service = mocker.AsyncMock()
+    checkbox_service.create_receipt.side_effect = side_effect
+
+    worker = FiscalizationWorker(
+        await di_container.get(async_sessionmaker[AsyncSession]),
+        checkbox_service,
+        await di_container.get(AppConfig),
+    )
+    assert await worker.process_next()
+    assert not await worker.process_next()
+    checkbox_service.create_receipt.assert_awaited_once()
+
+    async with await di_container.get(async_sessionmaker[AsyncSession])() as session:
+        job = await session.scalar(select(FiscalizationJob))
+        payment = await session.scalar(select(Payment))
+    return job, payment
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fiscalization_job_done(
+    di_container: AsyncContainer, payment: Payment, mocker
+):
+    job, payment = await process_job(di_container, mocker, None)
+
+    assert job.status == FiscalizationJobStatus.DONE
+    assert job.attempts == 1
+    assert payment.checkbox_error is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fiscalization_job_retry(
+    di_container: AsyncContainer, payment: Payment, mocker
+):
+    job, payment = await process_job(di_container, mocker, CheckboxAPIError("down"))
+
+    assert job.status == FiscalizationJobStatus.PENDING
+    assert job.last_error == "down"
+    assert job.run_at > job.created_at
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fiscalization_job_dead(
+    di_container: AsyncContainer, payment: Payment, mocker
+):
+    job, payment = await process_job(
+        di_container, mocker, CheckboxRejectedError("rejected")
+    )
+
+    assert job.status == FiscalizationJobStatus.DEAD
+    assert payment.checkbox_error == "rejected"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fiscalization_job_saved_with_late_payment(
+    request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    payment_helper = await request_di_container.get(PaymentHelper)
+    session = await request_di_container.get(AsyncSession)
+
+    payment = payment_helper.create_payment(
+        controller_id=test_env.controller_1.id,
+        location_id=test_env.location_1.id,
+        amount=100,
+        payment_type=PaymentType.CASH,
+        status=PaymentStatus.COMPLETED,
+    )
+    # the job is queued before the payment reaches the session
+    await payment_helper.fiscalize(test_env.controller_1, payment)
+    session.add(payment)
+    await session.commit()
+
+    job = await session.scalar(select(FiscalizationJob))
+    assert job is not None
+    assert job.payment_id == payment.id
@@ -0,0 +1,86 @@
+from unittest.mock import Mock
+
+import pytest
+from dishka import AsyncContainer
+from fastapi import Request
+
+from dash.infrastructure.auth.id_provider import IdProvider
+from dash.infrastructure.auth.token_processor import JWTTokenProcessor
+from dash.infrastructure.repositories.user import UserRepository
+from dash.infrastructure.storages.principal import PrincipalStorage
+from dash.services.common.errors.base import AccessForbiddenError
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+async def ensure_location_admin(di_container: AsyncContainer, location_id) -> None:
+    mock_request = Mock(spec=Request)
+    mock_request.headers = {"Authorization": "Bearer test_token"}
+    async with di_container(context={Request: mock_request}) as request_container:
+        idp = await request_container.get(IdProvider)
+        await idp.ensure_location_admin(location_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_principal_cache(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    mocker: Mock,
+):
+    user = test_env.location_admin_1
+    location_id = test_env.location_1.id
+    mocker.patch.object(
+        JWTTokenProcessor, "validate_access_token", return_value=user.id
+    )
+    principal_storage = await request_di_container.get(PrincipalStorage)
+
+    await ensure_location_admin(di_container, location_id)
+    principal, _ = await principal_storage.get("test_token", user.id)
+    assert principal is not None
+    assert principal.id == user.id
+    assert principal.admin_location_ids == {location_id}
+
+    user_repository = await request_di_container.get(UserRepository)
+    await user_repository.delete_location_admin(user.id, location_id)
+    await user_repository.commit()
+
+    # still served from the cache until invalidated
+    await ensure_location_admin(di_container, location_id)
+
+    await principal_storage.invalidate(user.id)
+    assert (await principal_storage.get("test_token", user.id))[0] is None
+    with pytest.raises(AccessForbiddenError):
+        await ensure_location_admin(di_container, location_id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_principal_cache_skips_stale_load(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+    mocker: Mock,
+):
+    user = test_env.location_admin_1
+    mocker.patch.object(
+        JWTTokenProcessor, "validate_access_token", return_value=user.id
+    )
+    principal_storage = await request_di_container.get(PrincipalStorage)
+    get_access_ids = UserRepository.get_access_ids
+
+    async def invalidated_while_loading(self, user_id):
+        access_ids = await get_access_ids(self, user_id)
+        await principal_storage.invalidate(user_id)
+        return access_ids
+
+    mocker.patch.object(UserRepository, "get_access_ids", invalidated_while_loading)
+    await ensure_location_admin(di_container, test_env.location_1.id)
+    assert (await principal_storage.get("test_token", user.id))[0] is None
+
+    mocker.patch.object(UserRepository, "get_access_ids", get_access_ids)
+    await ensure_location_admin(di_container, test_env.location_1.id)
+    assert (await principal_storage.get("test_token", user.id))[0] is not None
+
+    await principal_storage.invalidate_all()
+    assert (await principal_storage.get("test_token", user.id))[0] is None
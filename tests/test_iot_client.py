@@ -0,0 +1,84 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from dishka import AsyncContainer
+
+from dash.infrastructure.iot.common.base_client import (
+    CommandPriority,
+    DeviceCommandQueue,
+)
+from dash.infrastructure.iot.wsm.client import WsmIoTClient
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_reads_share_round_trip(
+    di_container: AsyncContainer, mocker: Mock
+):
+    client = await di_container.get(WsmIoTClient)
+
+    async def respond(**kwargs):
+        await asyncio.sleep(0.01)
+        return {"text": "ok"}
+
+    wait_for_response = mocker.patch.object(
+        client, "_wait_for_response", side_effect=respond
+    )
+
+    results = await asyncio.gather(
+        *(client.get_display("coalesced-device") for _ in range(5))
+    )
+    assert results == [{"text": "ok"}] * 5
+    assert wait_for_response.await_count == 1
+
+    await client.get_display("coalesced-device", fields=["line_1"])
+    assert wait_for_response.await_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cancelled_read_leader_hands_over(
+    di_container: AsyncContainer, mocker: Mock
+):
+    client = await di_container.get(WsmIoTClient)
+
+    async def respond(**kwargs):
+        await asyncio.sleep(0.01)
+        return {"text": "ok"}
+
+    wait_for_response = mocker.patch.object(
+        client, "_wait_for_response", side_effect=respond
+    )
+
+    leader = asyncio.create_task(client.get_display("handover-device"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(client.get_display("handover-device"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {"text": "ok"}
+    assert leader.cancelled()
+    assert wait_for_response.await_count == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_device_queue_sends_payments_first():
+    queue = DeviceCommandQueue(max_in_flight=1)
+    order = []
+
+    async def command(name: str, priority: CommandPriority) -> None:
+        await queue.acquire(priority)
+        order.append(name)
+        await asyncio.sleep(0.01)
+        queue.release()
+
+    first = asyncio.create_task(command("first", CommandPriority.CONFIG))
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        first,
+        command("config", CommandPriority.CONFIG),
+        command("read", CommandPriority.READ),
+        command("payment", CommandPriority.PAYMENT),
+    )
+
+    assert order == ["first", "payment", "read", "config"]
+    assert queue.idle
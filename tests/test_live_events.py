@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+from dishka import AsyncContainer
+
+from dash.infrastructure.live_events import LiveEvents, LiveEventType
+from tests.environment import TestEnvironment
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_live_events_filtered_by_controller(
+    di_container: AsyncContainer,
+    test_env: TestEnvironment,
+):
+    live_events = await di_container.get(LiveEvents)
+    events = live_events.subscribe([test_env.controller_1.id])
+    first = asyncio.ensure_future(anext(events))
+    # let the listener subscribe before publishing
+    await asyncio.sleep(0.5)
+
+    await live_events.publish_many(
+        [
+            (LiveEventType.ONLINE, test_env.controller_2.id, {"online": True}),
+            (LiveEventType.ONLINE, test_env.controller_1.id, {"online": False}),
+        ]
+    )
+
+    event = json.loads(await asyncio.wait_for(first, 5))
+    assert event == {
+        "type": "online",
+        "controller_id": str(test_env.controller_1.id),
+        "data": {"online": False},
+    }
+    await events.aclose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_live_events_skip_malformed(
+    di_container: AsyncContainer,
+    test_env: TestEnvironment,
+):
+    live_events = await di_container.get(LiveEvents)
+
+    with pytest.raises(ValueError):
+        await live_events.publish(LiveEventType.PAYMENT, None, {})  # type: ignore
+
+    events = live_events.subscribe(None)
+    first = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0.5)
+
+    await live_events.redis.publish(LiveEvents.CHANNEL, "not json")
+    await live_events.publish(
+        LiveEventType.ONLINE, test_env.controller_1.id, {"online": True}
+    )
+
+    event = json.loads(await asyncio.wait_for(first, 5))
+    assert event["controller_id"] == str(test_env.controller_1.id)
+    await events.aclose()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dash.infrastructure.live_events import LiveEvents
+from dash.infrastructure.sale_ingestor import SaleIngestor
+from dash.infrastructure.storages.today_counters import TodayCountersStorage
+from dash.models import TransactionType, WsmTransaction
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+def make_transaction(i: int, test_env: TestEnvironment) -> WsmTransaction:
+    return WsmTransaction(
+        controller_transaction_id=i,
+        controller_id=test_env.controller_1.id,
+        location_id=test_env.location_1.id,
+        coin_amount=100,
+        bill_amount=0,
+        qr_amount=0,
+        paypass_amount=0,
+        card_amount=0,
+        type=TransactionType.WATER_VENDING,
+        out_liters_1=1000,
+        out_liters_2=0,
+        sale_type="test",
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_close_after_worker_died(
+    di_container: AsyncContainer, test_env: TestEnvironment, mocker
+):
+    sale_ingestor = SaleIngestor(
+        await di_container.get(async_sessionmaker[AsyncSession]),
+        await di_container.get(TodayCountersStorage),
+        await di_container.get(LiveEvents),
+    )
+    mocker.patch.object(sale_ingestor, "_fill_batch", side_effect=RuntimeError)
+
+    # both are queued before the worker takes the first one and dies
+    sales = [
+        asyncio.create_task(sale_ingestor.submit(make_transaction(i, test_env)))
+        for i in range(2)
+    ]
+    done, _ = await asyncio.wait(sales, timeout=1)
+    assert len(done) == 1
+
+    await asyncio.wait_for(sale_ingestor.close(), timeout=1)
+
+    for sale in sales:
+        with pytest.raises(RuntimeError):
+            await sale
@@ -0,0 +1,62 @@
+from typing import AsyncIterable
+from unittest.mock import AsyncMock, call
+
+import pytest
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+
+from dash.infrastructure.notifications import TgNotificationOutbox
+
+
+@pytest.fixture
+async def outbox(di_container: AsyncContainer) -> AsyncIterable[TgNotificationOutbox]:
+    redis = await di_container.get(Redis)
+    # the worker is not started, the test drives it step by step
+    outbox = TgNotificationOutbox(redis, AsyncMock(), AsyncMock())
+    outbox.STREAM = "tg:outbox:test"
+    outbox.READ_BLOCK_MS = 100
+    outbox.COALESCE_WINDOW_SECONDS = 0.1
+    outbox.CLAIM_INTERVAL_SECONDS = 0
+    outbox.CLAIM_MIN_IDLE_MS = 0
+    await redis.delete(outbox.STREAM)
+    await outbox._ensure_group()
+    yield outbox
+    await redis.delete(outbox.STREAM)
+
+
+async def get_pending(outbox: TgNotificationOutbox) -> int:
+    return (await outbox.redis.xpending(outbox.STREAM, outbox.GROUP))["pending"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_messages_are_coalesced_per_chat(outbox: TgNotificationOutbox):
+    for text in ("first", "second", "third"):
+        await outbox.enqueue("1", text)
+    await outbox.enqueue("2", "other")
+
+    await outbox._deliver(await outbox._read_window())
+
+    outbox.bot.send_message.assert_has_awaits(  # type: ignore
+        [call("1", "first\nsecond\nthird"), call("2", "other")]
+    )
+    assert await get_pending(outbox) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unsent_messages_are_reclaimed(outbox: TgNotificationOutbox):
+    await outbox.enqueue("1", "first")
+
+    outbox.bot.send_message = AsyncMock(side_effect=Exception)  # type: ignore
+    await outbox._deliver(await outbox._read_window())
+    assert await get_pending(outbox) == 1
+
+    # a replica that died mid-delivery leaves its entries pending the same way
+    outbox.consumer = "another-replica"
+    outbox.bot.send_message = AsyncMock()  # type: ignore
+    entries = await outbox._claim_stale()
+    assert [fields[b"text"] for _, fields in entries] == [b"first"]
+
+    await outbox._deliver(entries)
+
+    outbox.bot.send_message.assert_awaited_once_with("1", "first")
+    assert await get_pending(outbox) == 0
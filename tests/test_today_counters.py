@@ -0,0 +1,79 @@
+import pytest
+from dishka import AsyncContainer
+
+from dash.infrastructure.repositories.transaction import TransactionRepository
+from dash.infrastructure.sale_ingestor import SaleIngestor
+from dash.infrastructure.storages.today_counters import TodayCountersStorage
+from dash.infrastructure.today_counters_rebuilder import rebuild_today_counters
+from dash.models import TransactionType, WsmTransaction
+from dash.services.dashboard.dto import GetRevenueRequest
+from tests.environment import TestEnvironment
+
+pytestmark = pytest.mark.usefixtures("create_tables")
+
+
+def make_transaction(i: int, test_env: TestEnvironment) -> WsmTransaction:
+    return WsmTransaction(
+        controller_transaction_id=i,
+        controller_id=test_env.controller_1.id,
+        location_id=test_env.location_1.id,
+        coin_amount=100,
+        bill_amount=200,
+        qr_amount=0,
+        paypass_amount=300,
+        card_amount=0,
+        type=TransactionType.WATER_VENDING,
+        out_liters_1=1000,
+        out_liters_2=0,
+        sale_type="test",
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_today_counters(
+    di_container: AsyncContainer,
+    request_di_container: AsyncContainer,
+    test_env: TestEnvironment,
+):
+    today_counters = await di_container.get(TodayCountersStorage)
+    sale_ingestor = await di_container.get(SaleIngestor)
+    scopes = [(TodayCountersStorage.LOCATION, test_env.location_1.id)]
+
+    await rebuild_today_counters(di_container)
+    assert await today_counters.get(scopes) == {
+        "bill": 0,
+        "coin": 0,
+        "qr": 0,
+        "paypass": 0,
+        "card": 0,
+        "clients": 0,
+    }
+
+    for i in range(2):
+        assert await sale_ingestor.submit(make_transaction(i, test_env))
+    # duplicates are not counted
+    assert not await sale_ingestor.submit(make_transaction(0, test_env))
+
+    counters = await today_counters.get(scopes)
+    assert counters is not None
+    assert counters["bill"] == 400
+    assert counters["paypass"] == 600
+    assert counters["clients"] == 2
+
+    company_counters = await today_counters.get(
+        [(TodayCountersStorage.COMPANY, test_env.location_1.company_id)]
+    )
+    assert company_counters == counters
+
+    await rebuild_today_counters(di_container)
+    assert await today_counters.get(scopes) == counters
+
+    transaction_repository = await request_di_container.get(TransactionRepository)
+    revenue = await transaction_repository.get_revenue_all(
+        GetRevenueRequest(
+            location_id=test_env.location_1.id,
+            today_start=today_counters.get_day_start(today_counters.get_day()),
+            exclude_today=True,
+        )
+    )
+    assert revenue.total == 0
@@ -43,3 +43,24 @@ async def test_transaction_dublicate(
     transaction = create_transaction(test_env)
     was_inserted = await transaction_repository.insert_with_conflict_ignore(transaction)
     assert not was_inserted
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_transaction_batch_dublicate(
+    request_di_container: AsyncContainer, test_env: TestEnvironment
+):
+    transaction_repository = await request_di_container.get(TransactionRepository)
+
+    first = create_transaction(test_env)
+    second = create_transaction(test_env)
+    second.controller_transaction_id = 124
+
+    inserted_ids = await transaction_repository.insert_many_with_conflict_ignore(
+        [first, second, create_transaction(test_env)]
+    )
+    assert inserted_ids == {first.id, second.id}
+
+    inserted_ids = await transaction_repository.insert_many_with_conflict_ignore(
+        [create_transaction(test_env)]
+    )
+    assert not inserted_ids